@@ -1,13 +1,29 @@
 import logging
 import signal
 import sys
+import time
+
+# Gathers the starting time of the server's imports
+start = time.perf_counter()
 
 from tornado import autoreload
+from tornado.httpserver import HTTPServer
 from tornado.ioloop import IOLoop
+from tornado.netutil import bind_sockets
+from tornado.process import fork_processes
 
 import utils.constants as c
+from utils.metrics import reset_metrics
+from utils.model_cache import preload_learners
+from utils.process_manager import ProcessManager
 from utils.server import Server
 
+# Gathers the time spent importing the server
+IMPORT_TIME = time.perf_counter() - start
+
+# Modules that should only be imported by the workers which need them
+HEAVY_MODULES = ['fasttext', 'spacy', 'thinc', 'numpy', 'GPUtil']
+
 # Enables logging
 logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s', level=logging.DEBUG)
@@ -37,14 +53,67 @@ if __name__ == '__main__':
     # Logs its port
     logging.info(f'Port: {c.PORT}')
 
-    # Creates an application
-    app = Server()
+    # Logs the time spent importing the server
+    logging.info(f'Imported the server in {IMPORT_TIME:.2f}s.')
+
+    # Gathers the amount of API processes
+    n_processes = int(c.API_PROCESSES)
+
+    # Checks if the server should be forked into multiple processes
+    if n_processes != 1:
+        # Checks if debug mode has been requested, as it can not reload forked processes
+        if c.API_DEBUG:
+            logging.warning('Debug mode is not supported with multiple processes, disabling it ...')
+
+        # Removing the metrics of previous executions, before any process starts flushing them
+        reset_metrics()
+
+        # Preloading models before forking, so their weights are shared by every process
+        preload_learners(c.CACHE_PRELOAD)
+
+        # Creates a single process manager, shared by every forked process
+        process_manager = ProcessManager()
+
+        # Binds the port once, so every forked process accepts its connections
+        sockets = bind_sockets(int(c.PORT))
+
+        # Forks the API processes, where the parent only watches over its children
+        task_id = fork_processes(n_processes)
+
+        # Gathers the starting time of the application
+        start = time.perf_counter()
+
+        # Creates an application, with its own model cache and inference executor
+        app = Server(process_manager)
+
+        # Logs the time spent creating the application
+        logging.info(f'Created the application of process {task_id} in {time.perf_counter() - start:.2f}s.')
+
+        # Serves the application on the shared sockets
+        HTTPServer(app).add_sockets(sockets)
+
+    # If not, runs a single process
+    else:
+        # Gathers the starting time of the application
+        start = time.perf_counter()
+
+        # Creates an application
+        app = Server(debug=c.API_DEBUG)
+
+        # Logs the time spent creating the application
+        logging.info(f'Created the application in {time.perf_counter() - start:.2f}s.')
+
+        # Adds an autoreload hook in order to properly shutdown the workers pool
+        autoreload.add_reload_hook(lambda: app.shutdown())
+
+        # Servers the application on desired port
+        app.listen(c.PORT)
 
-    # Adds an autoreload hook in order to properly shutdown the workers pool
-    autoreload.add_reload_hook(lambda: app.shutdown())
+    # Gathers the heavy modules that have been imported by the front end
+    loaded = [m for m in HEAVY_MODULES if m in sys.modules]
 
-    # Servers the application on desired port
-    app.listen(c.PORT)
+    # Logs the heavy modules, which should only be loaded when preloading learners
+    logging.info(f'Heavy modules loaded by the front end: {", ".join(loaded) or "none"}.')
 
     # Starts a IOLoop instance
     IOLoop.current().start()
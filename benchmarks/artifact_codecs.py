@@ -0,0 +1,125 @@
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import utils.file as f
+
+
+def create_model_folder(folder, size):
+    """Creates a folder that mimics a model, half incompressible weights and half repetitive data.
+
+    Args:
+        folder (str): The folder to be filled.
+        size (int): The folder's size in MB.
+
+    """
+
+    # Gathers the amount of bytes of each half
+    half = size * 1024 * 1024 // 2
+
+    # Writes the incompressible weights
+    with open(os.path.join(folder, 'model.bin'), 'wb') as model_file:
+        model_file.write(os.urandom(half))
+
+    # Writes the repetitive data
+    with open(os.path.join(folder, 'vocab.txt'), 'wb') as vocab_file:
+        vocab_file.write(b'__label__intent word ' * (half // 21))
+
+
+def benchmark_codec(folder, codec, level, repeats):
+    """Measures the save and load times of a codec.
+
+    Args:
+        folder (str): The folder to be packed.
+        codec (str): The artifact's codec.
+        level (int): The codec's compression level.
+        repeats (int): Amount of repetitions, from which the best time is kept.
+
+    Returns:
+        A dictionary holding the codec's results.
+
+    """
+
+    # Creates a temporary output directory
+    output_dir = tempfile.mkdtemp()
+
+    # Creates the artifact's path, without its extension
+    artifact_path = os.path.join(output_dir, 'model')
+
+    # Creates empty lists for the save and load times
+    save_times, load_times = [], []
+
+    # For every repetition
+    for _ in range(repeats):
+        # Measures the save time
+        start = time.perf_counter()
+        packed_path = f.zip_file(folder, artifact_path, 'model', codec, level)
+        save_times.append(time.perf_counter() - start)
+
+        # Cleans up any previous extraction
+        shutil.rmtree(os.path.join(output_dir, 'model'), ignore_errors=True)
+
+        # Measures the load time
+        start = time.perf_counter()
+        f.unzip_file(packed_path, output_dir, 'model')
+        load_times.append(time.perf_counter() - start)
+
+    # Creating the results object
+    results = {
+        'codec': codec,
+        'level': level,
+        'size': os.path.getsize(packed_path),
+        'save_time': min(save_times),
+        'load_time': min(load_times)
+    }
+
+    # Cleans up the output directory
+    shutil.rmtree(output_dir)
+
+    return results
+
+
+def run(size=100, level=1, repeats=3):
+    """Benchmarks every avaliable codec.
+
+    Args:
+        size (int): The model's size in MB.
+        level (int): The codecs' compression level.
+        repeats (int): Amount of repetitions per codec.
+
+    Returns:
+        A list of dictionaries holding the results of each codec.
+
+    """
+
+    # Creates a temporary model folder
+    folder = tempfile.mkdtemp()
+
+    # Fills the model folder
+    create_model_folder(folder, size)
+
+    # Benchmarks every avaliable codec
+    results = [benchmark_codec(folder, codec, level, repeats) for codec in f.get_codecs()]
+
+    # Cleans up the model folder
+    shutil.rmtree(folder)
+
+    return results
+
+
+if __name__ == '__main__':
+    # Creates the arguments parser
+    parser = argparse.ArgumentParser(description='Benchmarks the models\' artifact codecs.')
+    parser.add_argument('--size', type=int, default=100, help='Model\'s size in MB.')
+    parser.add_argument('--level', type=int, default=1, help='Compression level.')
+    parser.add_argument('--repeats', type=int, default=3, help='Repetitions per codec.')
+
+    # Parses the arguments
+    args = parser.parse_args()
+
+    # For every codec's results
+    for r in run(args.size, args.level, args.repeats):
+        print(json.dumps(r))
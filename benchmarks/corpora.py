@@ -0,0 +1,105 @@
+import random
+
+# Vocabulary used to fill the synthetic texts
+WORDS = ['please', 'could', 'you', 'the', 'my', 'a', 'for', 'today', 'now', 'again', 'with', 'about',
+         'account', 'order', 'card', 'payment', 'delivery', 'password', 'address', 'ticket', 'refund', 'plan']
+
+# Entities' labels and their possible values
+ENTITIES = {
+    'PERSON': ['Alice', 'Bruno', 'Carla', 'Diego', 'Elisa'],
+    'CITY': ['Lisbon', 'Recife', 'Porto', 'Campinas', 'Madrid'],
+    'PRODUCT': ['Brainy', 'Widget', 'Gadget', 'Console', 'Tablet']
+}
+
+
+def create_intent_samples(n_samples, n_labels=10, seed=0):
+    """Creates synthetic Intent Classification samples, where each label has its own keywords.
+
+    Args:
+        n_samples (int): Amount of samples.
+        n_labels (int): Amount of intents' labels.
+        seed (int): Random seed.
+
+    Returns:
+        A list of samples.
+
+    """
+
+    # Creates a random generator
+    rng = random.Random(seed)
+
+    # Creates an empty list to hold the samples
+    samples = []
+
+    # For every possible sample
+    for i in range(n_samples):
+        # Gathers the sample's label
+        label = i % n_labels
+
+        # Mixes the label's keywords with random words
+        words = [f'keyword{label}', f'topic{label}'] + rng.choices(WORDS, k=rng.randint(4, 12))
+        rng.shuffle(words)
+
+        # Appends the sample
+        samples.append({'text': ' '.join(words), 'intents': [{'label': f'intent_{label}'}]})
+
+    return samples
+
+
+def create_ner_samples(n_samples, seed=0):
+    """Creates synthetic Named Entity Recognition samples, with an entity per sample.
+
+    Args:
+        n_samples (int): Amount of samples.
+        seed (int): Random seed.
+
+    Returns:
+        A list of samples.
+
+    """
+
+    # Creates a random generator
+    rng = random.Random(seed)
+
+    # Creates an empty list to hold the samples
+    samples = []
+
+    # For every possible sample
+    for _ in range(n_samples):
+        # Gathers the entity's label and value
+        label = rng.choice(list(ENTITIES.keys()))
+        value = rng.choice(ENTITIES[label])
+
+        # Gathers the words before and after the entity
+        prefix = ' '.join(rng.choices(WORDS, k=rng.randint(1, 6)))
+        suffix = ' '.join(rng.choices(WORDS, k=rng.randint(1, 6)))
+
+        # Gathers the entity's offsets
+        start = len(prefix) + 1
+        end = start + len(value)
+
+        # Appends the sample
+        samples.append({'text': f'{prefix} {value} {suffix}',
+                        'entities': [{'start': start, 'end': end, 'label': label}]})
+
+    return samples
+
+
+def create_samples(_type, n_samples, seed=0):
+    """Creates synthetic samples for a learner's type.
+
+    Args:
+        _type (str): Learner's type.
+        n_samples (int): Amount of samples.
+        seed (int): Random seed.
+
+    Returns:
+        A list of samples.
+
+    """
+
+    # Checks if the learner's type is from Spacy
+    if _type == 'spacy':
+        return create_ner_samples(n_samples, seed)
+
+    return create_intent_samples(n_samples, seed=seed)
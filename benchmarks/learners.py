@@ -0,0 +1,134 @@
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import utils.file as f
+from benchmarks.corpora import create_samples
+from learners.registry import create_learner
+
+# Hyperparams used by every benchmarked learner
+HYPERPARAMS = {
+    'fasttext': {'n_iterations': 5},
+    'spacy': {'n_iterations': 10}
+}
+
+
+def benchmark_learner(_type, n_samples, language='en'):
+    """Measures the fit, save, load, evaluate and predict times of a learner.
+
+    Args:
+        _type (str): Learner's type.
+        n_samples (int): Amount of synthetic samples, split into 80% for training and 20% for testing.
+        language (str): The language of the model.
+
+    Returns:
+        A dictionary holding the learner's results.
+
+    """
+
+    # Creates the synthetic samples
+    samples = create_samples(_type, n_samples)
+
+    # Splits the samples
+    n_train = int(len(samples) * 0.8)
+    train_samples, test_samples = samples[:n_train], samples[n_train:]
+
+    # Creates the learner
+    l = create_learner(_type)
+
+    # Measures the fit time, which includes saving the artifact
+    start = time.perf_counter()
+    zip_path = l.fit(language, train_samples, dict(HYPERPARAMS[_type]))
+    fit_time = time.perf_counter() - start
+
+    # Checks if the model has been properly trained
+    if zip_path is None:
+        raise RuntimeError('Model could not been properly trained.')
+
+    # Gathers the artifact's size
+    artifact_size = os.path.getsize(zip_path)
+
+    # Gathers the model's identifier
+    model_id = l.id
+
+    # Creates a temporary output directory
+    output_dir = tempfile.mkdtemp()
+
+    # Measures the load time, from the artifact to the loaded learner
+    start = time.perf_counter()
+    l = create_learner(_type)
+    l.load(f.unzip_file(zip_path, output_dir, model_id))
+    load_time = time.perf_counter() - start
+
+    # Measures the evaluate time
+    start = time.perf_counter()
+    metrics = l.evaluate(test_samples)
+    evaluate_time = time.perf_counter() - start
+
+    # Measures the predict time
+    start = time.perf_counter()
+    l.predict(test_samples)
+    predict_time = time.perf_counter() - start
+
+    # Cleans up the artifact and its extraction
+    os.remove(zip_path)
+    shutil.rmtree(output_dir)
+
+    return {
+        'learner': _type,
+        'n_samples': n_samples,
+        'fit_time': fit_time,
+        'fit_samples_per_second': len(train_samples) / fit_time,
+        'artifact_size': artifact_size,
+        'load_time': load_time,
+        'evaluate_time': evaluate_time,
+        'evaluate_samples_per_second': len(test_samples) / evaluate_time,
+        'predict_time': predict_time,
+        'predict_samples_per_second': len(test_samples) / predict_time,
+        'metrics': metrics
+    }
+
+
+def run(types=('fasttext', 'spacy'), n_samples=5000):
+    """Benchmarks every learner, skipping the ones that are not installed.
+
+    Args:
+        types (tuple): Learners' types.
+        n_samples (int): Amount of synthetic samples per learner.
+
+    Returns:
+        A list of dictionaries holding the results of each learner.
+
+    """
+
+    # Creates an empty list to hold the results
+    results = []
+
+    # For every learner's type
+    for _type in types:
+        # Tries to benchmark the learner
+        try:
+            results.append(benchmark_learner(_type, n_samples))
+
+        # If the learner is not installed, records the error
+        except ImportError as e:
+            results.append({'learner': _type, 'error': str(e)})
+
+    return results
+
+
+if __name__ == '__main__':
+    # Creates the arguments parser
+    parser = argparse.ArgumentParser(description='Benchmarks the learners\' throughput.')
+    parser.add_argument('--types', nargs='+', default=['fasttext', 'spacy'], help='Learners\' types.')
+    parser.add_argument('--samples', type=int, default=5000, help='Synthetic samples per learner.')
+
+    # Parses the arguments
+    args = parser.parse_args()
+
+    # For every learner's results
+    for r in run(args.types, args.samples):
+        print(json.dumps(r))
@@ -0,0 +1,235 @@
+import argparse
+import json
+import socket
+import subprocess
+import sys
+import time
+
+from tornado import gen
+from tornado.httpclient import AsyncHTTPClient
+from tornado.ioloop import IOLoop
+
+import utils.constants as c
+from benchmarks.corpora import create_samples
+from benchmarks.learners import HYPERPARAMS
+from learners.registry import create_learner
+
+
+def train_model(_type, n_samples, language='en'):
+    """Trains a model on synthetic samples, storing it where the server looks for models.
+
+    Args:
+        _type (str): Learner's type.
+        n_samples (int): Amount of synthetic samples.
+        language (str): The language of the model.
+
+    Returns:
+        The model's identifier.
+
+    """
+
+    # Creates the learner
+    l = create_learner(_type)
+
+    # Checks if the model has been properly trained
+    if l.fit(language, create_samples(_type, n_samples), dict(HYPERPARAMS[_type])) is None:
+        raise RuntimeError('Model could not been properly trained.')
+
+    return l.id
+
+
+def start_server(port, timeout=60):
+    """Starts a local server and waits for it to accept connections.
+
+    Args:
+        port (int): The server's port.
+        timeout (float): Maximum amount of time (in seconds) to wait for the server.
+
+    Returns:
+        The server's process.
+
+    """
+
+    # Starts the server in its own process
+    server = subprocess.Popen([sys.executable, 'api.py'], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    # Gathers the deadline
+    deadline = time.time() + timeout
+
+    # While the deadline has not been reached
+    while time.time() < deadline:
+        # Tries to connect to the server
+        try:
+            socket.create_connection(('localhost', port), timeout=1).close()
+
+            return server
+
+        # If the server is not ready yet, waits for it
+        except OSError:
+            time.sleep(0.5)
+
+    # Stops the server, as it could not be started
+    server.terminate()
+
+    raise RuntimeError(f'Server did not start within {timeout} seconds.')
+
+
+def get_percentile(values, percentile):
+    """Gathers a percentile of sorted values.
+
+    Args:
+        values (list): A sorted list of values.
+        percentile (float): The percentile, between 0 and 100.
+
+    Returns:
+        The value at the percentile.
+
+    """
+
+    return values[min(len(values) - 1, int(len(values) * percentile / 100))]
+
+
+async def send_requests(url, payload, n_requests, concurrency):
+    """Sends concurrent requests, measuring their latencies.
+
+    Args:
+        url (str): The endpoint's URL.
+        payload (dict): The requests' payload.
+        n_requests (int): Amount of requests.
+        concurrency (int): Amount of concurrent requests.
+
+    Returns:
+        A list of latencies and the amount of failed requests.
+
+    """
+
+    # Creates the HTTP client, allowing as many connections as concurrent requests
+    client = AsyncHTTPClient(force_instance=True, max_clients=concurrency)
+
+    # Encodes the payload once
+    body = json.dumps(payload)
+
+    # Creates an empty list to hold the latencies
+    latencies = []
+
+    # Initializes the amount of failed requests
+    n_errors = 0
+
+    async def send(n):
+        """Sends requests sequentially, as one of the concurrent clients.
+
+        Args:
+            n (int): Amount of requests.
+
+        """
+
+        nonlocal n_errors
+
+        # For every request
+        for _ in range(n):
+            # Measures the request's latency
+            start = time.perf_counter()
+            response = await client.fetch(url, method='POST', body=body, raise_error=False)
+            latencies.append(time.perf_counter() - start)
+
+            # Checks if the request has failed
+            if response.code != 200:
+                n_errors += 1
+
+    # Splits the requests among the concurrent clients
+    await gen.multi([send(n_requests // concurrency + (i < n_requests % concurrency))
+                     for i in range(concurrency)])
+
+    # Closes the client
+    client.close()
+
+    return latencies, n_errors
+
+
+def run(_type='fasttext', n_requests=1000, concurrency=16, batch_size=1, url=None, model_id=None):
+    """Benchmarks the predictor's endpoint under concurrent load.
+
+    Args:
+        _type (str): Learner's type.
+        n_requests (int): Amount of requests.
+        concurrency (int): Amount of concurrent requests.
+        batch_size (int): Amount of samples per request.
+        url (str): The endpoint's URL, where a local server is started if not supplied.
+        model_id (str): The model's identifier, where a synthetic model is trained if not supplied.
+
+    Returns:
+        A dictionary holding the endpoint's results.
+
+    """
+
+    # Checks if there is a model to be predicted
+    if model_id is None:
+        model_id = train_model(_type, 5000)
+
+    # Initializes the server as empty
+    server = None
+
+    # Checks if a local server should be started
+    if url is None:
+        server = start_server(int(c.PORT))
+
+        # Gathers the local endpoint's URL
+        url = f'http://localhost:{c.PORT}/api/predictor'
+
+    # Creating the requests' payload
+    payload = {
+        'id': model_id,
+        'type': _type,
+        'samples': [{'text': s['text']} for s in create_samples(_type, batch_size, seed=1)]
+    }
+
+    # Tries to send the requests
+    try:
+        # Warms up the model, so its loading is not measured
+        IOLoop.current().run_sync(lambda: send_requests(url, payload, concurrency, concurrency))
+
+        # Measures the total time
+        start = time.perf_counter()
+        latencies, n_errors = IOLoop.current().run_sync(
+            lambda: send_requests(url, payload, n_requests, concurrency))
+        total_time = time.perf_counter() - start
+
+    # Stops the local server, if it has been started
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    # Sorts the latencies
+    latencies.sort()
+
+    return {
+        'learner': _type,
+        'model_id': model_id,
+        'n_requests': n_requests,
+        'concurrency': concurrency,
+        'batch_size': batch_size,
+        'n_errors': n_errors,
+        'requests_per_second': n_requests / total_time,
+        'latency_mean': sum(latencies) / len(latencies),
+        'latency_p50': get_percentile(latencies, 50),
+        'latency_p95': get_percentile(latencies, 95),
+        'latency_p99': get_percentile(latencies, 99),
+        'latency_max': latencies[-1]
+    }
+
+
+if __name__ == '__main__':
+    # Creates the arguments parser
+    parser = argparse.ArgumentParser(description='Benchmarks the predictor\'s endpoint under concurrent load.')
+    parser.add_argument('--type', default='fasttext', help='Learner\'s type.')
+    parser.add_argument('--requests', type=int, default=1000, help='Amount of requests.')
+    parser.add_argument('--concurrency', type=int, default=16, help='Amount of concurrent requests.')
+    parser.add_argument('--batch-size', type=int, default=1, help='Samples per request.')
+    parser.add_argument('--url', help='Endpoint\'s URL, where a local server is started if not supplied.')
+    parser.add_argument('--model-id', help='Model\'s identifier, where a synthetic model is trained if not supplied.')
+
+    # Parses the arguments
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.type, args.requests, args.concurrency, args.batch_size, args.url, args.model_id)))
@@ -0,0 +1,94 @@
+import argparse
+import datetime
+import json
+import platform
+import subprocess
+
+from benchmarks import artifact_codecs, learners, predictor_load
+
+
+def get_commit():
+    """Gathers the current commit, so results can be compared across commits.
+
+    Returns:
+        The current commit's hash or None if it is not avaliable.
+
+    """
+
+    # Tries to gather the commit from git
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL).decode().strip()
+
+    # If git is not avaliable
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args):
+    """Runs every benchmark.
+
+    Args:
+        args (Namespace): The parsed command-line arguments.
+
+    Returns:
+        A dictionary holding the results of every benchmark.
+
+    """
+
+    # Creating the results object
+    results = {
+        'commit': get_commit(),
+        'created_at': datetime.datetime.utcnow().isoformat(),
+        'python': platform.python_version(),
+        'machine': platform.machine()
+    }
+
+    # Benchmarks the artifact codecs
+    results['artifact_codecs'] = artifact_codecs.run(args.artifact_size, args.artifact_level)
+
+    # Benchmarks the learners
+    results['learners'] = learners.run(args.types, args.samples)
+
+    # Checks if the predictor's endpoint should be benchmarked
+    if args.requests:
+        # Creates an empty list to hold the endpoint's results
+        results['predictor_load'] = []
+
+        # For every learner's type
+        for _type in args.types:
+            # Tries to benchmark the endpoint
+            try:
+                results['predictor_load'].append(predictor_load.run(
+                    _type, args.requests, args.concurrency, args.batch_size, args.url))
+
+            # If the endpoint could not be benchmarked, records the error
+            except Exception as e:
+                results['predictor_load'].append({'learner': _type, 'error': str(e)})
+
+    return results
+
+
+if __name__ == '__main__':
+    # Creates the arguments parser
+    parser = argparse.ArgumentParser(description='Runs every benchmark, writing the results to a JSON file.')
+    parser.add_argument('--output', default='benchmarks.json', help='Output JSON file.')
+    parser.add_argument('--types', nargs='+', default=['fasttext', 'spacy'], help='Learners\' types.')
+    parser.add_argument('--samples', type=int, default=5000, help='Synthetic samples per learner.')
+    parser.add_argument('--artifact-size', type=int, default=100, help='Artifact\'s size in MB.')
+    parser.add_argument('--artifact-level', type=int, default=1, help='Artifact\'s compression level.')
+    parser.add_argument('--requests', type=int, default=1000, help='Predictor requests, where zero skips it.')
+    parser.add_argument('--concurrency', type=int, default=16, help='Amount of concurrent requests.')
+    parser.add_argument('--batch-size', type=int, default=1, help='Samples per request.')
+    parser.add_argument('--url', help='Predictor\'s URL, where a local server is started if not supplied.')
+
+    # Parses the arguments
+    args = parser.parse_args()
+
+    # Runs every benchmark
+    results = run(args)
+
+    # Dumps the results to the output file
+    with open(args.output, 'w', encoding='utf-8') as output_file:
+        json.dump(results, output_file, indent=2)
+
+    print(f'Results written to {args.output}')
@@ -1,5 +1,8 @@
 from tornado.web import RequestHandler
 
+from utils.callback import check_callback_url
+from utils.metrics import get_metrics
+
 
 class BaseHandler(RequestHandler):
     """A handler class is defined by its main possible requests
@@ -30,3 +33,45 @@ class BaseHandler(RequestHandler):
         # And only allowed methods
         self.set_header('Access-Control-Allow-Methods',
                         'POST, GET, OPTIONS, PATCH, DELETE, PUT')
+
+    def accepts_callback_url(self, url):
+        """Checks a request's callback URL, replying with a bad request if it may not be used.
+
+        Args:
+            url (str): The callback's URL, if any.
+
+        Returns:
+            Whether the request can proceed.
+
+        """
+
+        # Checks if there is a callback's URL
+        if url is None:
+            return True
+
+        # Tries to check the callback's URL
+        try:
+            check_callback_url(url)
+
+        # If it may not be used, reply with an error
+        except ValueError as e:
+            # Setting status to bad request
+            self.set_status(400)
+
+            # Writing back an error message
+            self.finish(dict(error=str(e)))
+
+            return False
+
+        return True
+
+    def on_finish(self):
+        """Records the request's latency once it has been finished.
+
+        Handlers that know the request's model type should set it as `model_type`.
+
+        """
+
+        get_metrics().observe('brainy_request_duration_seconds', self.request.request_time(),
+                              handler=type(self).__name__, method=self.request.method,
+                              status=self.get_status(), type=getattr(self, 'model_type', ''))
@@ -0,0 +1,193 @@
+import datetime
+import functools
+import logging
+import queue
+import uuid
+
+import tornado
+from tornado.ioloop import IOLoop
+
+import utils.constants as c
+from handlers.base_handler import BaseHandler
+from learners.registry import is_registered
+from processors.dataset_processor import DatasetProcessor
+
+
+class DatasetsHandler(BaseHandler):
+    """A DatasetsHandler defines all possible methods for registering and inspecting datasets.
+
+    """
+
+    def initialize(self, **kwargs):
+        """Initializes the current handler.
+
+        """
+
+        # Gathers the config object from keyword arguments
+        self.config = kwargs.get('config')
+
+        # Gathers the process manager object from keyword arguments
+        self.process_manager = kwargs.get('process_manager')
+
+        # Gathers the job store from keyword arguments
+        self.job_store = kwargs.get('job_store')
+
+        # Gathers the dataset registry from keyword arguments
+        self.dataset_registry = kwargs.get('dataset_registry')
+
+        # Creates the processor for this handler
+        self.processor = DatasetProcessor
+
+    async def get(self, _id):
+        """It defines the GET request for this handler.
+
+        Args:
+            _id (str): Dataset's identifier.
+
+        Returns:
+            It will return either 'True' or 'False' along with the dataset's metadata or an 'error' response.
+
+        """
+
+        # Gathers the dataset's metadata
+        meta = self.dataset_registry.get(_id)
+
+        # If there is no dataset with such identifier
+        if meta is None:
+            # Setting status to not found
+            self.set_status(404)
+
+            # Writing back an error message
+            self.finish(dict(error='There is no dataset with such identifier.'))
+
+            return False
+
+        # Writing back the dataset's metadata
+        self.finish(meta)
+
+        return True
+
+    async def post(self):
+        """It defines the POST request for this handler.
+
+        Samples can be either sent inline or referenced by a local path, which is resolved
+        within the configured root and might be a JSONL file or a directory of JSONL files.
+
+        Returns:
+            It will return either 'True' or 'False' along with a 'success' or an 'error' response.
+
+        """
+
+        # Getting request object
+        req = tornado.escape.json_decode(self.request.body)
+
+        # Gathering the dataset's type
+        _type = req['type']
+
+        # Checks if there is a learner of such type
+        if not is_registered(_type):
+            # Setting status to bad request
+            self.set_status(400)
+
+            # Writing back an error message
+            self.finish(dict(error=f'There is no learner of type `{_type}`.'))
+
+            return False
+
+        # Exposes the model's type to the request's metrics
+        self.model_type = _type
+
+        # Checks if the callback's URL may be used
+        if not self.accepts_callback_url(req.get('callback_url')):
+            return False
+
+        # Gathering the dataset's language
+        language = req['language']
+
+        # Tries to store the dataset's raw samples, copying them outside of the IOLoop
+        try:
+            meta = await IOLoop.current().run_in_executor(
+                None, functools.partial(self.dataset_registry.create, _type, language,
+                                        samples=req.get('samples'), local_path=req.get('path')))
+
+        # If the local path could not be used, reply with an error
+        except (PermissionError, FileNotFoundError) as e:
+            logging.error(e)
+
+            # Setting status to bad request
+            self.set_status(400)
+
+            # Writing back an error message
+            self.finish(dict(error='Either `samples` or a valid `path` should be supplied.'))
+
+            return False
+
+        # Creating the job's unique identifier
+        job_id = str(uuid.uuid4())
+
+        # Creating the data object
+        data = {
+            'job_id': job_id,
+            'id': meta['id'],
+            'type': _type,
+            'language': language,
+            'callback_url': req.get('callback_url'),
+            'callback': {
+                'id': job_id,
+                'task': 'dataset',
+                'dataset_id': meta['id'],
+                'status': 'queued',
+                'start_time': datetime.datetime.utcnow().isoformat()
+            }
+        }
+
+        # Tries to add a new process to the pool
+        try:
+            logging.info('Adding dataset task to the pool ...')
+
+            # Saving the job's initial status
+            self.job_store.save(job_id, data['callback'])
+
+            # Adding process to the pool
+            self.process_manager.add_process(
+                {'target': self.processor, 'data': data})
+
+        # If the backlog is full, reply asking the client to retry later
+        except queue.Full:
+            logging.warning('Backlog is full, rejecting task ...')
+
+            # Removing the rejected job's status and its dataset
+            self.job_store.delete(job_id)
+            self.dataset_registry.delete(meta['id'])
+
+            # Setting status to too many requests
+            self.set_status(429)
+
+            # Hinting when the client should retry
+            self.set_header('Retry-After', c.WORKERS_RETRY_AFTER)
+
+            # Writing back an error message
+            self.finish(dict(error='The pool is full, please try again later.'))
+
+            return False
+
+        # If process could not be added to the pool, reply with an error
+        except Exception as e:
+            logging.exception(e)
+
+            # Removing the rejected job's status and its dataset
+            self.job_store.delete(job_id)
+            self.dataset_registry.delete(meta['id'])
+
+            # Setting status to error
+            self.set_status(500)
+
+            # Writing back an error message
+            self.finish(dict(error='Failed to add a new task to the pool.'))
+
+            return False
+
+        # Writing back a success message
+        self.finish(dict(sucess='A new dataset has been registered.', id=meta['id'], job_id=job_id))
+
+        return True
@@ -0,0 +1,47 @@
+from handlers.base_handler import BaseHandler
+
+
+class JobsHandler(BaseHandler):
+    """A JobsHandler defines all possible methods for inspecting a submitted job.
+
+    """
+
+    def initialize(self, **kwargs):
+        """Initializes the current handler.
+
+        """
+
+        # Gathers the config object from keyword arguments
+        self.config = kwargs.get('config')
+
+        # Gathers the job store from keyword arguments
+        self.job_store = kwargs.get('job_store')
+
+    async def get(self, _id):
+        """It defines the GET request for this handler.
+
+        Args:
+            _id (str): Job's identifier.
+
+        Returns:
+            It will return either 'True' or 'False' along with the job's status or an 'error' response.
+
+        """
+
+        # Gathers the job's status
+        status = self.job_store.get(_id)
+
+        # If there is no job with such identifier
+        if status is None:
+            # Setting status to not found
+            self.set_status(404)
+
+            # Writing back an error message
+            self.finish(dict(error='There is no job with such identifier.'))
+
+            return False
+
+        # Writing back the job's status
+        self.finish(status)
+
+        return True
@@ -0,0 +1,24 @@
+from handlers.base_handler import BaseHandler
+from utils.metrics import get_metrics
+
+
+class MetricsHandler(BaseHandler):
+    """A MetricsHandler defines all possible methods for exposing the application's metrics.
+
+    """
+
+    async def get(self):
+        """It defines the GET request for this handler.
+
+        Returns:
+            It will return the metrics of every process in Prometheus' text format.
+
+        """
+
+        # Setting Prometheus' text format
+        self.set_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+
+        # Writing back the merged metrics
+        self.finish(get_metrics().collect())
+
+        return True
@@ -1,13 +1,11 @@
 import logging
-import os
 
 import tornado
+from tornado.ioloop import IOLoop
 
-import utils.constants as c
-import utils.file as f
 from handlers.base_handler import BaseHandler
-from learners.fasttext_learner import FasttextLearner
-from learners.spacy_learner import SpacyLearner
+from learners.registry import is_registered
+from processors.predictor_processor import PredictorProcessor
 
 
 class PredictorHandler(BaseHandler):
@@ -23,6 +21,15 @@ class PredictorHandler(BaseHandler):
         # Gathers the config object from keyword arguments
         self.config = kwargs.get('config')
 
+        # Gathers the inference executor from keyword arguments
+        self.predictor_pool = kwargs.get('predictor_pool')
+
+        # Gathers the requests coalescer from keyword arguments
+        self.coalescer = kwargs.get('coalescer')
+
+        # Creates the processor for this handler
+        self.processor = PredictorProcessor()
+
     async def post(self):
         """It defines the POST request for this handler.
 
@@ -40,53 +47,58 @@ class PredictorHandler(BaseHandler):
         # Gathering the model's type
         _type = req['type']
 
-        # Gathering the samples
-        samples = req['samples']
-
-        # Creates a variable with the .zip model's file path
-        model_path = os.path.join(c.DEFAULT_PATH, _id)
-
-        # If there is no avaliable model
-        if not os.path.exists(model_path):
-            # Tries to unzip the model
-            try:
-                # Creates a zipped file path
-                model_path_zip = model_path + '.zip'
-
-                # Unzips the model
-                model_path = f.unzip_file(model_path_zip, c.DEFAULT_PATH, _id)
-
-                logging.info(f'Model unzipped to folder: {model_path}')
-
-            except FileNotFoundError:
-                logging.error(f'Could not find {model_path_zip}')
+        # Checks if there is a learner of such type
+        if not is_registered(_type):
+            # Setting status to bad request
+            self.set_status(400)
 
-                # Returns an error
-                self.set_status(500)
+            # Writing back an error message
+            self.finish(dict(error=f'There is no learner of type `{_type}`.'))
 
-                # Writing back an error message
-                self.finish(
-                    dict(error='There is no avaliable model with such identifier.'))
+            return False
 
-                return False
+        # Exposes the model's type to the request's metrics
+        self.model_type = _type
 
-        # Checks if the learner's type is from Spacy
-        if _type == 'spacy':
-            # If yes, creates a SpacyLearner
-            l = SpacyLearner()
+        # Gathering the samples
+        samples = req['samples']
 
-        # Checks if the learner's type is from Fasttext
-        elif _type == 'fasttext':
-            # If yes, creates a FasttextLearner
-            l = FasttextLearner()
+        # Gathering the optional parameters
+        params = req.get('params', {})
 
-        # Loads the model
-        l.load(model_path)
+        # Creating the data object
+        data = {
+            'id': _id,
+            'type': _type,
+            'samples': samples,
+            'params': params
+        }
 
         # Tries to perform the prediction
         try:
-            # Actually performs the prediction
-            preds = l.predict(samples)
+            # Checks if requests should be coalesced
+            if self.coalescer:
+                # Waits for the batched prediction
+                preds = await self.coalescer.submit(data)
+
+            # If not, performs the prediction by itself
+            else:
+                # Actually performs the prediction on the inference executor
+                preds = await IOLoop.current().run_in_executor(
+                    self.predictor_pool, self.processor.consume, data)
+
+        # If there is no avaliable model, reply with an error
+        except FileNotFoundError as e:
+            logging.error(e)
+
+            # Returns an error
+            self.set_status(500)
+
+            # Writing back an error message
+            self.finish(
+                dict(error='There is no avaliable model with such identifier.'))
+
+            return False
 
         # If prediction could not be realized, reply with an error
         except Exception as e:
@@ -0,0 +1,264 @@
+import datetime
+import logging
+import numbers
+import queue
+import uuid
+
+import tornado
+
+import utils.constants as c
+from handlers.base_handler import BaseHandler
+from learners.registry import is_registered
+from processors.sweeper_processor import SWEEP_METRICS, SweeperProcessor
+
+
+def validate_search(search, strategy, n_trials, _type, metric=None):
+    """Validates a sweep's search space, amount of trials and metric.
+
+    Args:
+        search (dict): The search space, mapping each hyperparam to its possible values.
+        strategy (str): The search's strategy (`grid` or `random`).
+        n_trials (int): Amount of trials of a random search.
+        _type (str): Learner's type.
+        metric (str): The metric that should be maximized.
+
+    Returns:
+        An error message or None if the search is valid.
+
+    """
+
+    # Checks if the learner's metrics are known
+    if _type in SWEEP_METRICS:
+        # Checks if the metric is one of them
+        if metric is not None and metric not in SWEEP_METRICS[_type]:
+            return f'The `metric` should be one of: {", ".join(SWEEP_METRICS[_type])}.'
+
+    # If not, the metric should be supplied
+    elif not isinstance(metric, str) or not metric:
+        return f'A `metric` should be supplied for `{_type}` learners.'
+
+    # Checks if the search space is a non-empty dictionary
+    if not isinstance(search, dict) or not search:
+        return 'The `search` should be a non-empty object.'
+
+    # Gathers the maximum amount of trials
+    max_trials = int(c.SWEEPER_MAX_TRIALS)
+
+    # Initializes the amount of combinations
+    n_combinations = 1
+
+    # For every hyperparam in the search space
+    for key, values in search.items():
+        # Checks if the hyperparam is sampled from a range
+        if isinstance(values, dict):
+            # Only random searches can sample from ranges
+            if strategy != 'random':
+                return f'The `{key}` range is only supported by `random` searches.'
+
+            # Checks if the range is properly bounded
+            if not all(isinstance(values.get(k), numbers.Real) and not isinstance(values.get(k), bool)
+                       for k in ('min', 'max')) or values['min'] > values['max']:
+                return f'The `{key}` range should hold numeric `min` and `max`, where `min` <= `max`.'
+
+        # If not, it should be a non-empty list of values
+        elif isinstance(values, list) and values:
+            n_combinations *= len(values)
+
+        # If it is neither, the hyperparam is invalid
+        else:
+            return f'The `{key}` values should be a non-empty list or a `min` and `max` range.'
+
+    # Gathers the amount of trials according to the strategy
+    n = n_trials if strategy == 'random' else n_combinations
+
+    # Checks if the amount of trials is within its bounds
+    if n < 1 or n > max_trials:
+        return f'The sweep should have between 1 and {max_trials} trials, but it has {n}.'
+
+    return None
+
+
+class SweeperHandler(BaseHandler):
+    """A SweeperHandler defines all possible methods for sweeping a model's hyperparams.
+
+    """
+
+    def initialize(self, **kwargs):
+        """Initializes the current handler.
+
+        """
+
+        # Gathers the config object from keyword arguments
+        self.config = kwargs.get('config')
+
+        # Gathers the process manager object from keyword arguments
+        self.process_manager = kwargs.get('process_manager')
+
+        # Gathers the job store from keyword arguments
+        self.job_store = kwargs.get('job_store')
+
+        # Creates the processor for this handler
+        self.processor = SweeperProcessor
+
+    async def post(self):
+        """It defines the POST request for this handler.
+
+        Returns:
+            It will return either 'True' or 'False' along with a 'success' or an 'error' response.
+
+        """
+
+        # Getting request object
+        req = tornado.escape.json_decode(self.request.body)
+
+        # Gathering the task's type
+        _type = req['type']
+
+        # Gathering the search's strategy (`grid` or `random`)
+        strategy = req.get('strategy', 'grid')
+
+        # Checks if the strategy is supported
+        if strategy not in ('grid', 'random'):
+            # Setting status to bad request
+            self.set_status(400)
+
+            # Writing back an error message
+            self.finish(dict(error='The `strategy` should be either `grid` or `random`.'))
+
+            return False
+
+        # Tries to gather the sweep's numeric options
+        try:
+            n_trials = int(req.get('n_trials', c.SWEEPER_N_TRIALS))
+            validation_split = float(req.get('validation_split', c.SWEEPER_VALIDATION_SPLIT))
+            parallel = int(req.get('parallel', c.SWEEPER_PARALLEL))
+
+        # If any of them is not a number, the request is invalid
+        except (TypeError, ValueError):
+            n_trials, validation_split, parallel = None, None, None
+
+        # Checks if the numeric options are within their bounds
+        if n_trials is None or not 0 < validation_split < 1 or parallel < 1:
+            # Setting status to bad request
+            self.set_status(400)
+
+            # Writing back an error message
+            self.finish(dict(error='The `n_trials` and `parallel` should be positive integers and '
+                                   'the `validation_split` should be between 0 and 1.'))
+
+            return False
+
+        # Validates the search space, the amount of trials and the metric
+        error = validate_search(req.get('search'), strategy, n_trials, _type, req.get('metric'))
+
+        # Checks if the search is invalid
+        if error:
+            # Setting status to bad request
+            self.set_status(400)
+
+            # Writing back an error message
+            self.finish(dict(error=error))
+
+            return False
+
+        # Checks if the inline samples can be split into both training and validation
+        if isinstance(req.get('samples'), list) and len(req['samples']) < 2:
+            # Setting status to bad request
+            self.set_status(400)
+
+            # Writing back an error message
+            self.finish(dict(error='At least 2 samples are needed for sweeping.'))
+
+            return False
+
+        # Checks if there is a learner of such type
+        if not is_registered(_type):
+            # Setting status to bad request
+            self.set_status(400)
+
+            # Writing back an error message
+            self.finish(dict(error=f'There is no learner of type `{_type}`.'))
+
+            return False
+
+        # Exposes the model's type to the request's metrics
+        self.model_type = _type
+
+        # Checks if the callback's URL may be used
+        if not self.accepts_callback_url(req.get('callback_url')):
+            return False
+
+        # Creating the job's unique identifier
+        job_id = str(uuid.uuid4())
+
+        # Creating the data object
+        data = {
+            'job_id': job_id,
+            'type': _type,
+            'language': req['language'],
+            'samples': req.get('samples'),
+            'dataset': req.get('dataset'),
+            'hyperparams': req.get('hyperparams', {}),
+            'search': req['search'],
+            'strategy': strategy,
+            'n_trials': n_trials,
+            'validation_split': validation_split,
+            'parallel': parallel,
+            'metric': req.get('metric'),
+            'callback_url': req.get('callback_url'),
+            'callback': {
+                'id': job_id,
+                'task': 'sweeper',
+                'status': 'queued',
+                'start_time': datetime.datetime.utcnow().isoformat()
+            }
+        }
+
+        # Tries to add a new process to the pool
+        try:
+            logging.info('Adding sweeper task to the pool ...')
+
+            # Saving the job's initial status
+            self.job_store.save(job_id, data['callback'])
+
+            # Adding process to the pool
+            self.process_manager.add_process(
+                {'target': self.processor, 'data': data})
+
+        # If the backlog is full, reply asking the client to retry later
+        except queue.Full:
+            logging.warning('Backlog is full, rejecting task ...')
+
+            # Removing the rejected job's status
+            self.job_store.delete(job_id)
+
+            # Setting status to too many requests
+            self.set_status(429)
+
+            # Hinting when the client should retry
+            self.set_header('Retry-After', c.WORKERS_RETRY_AFTER)
+
+            # Writing back an error message
+            self.finish(dict(error='The pool is full, please try again later.'))
+
+            return False
+
+        # If process could not be added to the pool, reply with an error
+        except Exception as e:
+            logging.exception(e)
+
+            # Removing the rejected job's status
+            self.job_store.delete(job_id)
+
+            # Setting status to error
+            self.set_status(500)
+
+            # Writing back an error message
+            self.finish(dict(error='Failed to add a new task to the pool.'))
+
+            return False
+
+        # Writing back a success message
+        self.finish(dict(sucess='A new task has been added to the pool.', id=job_id))
+
+        return True
@@ -1,9 +1,13 @@
 import datetime
 import logging
+import queue
+import uuid
 
 import tornado
 
+import utils.constants as c
 from handlers.base_handler import BaseHandler
+from learners.registry import is_registered
 from processors.trainer_processor import TrainerProcessor
 
 
@@ -23,6 +27,9 @@ class TrainerHandler(BaseHandler):
         # Gathers the process manager object from keyword arguments
         self.process_manager = kwargs.get('process_manager')
 
+        # Gathers the job store from keyword arguments
+        self.job_store = kwargs.get('job_store')
+
         # Creates the processor for this handler
         self.processor = TrainerProcessor
 
@@ -40,22 +47,84 @@ class TrainerHandler(BaseHandler):
         # Gathering the task's type
         _type = req['type']
 
+        # Checks if there is a learner of such type
+        if not is_registered(_type):
+            # Setting status to bad request
+            self.set_status(400)
+
+            # Writing back an error message
+            self.finish(dict(error=f'There is no learner of type `{_type}`.'))
+
+            return False
+
+        # Exposes the model's type to the request's metrics
+        self.model_type = _type
+
+        # Checks if the callback's URL may be used
+        if not self.accepts_callback_url(req.get('callback_url')):
+            return False
+
         # Gathering the model's language
         language = req['language']
 
-        # Gathering the samples
-        samples = req['samples']
+        # Gathering the samples, which might be replaced by a dataset's reference
+        samples = req.get('samples')
+
+        # Gathering the optional dataset's identifier
+        dataset = req.get('dataset')
+
+        # Checks if there is nothing to be consumed
+        if samples is None and not dataset:
+            # Setting status to bad request
+            self.set_status(400)
+
+            # Writing back an error message
+            self.finish(dict(error='Either `samples` or `dataset` should be supplied.'))
+
+            return False
 
         # Gathering the hyperparams
         hyperparams = req['hyperparams']
 
+        # Gathering the optional model's identifier to warm start from
+        base_model = req.get('base_model')
+
+        # Gathering the optional dataset's identifier whose samples are replayed
+        replay_dataset = req.get('replay_dataset')
+
+        # Gathering the fraction of the replayed samples
+        replay_fraction = float(req.get('replay_fraction', 0.2))
+
+        # Gathering the optional validation samples, which might be replaced by a dataset's reference
+        validation = req.get('validation')
+
+        # Gathering the optional validation dataset's identifier
+        validation_dataset = req.get('validation_dataset')
+
+        # Gathering the optional callback's URL
+        callback_url = req.get('callback_url')
+
+        # Creating the job's unique identifier
+        job_id = str(uuid.uuid4())
+
         # Creating the data object
         data = {
+            'job_id': job_id,
             'type': _type,
             'language': language,
             'samples': samples,
+            'dataset': dataset,
             'hyperparams': hyperparams,
+            'validation': validation,
+            'validation_dataset': validation_dataset,
+            'base_model': base_model,
+            'replay_dataset': replay_dataset,
+            'replay_fraction': replay_fraction,
+            'callback_url': callback_url,
             'callback': {
+                'id': job_id,
+                'task': 'trainer',
+                'status': 'queued',
                 'start_time': datetime.datetime.utcnow().isoformat()
             }
         }
@@ -64,14 +133,38 @@ class TrainerHandler(BaseHandler):
         try:
             logging.info('Adding trainer task to the pool ...')
 
+            # Saving the job's initial status
+            self.job_store.save(job_id, data['callback'])
+
             # Adding process to the pool
             self.process_manager.add_process(
                 {'target': self.processor, 'data': data})
 
+        # If the backlog is full, reply asking the client to retry later
+        except queue.Full:
+            logging.warning('Backlog is full, rejecting task ...')
+
+            # Removing the rejected job's status
+            self.job_store.delete(job_id)
+
+            # Setting status to too many requests
+            self.set_status(429)
+
+            # Hinting when the client should retry
+            self.set_header('Retry-After', c.WORKERS_RETRY_AFTER)
+
+            # Writing back an error message
+            self.finish(dict(error='The pool is full, please try again later.'))
+
+            return False
+
         # If process could not be added to the pool, reply with an error
         except Exception as e:
             logging.exception(e)
 
+            # Removing the rejected job's status
+            self.job_store.delete(job_id)
+
             # Setting status to error
             self.set_status(500)
 
@@ -81,6 +174,6 @@ class TrainerHandler(BaseHandler):
             return False
 
         # Writing back a success message
-        self.finish(dict(sucess='A new task has been added to the pool.'))
+        self.finish(dict(sucess='A new task has been added to the pool.', id=job_id))
 
         return True
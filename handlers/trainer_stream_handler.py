@@ -0,0 +1,247 @@
+import datetime
+import logging
+import os
+import queue
+import uuid
+
+import tornado
+from tornado.web import stream_request_body
+
+import utils.constants as c
+from handlers.base_handler import BaseHandler
+from learners.registry import is_registered
+from processors.trainer_processor import TrainerProcessor
+
+
+@stream_request_body
+class TrainerStreamHandler(BaseHandler):
+    """A TrainerStreamHandler defines all possible methods for learning a model
+    from a streamed JSONL body, which is spooled to the disk instead of being kept in memory.
+
+    """
+
+    def initialize(self, **kwargs):
+        """Initializes the current handler.
+
+        """
+
+        # Gathers the config object from keyword arguments
+        self.config = kwargs.get('config')
+
+        # Gathers the process manager object from keyword arguments
+        self.process_manager = kwargs.get('process_manager')
+
+        # Gathers the job store from keyword arguments
+        self.job_store = kwargs.get('job_store')
+
+        # Creates the processor for this handler
+        self.processor = TrainerProcessor
+
+        # Initializes the spool file as empty
+        self.spool_file = None
+
+        # Initializes the job as not queued
+        self.queued = False
+
+    def prepare(self):
+        """Prepares the spool file before receiving the request's body.
+
+        """
+
+        # Gathering the task's type
+        _type = self.get_query_argument('type', None)
+
+        # Checks if there is a learner of such type, before spooling anything
+        if not is_registered(_type):
+            # Setting status to bad request
+            self.set_status(400)
+
+            # Writing back an error message
+            self.finish(dict(error=f'There is no learner of type `{_type}`.'))
+
+            return
+
+        # Gathering the model's language
+        self.language = self.get_query_argument('language', None)
+
+        # Tries to gather the hyperparams
+        try:
+            self.hyperparams = tornado.escape.json_decode(self.get_query_argument('hyperparams', '{}'))
+
+        # If they are not a valid JSON, they are marked as invalid
+        except ValueError:
+            self.hyperparams = None
+
+        # Checks if the language and the hyperparams are valid, before spooling anything
+        if not self.language or not isinstance(self.hyperparams, dict):
+            # Setting status to bad request
+            self.set_status(400)
+
+            # Writing back an error message
+            self.finish(dict(error='The `language` should be supplied and the `hyperparams` should be a JSON object.'))
+
+            return
+
+        # Checks if the callback's URL may be used, before spooling anything
+        if not self.accepts_callback_url(self.get_query_argument('callback_url', None)):
+            return
+
+        # Allows larger bodies to be streamed (MB to bytes)
+        self.request.connection.set_max_body_size(int(float(c.API_MAX_STREAM_SIZE) * 1024 * 1024))
+
+        # Creating the job's unique identifier
+        self.job_id = str(uuid.uuid4())
+
+        # Makes sure that the spool folder exists
+        os.makedirs(c.DEFAULT_SPOOL_PATH, exist_ok=True)
+
+        # Creates the spool file's path
+        self.spool_path = os.path.join(c.DEFAULT_SPOOL_PATH, self.job_id + '.jsonl')
+
+        # Opens the spool file
+        self.spool_file = open(self.spool_path, 'wb')
+
+    def data_received(self, chunk):
+        """Writes a chunk of the request's body straight to the spool file.
+
+        Args:
+            chunk (bytes): A chunk of the request's body.
+
+        """
+
+        # Writes the chunk
+        self.spool_file.write(chunk)
+
+    def _remove_spool(self):
+        """Removes the spool file, unless its job has been queued.
+
+        """
+
+        # Checks if there is a spool file that has not been handed to a job
+        if self.spool_file and not self.queued:
+            # Closes the spool file
+            self.spool_file.close()
+
+            # Tries to remove the spool file
+            try:
+                os.remove(self.spool_path)
+
+            # If it has already been removed, there is nothing else to do
+            except FileNotFoundError:
+                pass
+
+    def on_connection_close(self):
+        """Removes the spool file whenever the connection is closed before the upload finishes.
+
+        """
+
+        self._remove_spool()
+
+    def on_finish(self):
+        """Removes the spool file whenever the request has finished without queueing its job.
+
+        """
+
+        self._remove_spool()
+
+        super(TrainerStreamHandler, self).on_finish()
+
+    async def post(self):
+        """It defines the POST request for this handler.
+
+        The model's type, language, hyperparams (as a JSON string), validation dataset's
+        and base model's identifiers and callback's URL are gathered from the query's
+        arguments, while the body holds a sample per line.
+
+        Returns:
+            It will return either 'True' or 'False' along with a 'success' or an 'error' response.
+
+        """
+
+        # Closes the spool file
+        self.spool_file.close()
+
+        # Gathering the task's type
+        _type = self.get_query_argument('type')
+
+        # Exposes the model's type to the request's metrics
+        self.model_type = _type
+
+        # Gathering the optional validation dataset's identifier
+        validation_dataset = self.get_query_argument('validation_dataset', None)
+
+        # Gathering the optional model's identifier to warm start from
+        base_model = self.get_query_argument('base_model', None)
+
+        # Gathering the optional callback's URL
+        callback_url = self.get_query_argument('callback_url', None)
+
+        # Creating the data object
+        data = {
+            'job_id': self.job_id,
+            'type': _type,
+            'language': self.language,
+            'samples_path': self.spool_path,
+            'hyperparams': self.hyperparams,
+            'validation_dataset': validation_dataset,
+            'base_model': base_model,
+            'callback_url': callback_url,
+            'callback': {
+                'id': self.job_id,
+                'task': 'trainer',
+                'status': 'queued',
+                'start_time': datetime.datetime.utcnow().isoformat()
+            }
+        }
+
+        # Tries to add a new process to the pool
+        try:
+            logging.info('Adding streamed trainer task to the pool ...')
+
+            # Saving the job's initial status
+            self.job_store.save(self.job_id, data['callback'])
+
+            # Adding process to the pool
+            self.process_manager.add_process(
+                {'target': self.processor, 'data': data})
+
+            # Hands the spool file over to the job
+            self.queued = True
+
+        # If the backlog is full, reply asking the client to retry later
+        except queue.Full:
+            logging.warning('Backlog is full, rejecting task ...')
+
+            # Removing the rejected job's status, while its spool file is removed once finished
+            self.job_store.delete(self.job_id)
+
+            # Setting status to too many requests
+            self.set_status(429)
+
+            # Hinting when the client should retry
+            self.set_header('Retry-After', c.WORKERS_RETRY_AFTER)
+
+            # Writing back an error message
+            self.finish(dict(error='The pool is full, please try again later.'))
+
+            return False
+
+        # If process could not be added to the pool, reply with an error
+        except Exception as e:
+            logging.exception(e)
+
+            # Removing the rejected job's status, while its spool file is removed once finished
+            self.job_store.delete(self.job_id)
+
+            # Setting status to error
+            self.set_status(500)
+
+            # Writing back an error message
+            self.finish(dict(error='Failed to add a new task to the pool.'))
+
+            return False
+
+        # Writing back a success message
+        self.finish(dict(sucess='A new task has been added to the pool.', id=self.job_id))
+
+        return True
@@ -40,13 +40,29 @@ class BaseLearner:
         """Stores the model to the disk.
 
         Returns:
-            It should return the path to the generated .zip.
+            It should return the path to the generated artifact.
 
         """
 
         raise NotImplementedError(
             'The method `_persist` should be implemented in the child.')
 
+    def build_dataset(self, language, samples, output_path):
+        """Builds a dataset in the learner's native format.
+
+        Args:
+            language (str): The language of the dataset.
+            samples (iterable): An iterable of samples to be converted.
+            output_path (str): Path of the dataset to be built.
+
+        Returns:
+            It should return the amount of converted samples.
+
+        """
+
+        raise NotImplementedError(
+            'The method `build_dataset` should be implemented in the child.')
+
     def load(self, model_path):
         """Loads a new learner.
 
@@ -58,13 +74,25 @@ class BaseLearner:
         raise NotImplementedError(
             'The method `load` should be implemented in the child.')
 
-    def fit(self, language, samples, hyperparams):
+    def has_checkpoint(self):
+        """Checks whether there is a checkpoint to resume the learner's training from.
+
+        Returns:
+            Whether there is a checkpoint with the learner's identifier, which is
+            never the case for learners that do not support checkpoints.
+
+        """
+
+        return False
+
+    def fit(self, language, samples, hyperparams, validation=None):
         """Fits a new learner.
 
         Args:
             language (str): The language of the model to be learned.
-            samples (list): A list of samples to be learned.
+            samples (iterable | str): An iterable of samples or the path to a native dataset.
             hyperparams (dict): A dictionary holding all the possible hyperparams.
+            validation (iterable | str): Held-out samples or the path to a native dataset.
 
         Returns:
             It should return the path to the learner saved in the local disk.
@@ -74,11 +102,12 @@ class BaseLearner:
         raise NotImplementedError(
             'The method `fit` should be implemented in the child.')
 
-    def evaluate(self, samples):
+    def evaluate(self, samples, params=None):
         """Evaluates a trained learner.
 
         Args:
-            samples (list): A list of samples to be evaluated.
+            samples (list | str): A list of samples or the path to a native dataset.
+            params (dict): A dictionary holding all the possible evaluation parameters.
 
         Returns:
             It should return the metrics of the evaluation.
@@ -88,11 +117,12 @@ class BaseLearner:
         raise NotImplementedError(
             'The method `evaluate` should be implemented in the child.')
 
-    def predict(self, samples):
+    def predict(self, samples, params=None):
         """Predicts new inputs using a trained learner.
 
         Args:
             samples (list): A list of samples to be predicted.
+            params (dict): A dictionary holding all the possible prediction parameters.
 
         Returns:
             It should return an already-structured predictions object.
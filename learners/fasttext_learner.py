@@ -26,20 +26,28 @@ class FasttextLearner(BaseLearner):
         # Override its parent class with the receiving parameters
         super(FasttextLearner, self).__init__(id=_id, type='fasttext')
 
+        # Cleaned labels of the model's intents
+        self.labels = {}
+
+        # Path of the loaded model's folder
+        self.model_path = None
+
+        # Variant of the loaded model (`full` or `quantized`)
+        self.variant = None
+
     def _parse(self, samples):
         """It parses an custom input JSON format to Fasttext's format.
 
+        Notice that samples are lazily parsed, so they can be streamed from the disk.
+
         Args:
-            samples (list): A list of samples to be parsed.
+            samples (iterable): An iterable of samples to be parsed.
 
-        Returns:
-            A list of tuples already parsed into Fasttext's data format.
+        Yields:
+            Each sample already parsed into Fasttext's data format.
 
         """
 
-        # Creating an empty list to hold the data
-        data = []
-
         # For every possible sample
         for s in samples:
             # Creates an empty list to hold the intents
@@ -50,16 +58,19 @@ class FasttextLearner(BaseLearner):
                 # Appending each intent to an unique string
                 intents += '__label__' + intent['label'].lower().strip() + ' '
 
-            # Appends the whole tuple to the data's list
-            data.append(intents + s['text'])
+            # Yields the whole line
+            yield intents + s['text']
 
-        return data
-
-    def _persist(self):
+    def _persist(self, quantize=None, input_path=None, threads=None):
         """Stores the model to the disk.
 
+        Args:
+            quantize (dict): A dictionary holding the quantization hyperparams, if it should be quantized.
+            input_path (str): Path of the training data, used when quantizing with retraining.
+            threads (int): Amount of threads used when quantizing with retraining.
+
         Returns:
-            The path to the generated zipfile.
+            The path to the generated artifact.
 
         """
 
@@ -69,12 +80,31 @@ class FasttextLearner(BaseLearner):
         # Creates the full path itself
         model_path = os.path.join(c.DEFAULT_PATH, self.id)
 
-        # Saves the model to disk
-        self.model.save_model(os.path.join(
-            stash_dir.name, c.DEFAULT_FASTTEXT_MODEL))
+        # Checks if the model has already been quantized, e.g., by a constrained autotune
+        if self.model.is_quantized():
+            # Saves the quantized model to disk
+            self.model.save_model(os.path.join(
+                stash_dir.name, c.DEFAULT_FASTTEXT_QUANTIZED_MODEL))
+
+        # If not, saves the full-precision model to disk
+        else:
+            self.model.save_model(os.path.join(
+                stash_dir.name, c.DEFAULT_FASTTEXT_MODEL))
+
+        # Checks if the model should be quantized
+        if quantize and not self.model.is_quantized():
+            logging.info(f'Quantizing model with: {quantize}')
+
+            # Quantizes the model
+            self.model.quantize(input=input_path, cutoff=quantize['cutoff'], qnorm=quantize['qnorm'],
+                                retrain=quantize['retrain'], dsub=quantize['dsub'], thread=threads)
+
+            # Saves the quantized model to disk
+            self.model.save_model(os.path.join(
+                stash_dir.name, c.DEFAULT_FASTTEXT_QUANTIZED_MODEL))
 
         # Zips the file
-        zip_path = f.zip_file(stash_dir.name, model_path + '.zip', self.id)
+        zip_path = f.zip_file(stash_dir.name, model_path, self.id)
 
         # Cleans up the temporary directory
         stash_dir.cleanup()
@@ -85,20 +115,124 @@ class FasttextLearner(BaseLearner):
         """Dumps data to a temporary file.
 
         Args:
-            input_data (list): Input data to be dumped.
+            input_data (iterable): Input data to be dumped.
             output_file (str): Output file to be saved.
 
         """
 
-        # Gathers all the data into a string
-        data = '\n'.join(input_data)
-
-        # Writes the file
-        output_file.write(data)
+        # Writes the file line by line, avoiding to hold all the data in memory
+        output_file.writelines(line + '\n' for line in input_data)
 
         # Closes the file
         output_file.close()
 
+    def build_dataset(self, language, samples, output_path):
+        """Builds a dataset in Fasttext's format, with a labeled sample per line.
+
+        Args:
+            language (str): The language of the dataset.
+            samples (iterable): An iterable of samples to be converted.
+            output_path (str): Path of the dataset to be built.
+
+        Returns:
+            The amount of converted samples.
+
+        """
+
+        # Initializes the amount of converted samples
+        n_samples = 0
+
+        # Opens the dataset's file
+        with open(output_path, 'w', encoding='utf-8') as output_file:
+            # For every parsed sample
+            for line in self._parse(samples):
+                # Writes the sample
+                output_file.write(line + '\n')
+
+                # Increases the amount of converted samples
+                n_samples += 1
+
+        return n_samples
+
+    def _export_vectors(self, temp_paths):
+        """Exports the loaded model's word vectors to a temporary file in Fasttext's `.vec` format.
+
+        Args:
+            temp_paths (list): A list where the paths of the created temporary files are appended.
+
+        Returns:
+            The path to the exported vectors.
+
+        """
+
+        # Gathers the model's words
+        words = self.model.get_words()
+
+        # Creates a temporary file
+        vectors_file = tempfile.NamedTemporaryFile(
+            'w', delete=False, encoding='utf-8', suffix='.vec')
+
+        # Keeps track of the temporary file, so it can be removed
+        temp_paths.append(vectors_file.name)
+
+        # Writes the header, holding the amount of words and their dimension
+        vectors_file.write(f'{len(words)} {self.model.get_dimension()}\n')
+
+        # Dumps a word and its vector per line
+        self._write_file((w + ' ' + ' '.join(f'{v:.5f}' for v in self.model.get_word_vector(w))
+                          for w in words), vectors_file)
+
+        return vectors_file.name
+
+    def _remove_files(self, paths):
+        """Removes temporary files, ignoring the ones that have already been removed.
+
+        Args:
+            paths (list): A list of files' paths.
+
+        """
+
+        # For every possible file
+        for path in paths:
+            # Tries to remove the file
+            try:
+                os.remove(path)
+
+            # If it has already been removed, keeps going
+            except FileNotFoundError:
+                pass
+
+    def _get_data_path(self, samples, temp_paths):
+        """Gathers the path to a file in Fasttext's format, dumping the samples if needed.
+
+        Args:
+            samples (iterable | str): An iterable of samples or the path to a native dataset.
+            temp_paths (list): A list where the paths of the created temporary files are appended.
+
+        Returns:
+            The path to the file in Fasttext's format.
+
+        """
+
+        # Checks if the samples are already in Fasttext's format
+        if isinstance(samples, str):
+            return samples
+
+        # Parsing samples to Fasttext's format
+        data = self._parse(samples)
+
+        # Creates a temporary file
+        data_file = tempfile.NamedTemporaryFile(
+            'w', delete=False, encoding='utf-8')
+
+        # Keeps track of the temporary file, so it can be removed
+        temp_paths.append(data_file.name)
+
+        # Dumps the data to a temporary file
+        self._write_file(data, data_file)
+
+        return data_file.name
+
     def load(self, model_path):
         """Loads a Fasttext's model.
 
@@ -109,34 +243,79 @@ class FasttextLearner(BaseLearner):
 
         logging.info(f'Loading model from: {model_path}')
 
-        # Actually loads the model
-        self.model = fasttext.load_model(
-            os.path.join(model_path, c.DEFAULT_FASTTEXT_MODEL))
+        # Keeps the model's folder, as it might hold other variants
+        self.model_path = model_path
+
+        # Gathers the quantized model's path
+        quantized_path = os.path.join(model_path, c.DEFAULT_FASTTEXT_QUANTIZED_MODEL)
+
+        # Gathers the full-precision model's path
+        full_path = os.path.join(model_path, c.DEFAULT_FASTTEXT_MODEL)
+
+        # Checks if the quantized model should be loaded, as it might be the only variant
+        if os.path.exists(quantized_path) and (c.FASTTEXT_QUANTIZED or not os.path.exists(full_path)):
+            # Actually loads the quantized model
+            self.model = fasttext.load_model(quantized_path)
+
+            # Marks the loaded variant
+            self.variant = 'quantized'
+
+        # If not, loads the full-precision model
+        else:
+            # Actually loads the model
+            self.model = fasttext.load_model(full_path)
+
+            # Marks the loaded variant
+            self.variant = 'full'
 
-    def fit(self, language, samples, hyperparams):
+        # Caches the formatted version of every model's label
+        self.labels = {label: label.replace('__label__', '').upper()
+                       for label in self.model.get_labels()}
+
+    def fit(self, language, samples, hyperparams, validation=None):
         """Learns a new Intent Classification model through Fasttext.
 
+        If a model has already been loaded, the training warm starts from its word
+        vectors, as Fasttext can not continue training a supervised model.
+
+        When the `autotune` hyperparam is supplied, Fasttext searches for the best
+        hyperparams against the validation samples within a time budget, and the
+        chosen ones are written back to the hyperparams.
+
         Args:
             language (str): The language of the model to be learned.
-            samples (list): A list of samples to be learned.
+            samples (iterable | str): An iterable of samples or the path to a native dataset.
             hyperparams (dict): A dictionary holding all the possible hyperparams.
+            validation (iterable | str): Held-out samples or the path to a native dataset, used by autotuning.
 
         Returns:
             The path to the model saved in the local disk.
 
         """
 
+        # Creates an empty list to hold the temporary files
+        temp_paths = []
+
         # Tries to learn a new model
         try:
-            # Parsing samples to Fasttext's format
-            train_data = self._parse(samples)
+            # Gathers the training data in Fasttext's format
+            train_path = self._get_data_path(samples, temp_paths)
+
+            # Initializes the pre-trained vectors as empty
+            vectors_path = ''
+
+            # Checks if the training should warm start from a loaded model
+            if self.model is not None:
+                logging.info('Warm starting from the loaded model ...')
+
+                # Exports the loaded model's vectors
+                vectors_path = self._export_vectors(temp_paths)
 
-            # Creates a temporary file
-            train = tempfile.NamedTemporaryFile(
-                'w', delete=False, encoding='utf-8')
+                # The vectors' dimension is given by the loaded model
+                hyperparams['dim'] = self.model.get_dimension()
 
-            # Dumps the data to a temporary file
-            self._write_file(train_data, train)
+                # The new model does not hold the loaded model's variants
+                self.model_path = None
 
             # Check if hyperparams are avaliable
             # Checking number of iterations
@@ -163,22 +342,46 @@ class FasttextLearner(BaseLearner):
             if 'loss' not in hyperparams:
                 hyperparams['loss'] = 'softmax'
 
-            logging.info(f'Training model with: {hyperparams}')
-
-            # Applying hyperparameters to local variables
-            epochs = hyperparams['n_iterations']
-            lr = hyperparams['lr']
-            dim = hyperparams['dim']
-            n_grams = hyperparams['n_grams']
-            ws = hyperparams['window_size']
-            loss = hyperparams['loss']
-
-            # Trains the model
-            self.model = fasttext.train_supervised(
-                input=train.name, lr=lr, dim=dim, ws=ws, epoch=epochs, wordNgrams=n_grams, loss=loss)
+            # Checking amount of threads
+            if 'threads' not in hyperparams:
+                hyperparams['threads'] = os.cpu_count()
+
+            # Checking quantization, which might be supplied as a boolean
+            if hyperparams.get('quantize') is True:
+                hyperparams['quantize'] = {}
+
+            # Checking quantization hyperparams
+            if hyperparams.get('quantize'):
+                hyperparams['quantize'].setdefault('cutoff', 0)
+                hyperparams['quantize'].setdefault('qnorm', False)
+                hyperparams['quantize'].setdefault('retrain', False)
+                hyperparams['quantize'].setdefault('dsub', 2)
+
+            # Checks if the hyperparams should be autotuned
+            if hyperparams.get('autotune'):
+                # Autotunes and trains the model
+                self._autotune(train_path, validation, hyperparams, temp_paths)
+
+            # If not, trains with the supplied hyperparams
+            else:
+                logging.info(f'Training model with: {hyperparams}')
+
+                # Applying hyperparameters to local variables
+                epochs = hyperparams['n_iterations']
+                lr = hyperparams['lr']
+                dim = hyperparams['dim']
+                n_grams = hyperparams['n_grams']
+                ws = hyperparams['window_size']
+                loss = hyperparams['loss']
+                threads = hyperparams['threads']
+
+                # Trains the model
+                self.model = fasttext.train_supervised(input=train_path, lr=lr, dim=dim, ws=ws, epoch=epochs,
+                                                       wordNgrams=n_grams, loss=loss, thread=threads,
+                                                       pretrainedVectors=vectors_path)
 
             # Persisting model to disk
-            model_path = self._persist()
+            model_path = self._persist(hyperparams.get('quantize'), train_path, hyperparams['threads'])
 
             logging.info(f'Saving model to: {model_path}')
 
@@ -189,35 +392,109 @@ class FasttextLearner(BaseLearner):
 
             return None
 
+        # Removes the temporary files, as long-lived workers would pile them up
+        finally:
+            self._remove_files(temp_paths)
+
         return model_path
 
-    def evaluate(self, samples):
+    def _autotune(self, train_path, validation, hyperparams, temp_paths):
+        """Trains a model with autotuned hyperparams, writing the chosen ones back.
+
+        Args:
+            train_path (str): Path of the training data.
+            validation (iterable | str): Held-out samples or the path to a native dataset.
+            hyperparams (dict): A dictionary holding all the possible hyperparams.
+            temp_paths (list): A list where the paths of the created temporary files are appended.
+
+        """
+
+        # Checks if there are validation samples
+        if validation is None:
+            raise RuntimeError('Autotuning requires validation samples.')
+
+        # Checking autotune, which might be supplied as a boolean
+        if hyperparams['autotune'] is True:
+            hyperparams['autotune'] = {}
+
+        # Checking autotune's time budget (in seconds)
+        hyperparams['autotune'].setdefault('duration', 300)
+
+        # Gathers the autotune's arguments
+        kwargs = {
+            'autotuneValidationFile': self._get_data_path(validation, temp_paths),
+            'autotuneDuration': hyperparams['autotune']['duration'],
+            'thread': hyperparams['threads']
+        }
+
+        # Checks if the model's size should be constrained, e.g., `2M`
+        if hyperparams['autotune'].get('model_size'):
+            kwargs['autotuneModelSize'] = hyperparams['autotune']['model_size']
+
+        # Checks if a specific metric should be optimized, e.g., `f1:__label__greeting`
+        if hyperparams['autotune'].get('metric'):
+            kwargs['autotuneMetric'] = hyperparams['autotune']['metric']
+
+        logging.info(f"Autotuning model with: {hyperparams['autotune']}")
+
+        # Trains the model while searching for the best hyperparams
+        self.model = fasttext.train_supervised(input=train_path, **kwargs)
+
+        # Gathers the chosen hyperparams
+        args = self.model.f.getArgs()
+
+        # Writes the chosen hyperparams back
+        hyperparams['n_iterations'] = args.epoch
+        hyperparams['lr'] = args.lr
+        hyperparams['dim'] = args.dim
+        hyperparams['n_grams'] = args.wordNgrams
+        hyperparams['window_size'] = args.ws
+        hyperparams['loss'] = args.loss.name
+
+        logging.info(f'Autotuned hyperparams: {hyperparams}')
+
+    def evaluate(self, samples, params=None):
         """Evaluates a trained model.
 
         Args:
-            samples (list): A list of samples to be evaluated.
+            samples (list | str): A list of samples or the path to a native dataset.
+            params (dict): A dictionary holding all the possible evaluation parameters.
 
         Returns:
             The metrics of the evaluation.
 
         """
 
+        # Creates an empty list to hold the temporary files
+        temp_paths = []
+
         # Tries to evaluate a trained model
         try:
-            # Parsing samples to Fasttext's format
-            test_data = self._parse(samples)
-
-            # Creates a temporary file
-            test = tempfile.NamedTemporaryFile(
-                'w', delete=False, encoding='utf-8')
-
-            # Dumps the data to a temporary file
-            self._write_file(test_data, test)
+            # Gathers the testing data in Fasttext's format
+            test_path = self._get_data_path(samples, temp_paths)
 
             logging.info('Evaluating model ...')
 
             # Evaluating model
-            m = self.model.test(test.name)
+            metrics = self._test(self.model, test_path)
+
+            # Gathers the paths of every model's variant
+            variants_paths = {
+                'full': os.path.join(self.model_path or '', c.DEFAULT_FASTTEXT_MODEL),
+                'quantized': os.path.join(self.model_path or '', c.DEFAULT_FASTTEXT_QUANTIZED_MODEL)
+            }
+
+            # If every variant is avaliable, reports the metrics of each one
+            if self.model_path and all(os.path.exists(p) for p in variants_paths.values()):
+                # The loaded variant has already been evaluated
+                metrics['variants'] = {self.variant: dict(metrics)}
+
+                # For every other variant
+                for variant, variant_path in variants_paths.items():
+                    if variant != self.variant:
+                        # Loads and evaluates the variant
+                        metrics['variants'][variant] = self._test(
+                            fasttext.load_model(variant_path), test_path)
 
         # If there is an exception
         except Exception as e:
@@ -226,6 +503,27 @@ class FasttextLearner(BaseLearner):
 
             return None
 
+        # Removes the temporary files
+        finally:
+            self._remove_files(temp_paths)
+
+        return metrics
+
+    def _test(self, model, test_path):
+        """Tests a model against a file in Fasttext's format.
+
+        Args:
+            model (FastText): The model to be tested.
+            test_path (str): Path of the testing data.
+
+        Returns:
+            The metrics of the test.
+
+        """
+
+        # Evaluating model
+        m = model.test(test_path)
+
         # Creating an object of metrics
         metrics = {
             'n_samples': m[0],
@@ -235,11 +533,12 @@ class FasttextLearner(BaseLearner):
 
         return metrics
 
-    def predict(self, samples):
+    def predict(self, samples, params=None):
         """Predicts new samples using the trained model.
 
         Args:
             samples (list): A list of samples to be predicted.
+            params (dict): A dictionary holding all the possible prediction parameters.
 
         Returns:
             An already-structured predictions object.
@@ -248,33 +547,40 @@ class FasttextLearner(BaseLearner):
 
         logging.info('Performing a new prediction ...')
 
-        # Creates an empty list for the predictions
-        preds = []
+        # Copies the params, so the caller's ones are not filled with defaults
+        params = dict(params or {})
 
-        # Iterate through every possible sample
-        for s in samples:
-            # Predicts using the model
-            res = self.model.predict(s['text'], k=-1)
+        # Checking number of returned intents
+        if 'k' not in params:
+            params['k'] = -1
+
+        # Checking probability threshold
+        if 'threshold' not in params:
+            params['threshold'] = 0.0
 
-            # Creating an empty list of intents
-            intents = []
+        # Gathers all texts to be predicted at once
+        texts = [s['text'] for s in samples]
 
-            for i, p in zip(res[0], res[1]):
-                # Gathering and formatting the prediction's intent
-                intent = i.replace('__label__', '').upper()
+        # If there is nothing to be predicted
+        if not texts:
+            return []
 
-                # Gathering and formatting the prediction's intent probability
-                prob = p
+        # Predicts every text using the model
+        labels, probs = self.model.predict(
+            texts, k=int(params['k']), threshold=float(params['threshold']))
+
+        # Creates an empty list for the predictions
+        preds = []
 
-                # Appending the current intent to the intents list
-                intents.append({
-                    'label': intent,
-                    'probability': prob
-                })
+        # Iterate through every possible sample and its predictions
+        for text, sample_labels, sample_probs in zip(texts, labels, probs):
+            # Gathers the formatted intents along with their probabilities
+            intents = [{'label': self.labels[i], 'probability': float(p)}
+                       for i, p in zip(sample_labels, sample_probs)]
 
             # Appends the prediction to the predictions
             preds.append({
-                'text': s['text'],
+                'text': text,
                 'intents': intents
             })
 
@@ -0,0 +1,178 @@
+import importlib
+import logging
+import threading
+import time
+
+# Entry points' group where external packages register their learners
+ENTRY_POINTS_GROUP = 'brainy.learners'
+
+# Built-in learners, as `type: module:class`
+LEARNERS = {
+    'fasttext': 'learners.fasttext_learner:FasttextLearner',
+    'spacy': 'learners.spacy_learner:SpacyLearner'
+}
+
+# Learners' classes that have already been imported
+_classes = {}
+
+# Learners registered through entry points, discovered on their first usage
+_entry_points = None
+
+# Lock used to guard the imports of the learners
+_registry_lock = threading.Lock()
+
+
+def _get_entry_points():
+    """Gathers the learners registered through entry points.
+
+    Returns:
+        A dictionary holding the learners' types and their loading functions.
+
+    """
+
+    # Tries to gather the entry points from the standard library (Python 3.8+)
+    try:
+        from importlib.metadata import entry_points
+
+        # Gathers every entry point
+        eps = entry_points()
+
+        # Selects the group's entry points
+        group = eps.select(group=ENTRY_POINTS_GROUP) if hasattr(eps, 'select') else eps.get(ENTRY_POINTS_GROUP, [])
+
+        return {ep.name: ep.load for ep in group}
+
+    # If it is not avaliable, falls back to setuptools
+    except ImportError:
+        pass
+
+    # Tries to gather the entry points from setuptools
+    try:
+        import pkg_resources
+
+        return {ep.name: ep.load for ep in pkg_resources.iter_entry_points(ENTRY_POINTS_GROUP)}
+
+    # If it is not avaliable either, there are no external learners
+    except ImportError:
+        return {}
+
+
+def get_entry_points():
+    """Gathers the learners registered through entry points, discovering them only once.
+
+    Returns:
+        A dictionary holding the learners' types and their loading functions.
+
+    """
+
+    global _entry_points
+
+    # Checks if the entry points have not been discovered yet
+    if _entry_points is None:
+        _entry_points = _get_entry_points()
+
+    return _entry_points
+
+
+def get_learner_types():
+    """Gathers the types of every registered learner.
+
+    Returns:
+        A sorted list of learners' types.
+
+    """
+
+    return sorted(set(LEARNERS) | set(get_entry_points()))
+
+
+def is_registered(_type):
+    """Checks whether there is a learner of a type, without importing it.
+
+    Args:
+        _type (str): Learner's type.
+
+    Returns:
+        Whether the learner is registered.
+
+    """
+
+    return _type in LEARNERS or _type in get_entry_points()
+
+
+def get_learner_class(_type):
+    """Gathers a learner's class, importing its backend on the first usage.
+
+    Args:
+        _type (str): Learner's type.
+
+    Returns:
+        The learner's class.
+
+    Raises:
+        RuntimeError: If there is no learner of such type.
+
+    """
+
+    with _registry_lock:
+        # Checks if the learner has already been imported
+        if _type in _classes:
+            return _classes[_type]
+
+        # Checks if the learner is registered
+        if not is_registered(_type):
+            raise RuntimeError(f'There is no learner of type `{_type}`.')
+
+        # Gathers the starting time of the import
+        start = time.perf_counter()
+
+        # Checks if the learner is a built-in one
+        if _type in LEARNERS:
+            # Gathers the learner's module and class
+            module_name, class_name = LEARNERS[_type].split(':')
+
+            # Imports the learner's class
+            _classes[_type] = getattr(importlib.import_module(module_name), class_name)
+
+        # If not, it has been registered through an entry point
+        else:
+            _classes[_type] = get_entry_points()[_type]()
+
+        logging.info(f'Imported `{_type}` learner in {time.perf_counter() - start:.2f}s.')
+
+        return _classes[_type]
+
+
+def create_learner(_type):
+    """Creates a learner according to its type.
+
+    Args:
+        _type (str): Learner's type.
+
+    Returns:
+        The created learner.
+
+    Raises:
+        RuntimeError: If there is no learner of such type.
+
+    """
+
+    return get_learner_class(_type)()
+
+
+def prewarm_learners(types):
+    """Imports the backends of chosen learners ahead of their first usage.
+
+    Args:
+        types (str): A comma-separated list of learners' types.
+
+    """
+
+    # For every possible learner's type
+    for _type in filter(None, [t.strip() for t in types.split(',')]):
+        # Tries to import the learner
+        try:
+            get_learner_class(_type)
+
+        # If the learner could not be imported, keeps going
+        except Exception as e:
+            logging.exception(e)
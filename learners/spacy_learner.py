@@ -1,12 +1,15 @@
+import json
 import logging
 import os
 import random
+import shutil
 import tempfile
 import uuid
 
 import spacy
 from spacy.gold import GoldParse
 from spacy.scorer import Scorer
+from spacy.tokens import DocBin
 from spacy.util import compounding, minibatch
 
 import utils.constants as c
@@ -59,11 +62,40 @@ class SpacyLearner(BaseLearner):
 
         return data
 
+    def _load_dataset(self, dataset_path):
+        """Loads a dataset in Spacy's native format into Spacy's training format.
+
+        Args:
+            dataset_path (str): Path of the dataset to be loaded.
+
+        Returns:
+            A list of tuples already parsed into Spacy's data format.
+
+        """
+
+        # Opens the dataset's file
+        with open(dataset_path, 'rb') as dataset_file:
+            # Loads the serialized documents
+            doc_bin = DocBin().from_bytes(dataset_file.read())
+
+        # Creating an empty list to hold the data
+        data = []
+
+        # For every possible document
+        for doc in doc_bin.get_docs(self.model.vocab):
+            # Gathers the document's entities
+            entities = [(e.start_char, e.end_char, e.label_) for e in doc.ents]
+
+            # Appends the whole tuple to the data's list
+            data.append((doc.text, {'entities': entities}))
+
+        return data
+
     def _persist(self):
         """Stores the model to the disk.
 
         Returns:
-            The path to the generated zipfile.
+            The path to the generated artifact.
 
         """
 
@@ -77,13 +109,138 @@ class SpacyLearner(BaseLearner):
         self.model.to_disk(stash_dir.name)
 
         # Zips the file
-        zip_path = f.zip_file(stash_dir.name, model_path + '.zip', self.id)
+        zip_path = f.zip_file(stash_dir.name, model_path, self.id)
 
         # Cleans up the temporary directory
         stash_dir.cleanup()
 
         return zip_path
 
+    def _save_checkpoint(self, checkpoint_path, state, best_bytes):
+        """Stores the training's state to the disk, so it can be resumed later.
+
+        Args:
+            checkpoint_path (str): Path of the checkpoint's folder.
+            state (dict): The training's state.
+            best_bytes (bytes): The serialized best model so far, if there is any.
+
+        """
+
+        logging.info(f"Saving checkpoint at iteration {state['iteration']} ...")
+
+        # Creates a temporary folder within the checkpoints' folder
+        temp_path = tempfile.mkdtemp(prefix=f'.{self.id}-', dir=os.path.dirname(checkpoint_path))
+
+        # Saves the current model
+        self.model.to_disk(os.path.join(temp_path, 'model'))
+
+        # Checks if there is a best model
+        if best_bytes:
+            # Saves the best model
+            with open(os.path.join(temp_path, 'best.bin'), 'wb') as best_file:
+                best_file.write(best_bytes)
+
+        # Saves the training's state
+        with open(os.path.join(temp_path, 'state.json'), 'w', encoding='utf-8') as state_file:
+            json.dump(state, state_file)
+
+        # Removes the previous checkpoint
+        shutil.rmtree(checkpoint_path, ignore_errors=True)
+
+        # Marks the new checkpoint as ready
+        os.rename(temp_path, checkpoint_path)
+
+    def _load_checkpoint(self, checkpoint_path):
+        """Loads the training's state from the disk, along with its model.
+
+        Args:
+            checkpoint_path (str): Path of the checkpoint's folder.
+
+        Returns:
+            The training's state and the serialized best model, or None if there is no checkpoint.
+
+        """
+
+        # Checks if there is a checkpoint
+        if not os.path.exists(os.path.join(checkpoint_path, 'state.json')):
+            return None, None
+
+        logging.info(f'Resuming from checkpoint: {checkpoint_path}')
+
+        # Loads the training's state
+        with open(os.path.join(checkpoint_path, 'state.json'), encoding='utf-8') as state_file:
+            state = json.load(state_file)
+
+        # Loads the current model
+        self.model = spacy.load(os.path.join(checkpoint_path, 'model'))
+
+        # Initializes the best model as empty
+        best_bytes = None
+
+        # Checks if there is a best model
+        if os.path.exists(os.path.join(checkpoint_path, 'best.bin')):
+            # Loads the best model
+            with open(os.path.join(checkpoint_path, 'best.bin'), 'rb') as best_file:
+                best_bytes = best_file.read()
+
+        return state, best_bytes
+
+    def has_checkpoint(self):
+        """Checks whether there is a checkpoint to resume the learner's training from.
+
+        Returns:
+            Whether there is a checkpoint with the learner's identifier.
+
+        """
+
+        return os.path.exists(os.path.join(c.DEFAULT_CHECKPOINTS_PATH, self.id, 'state.json'))
+
+    def build_dataset(self, language, samples, output_path):
+        """Builds a dataset in Spacy's native format, serializing its documents into a DocBin.
+
+        Args:
+            language (str): The language of the dataset.
+            samples (iterable): An iterable of samples to be converted.
+            output_path (str): Path of the dataset to be built.
+
+        Returns:
+            The amount of converted samples.
+
+        """
+
+        # Creating a blank model, used for tokenizing the samples
+        nlp = spacy.blank(language)
+
+        # Creating the documents' container
+        doc_bin = DocBin(attrs=['ENT_IOB', 'ENT_TYPE'])
+
+        # Initializes the amount of converted samples
+        n_samples = 0
+
+        # For every parsed sample
+        for text, label in self._parse(samples):
+            # Tokenizes the text
+            doc = nlp.make_doc(text)
+
+            # Gathers the entities' spans
+            spans = [doc.char_span(start, end, label=ent)
+                     for start, end, ent in label['entities']]
+
+            # Sets the entities, ignoring the ones misaligned with the tokens
+            doc.ents = [span for span in spans if span is not None]
+
+            # Adds the document to the container
+            doc_bin.add(doc)
+
+            # Increases the amount of converted samples
+            n_samples += 1
+
+        # Dumps the container to the disk
+        with open(output_path, 'wb') as output_file:
+            output_file.write(doc_bin.to_bytes())
+
+        return n_samples
+
     def load(self, model_path):
         """Loads a Spacy's model.
 
@@ -97,13 +254,20 @@ class SpacyLearner(BaseLearner):
         # Actually loads the model
         self.model = spacy.load(model_path)
 
-    def fit(self, language, samples, hyperparams):
+    def fit(self, language, samples, hyperparams, validation=None):
         """Learns a new Named Entity Recognition model through Spacy.
 
+        If a model has already been loaded, the training warm starts from it instead
+        of a blank model. The training is periodically checkpointed and resumed whenever a checkpoint
+        with the learner's identifier exists. When the `early_stopping` hyperparam is
+        supplied, the training stops once the held-out F-score stops improving and
+        the best model is kept.
+
         Args:
             language (str): The language of the model to be learned.
-            samples (list): A list of samples to be learned.
+            samples (iterable | str): An iterable of samples or the path to a native dataset.
             hyperparams (dict): A dictionary holding all the possible hyperparams.
+            validation (iterable | str): Held-out samples or the path to a native dataset, used by early stopping.
 
         Returns:
             The path to the model saved in the local disk.
@@ -112,17 +276,39 @@ class SpacyLearner(BaseLearner):
 
         # Tries to learn a new model
         try:
-            # Creating a blank model
-            self.model = spacy.blank(language)
+            # Gathers the checkpoint's path
+            checkpoint_path = os.path.join(c.DEFAULT_CHECKPOINTS_PATH, self.id)
+
+            # Makes sure that the checkpoints' folder exists
+            os.makedirs(c.DEFAULT_CHECKPOINTS_PATH, exist_ok=True)
+
+            # Checks if the training should warm start from a loaded model
+            warm_start = self.model is not None
+
+            # Tries to resume the training's state and its model
+            state, best_bytes = self._load_checkpoint(checkpoint_path)
+
+            # Checks if the training has been resumed
+            resumed = state is not None
 
-            # Creating a NER pipeline
-            ner = self.model.create_pipe('ner')
+            # Checks if the training has been resumed or warm started
+            if resumed or warm_start:
+                # Gathers the existing NER pipeline
+                ner = self.model.get_pipe('ner')
 
-            # Adding the pipeline to the model itself
-            self.model.add_pipe(ner, last=True)
+            # If not, starts from scratch
+            else:
+                # Creating a blank model
+                self.model = spacy.blank(language)
 
-            # Parsing samples to Spacy's format
-            train_data = self._parse(samples)
+                # Creating a NER pipeline
+                ner = self.model.create_pipe('ner')
+
+                # Adding the pipeline to the model itself
+                self.model.add_pipe(ner, last=True)
+
+            # Parsing samples to Spacy's format, or loading them if they are already native
+            train_data = self._load_dataset(samples) if isinstance(samples, str) else self._parse(samples)
 
             # For each possible example in the data
             for _, d in train_data:
@@ -148,16 +334,61 @@ class SpacyLearner(BaseLearner):
             if 'batch_size' not in hyperparams:
                 hyperparams['batch_size'] = 32
 
+            # Checking checkpoints' frequency (in iterations)
+            if 'checkpoint_every' not in hyperparams:
+                hyperparams['checkpoint_every'] = int(c.SPACY_CHECKPOINT_EVERY)
+
+            # Checking early stopping, which might be supplied as a boolean
+            if hyperparams.get('early_stopping') is True:
+                hyperparams['early_stopping'] = {}
+
+            # Checking early stopping hyperparams
+            if hyperparams.get('early_stopping'):
+                hyperparams['early_stopping'].setdefault('patience', 5)
+                hyperparams['early_stopping'].setdefault('min_delta', 0.001)
+                hyperparams['early_stopping'].setdefault('validation_split', 0.1)
+
             logging.info(f'Training model with: {hyperparams}')
 
-            # Starts the training
-            optimizer = self.model.begin_training()
+            # Gathers the early stopping hyperparams
+            early_stopping = hyperparams.get('early_stopping')
+
+            # Initializes the training's state, if it has not been resumed
+            state = state or {'iteration': 0, 'best_score': None, 'wait': 0}
+
+            # Gathers the held-out split's seed, which is checkpointed so a resumed training holds out the same samples
+            state.setdefault('split_seed', random.randrange(2 ** 32))
+
+            # Initializes the validation data as empty
+            valid_data = None
+
+            # Checks if the training should stop early
+            if early_stopping:
+                # Checks if there are validation samples
+                if validation is not None:
+                    # Parsing validation samples to Spacy's format, or loading them if they are already native
+                    valid_data = self._load_dataset(validation) if isinstance(
+                        validation, str) else self._parse(validation)
+
+                # If not, holds out a split of the training data
+                else:
+                    # Randomize the training data with the split's seed
+                    random.Random(state['split_seed']).shuffle(train_data)
+
+                    # Gathers the amount of validation samples
+                    n_validation = max(1, int(len(train_data) * early_stopping['validation_split']))
+
+                    # Splits the training data
+                    valid_data, train_data = train_data[:n_validation], train_data[n_validation:]
+
+            # Starts the training, or resumes it over the existing model
+            optimizer = self.model.resume_training() if resumed or warm_start else self.model.begin_training()
 
             # Applying new hyperparams
             optimizer.alpha = hyperparams['lr']
 
-            # For each iteration
-            for t in range(hyperparams['n_iterations']):
+            # For each remaining iteration
+            for t in range(state['iteration'], hyperparams['n_iterations']):
                 logging.debug(f"Iteration {t+1}/{hyperparams['n_iterations']}")
 
                 # Randomize the training data
@@ -181,11 +412,55 @@ class SpacyLearner(BaseLearner):
 
                 logging.debug(f"Loss: {loss['ner']}")
 
+                # Marks the iteration as finished
+                state['iteration'] = t + 1
+
+                # Checks if the training should stop early
+                if early_stopping:
+                    # Scores the model on the validation data
+                    score = self._score(valid_data)['ents_f']
+
+                    logging.debug(f'Validation F-score: {score}')
+
+                    # Checks if the model has improved enough
+                    if state['best_score'] is None or score - state['best_score'] > early_stopping['min_delta']:
+                        # Keeps the best model
+                        state['best_score'], state['wait'] = score, 0
+                        best_bytes = self.model.to_bytes()
+
+                    # If not, waits for another iteration
+                    else:
+                        state['wait'] += 1
+
+                # Checks if a checkpoint should be saved
+                if hyperparams['checkpoint_every'] and state['iteration'] % hyperparams['checkpoint_every'] == 0:
+                    self._save_checkpoint(checkpoint_path, state, best_bytes)
+
+                # Checks if the patience has run out
+                if early_stopping and state['wait'] >= early_stopping['patience']:
+                    logging.info(f"Stopping early at iteration {state['iteration']} ...")
+
+                    break
+
+            # Checks if there is a best model
+            if best_bytes:
+                # Restores the best model
+                self.model.from_bytes(best_bytes)
+
+            # Checks if the training has stopped early
+            if early_stopping:
+                # Adding the stopping iteration and the best score to the hyperparams
+                early_stopping['iteration'] = state['iteration']
+                early_stopping['best_score'] = state['best_score']
+
             # Persisting model to disk
             model_path = self._persist()
 
             logging.info(f'Saving model to: {model_path}')
 
+            # Removes the checkpoint, as the training has finished
+            shutil.rmtree(checkpoint_path, ignore_errors=True)
+
         # If there is an exception
         except Exception as e:
             # Logs the exception
@@ -195,11 +470,37 @@ class SpacyLearner(BaseLearner):
 
         return model_path
 
-    def evaluate(self, samples):
+    def _check_params(self, params):
+        """Checks the batching parameters, applying their default values if needed
+        and clamping them to their configured maxima.
+
+        Args:
+            params (dict): A dictionary holding all the possible batching parameters.
+
+        Returns:
+            The dictionary holding the checked parameters.
+
+        """
+
+        # Copies the params, so the caller's ones are not filled with defaults
+        params = dict(params or {})
+
+        # Checking batch size
+        params['batch_size'] = max(1, min(int(params.get('batch_size', c.SPACY_BATCH_SIZE)),
+                                          int(c.SPACY_MAX_BATCH_SIZE)))
+
+        # Checking number of processes
+        params['n_process'] = max(1, min(int(params.get('n_process', c.SPACY_N_PROCESS)),
+                                         int(c.SPACY_MAX_N_PROCESS)))
+
+        return params
+
+    def evaluate(self, samples, params=None):
         """Evaluates a trained model.
 
         Args:
-            samples (list): A list of samples to be evaluated.
+            samples (list | str): A list of samples or the path to a native dataset.
+            params (dict): A dictionary holding all the possible evaluation parameters.
 
         Returns:
             The metrics of the evaluation.
@@ -208,23 +509,11 @@ class SpacyLearner(BaseLearner):
 
         # Tries to learn a new model
         try:
-            # Parsing samples to Spacy's format
-            test_data = self._parse(samples)
+            # Parsing samples to Spacy's format, or loading them if they are already native
+            test_data = self._load_dataset(samples) if isinstance(samples, str) else self._parse(samples)
 
-            # Creates a scorer object
-            scorer = Scorer()
-
-            # For each sample in the testing data
-            for text, label in test_data:
-                # Creates a GoldParse object with the correct annotation
-                correct = GoldParse(self.model.make_doc(
-                    text), entities=label['entities'])
-
-                # Calculates the prediction
-                pred = self.model(text)
-
-                # Evaluates the prediction according to correct label
-                scorer.score(pred, correct)
+            # Scores the model on the testing data
+            metrics = self._score(test_data, params)
 
         # If there is an exception
         except Exception as e:
@@ -233,16 +522,47 @@ class SpacyLearner(BaseLearner):
 
             return None
 
-        # Outputs the scorer metrics to a specific variable
-        metrics = scorer.scores
-
         return metrics
 
-    def predict(self, samples):
+    def _score(self, data, params=None):
+        """Scores the model against data in Spacy's format.
+
+        Args:
+            data (list): A list of tuples in Spacy's data format.
+            params (dict): A dictionary holding all the possible batching parameters.
+
+        Returns:
+            The scorer's metrics.
+
+        """
+
+        # Checks the batching parameters
+        params = self._check_params(params)
+
+        # Creates a scorer object
+        scorer = Scorer()
+
+        # Streams the texts through the model in batches
+        docs = self.model.pipe((text for text, _ in data),
+                               batch_size=params['batch_size'], n_process=params['n_process'])
+
+        # For each sample in the data and its prediction
+        for (text, label), pred in zip(data, docs):
+            # Creates a GoldParse object with the correct annotation
+            correct = GoldParse(self.model.make_doc(
+                text), entities=label['entities'])
+
+            # Evaluates the prediction according to correct label
+            scorer.score(pred, correct)
+
+        return scorer.scores
+
+    def predict(self, samples, params=None):
         """Predicts new samples using the pre-trained model.
 
         Args:
             samples (list): A list of samples to be predicted.
+            params (dict): A dictionary holding all the possible prediction parameters.
 
         Returns:
             An already-structured predictions object.
@@ -251,14 +571,18 @@ class SpacyLearner(BaseLearner):
 
         logging.info('Performing a new prediction ...')
 
+        # Checks the batching parameters
+        params = self._check_params(params)
+
         # Creates an empty list for the predictions
         preds = []
 
-        # Iterate through every possible sample
-        for s in samples:
-            # Predicts using the model
-            res = self.model(s['text'])
+        # Streams the texts through the model in batches
+        docs = self.model.pipe((s['text'] for s in samples),
+                               batch_size=params['batch_size'], n_process=params['n_process'])
 
+        # Iterate through every possible sample and its prediction
+        for s, res in zip(samples, docs):
             # Creates an empty list for the entities
             entities = []
 
@@ -0,0 +1,133 @@
+import datetime
+import logging
+import os
+
+import utils.file as f
+from learners.registry import create_learner
+from utils.callback import get_callback_dispatcher
+from utils.dataset_registry import DatasetRegistry
+from utils.job_store import JobStore
+from utils.metrics import observe_job
+
+
+class DatasetProcessor:
+    """A DatasetProcessor class is in charge of converting a dataset to a learner's native format.
+
+    """
+
+    def consume(self, task):
+        """This method should be invoked by the workers on a pool to actually build
+        datasets parallelly.
+
+        Notice that this method just shelters the actual code that will be executed,
+        so any internal asynchronous exception will stay trapped here and logged explicitly.
+
+        Args:
+            task (dict): The task to be consumed.
+
+        """
+
+        # Creates the job store
+        store = JobStore()
+
+        # Creates the dataset registry
+        registry = DatasetRegistry()
+
+        # Gathers the dataset's metadata
+        meta = registry.get(task['id'])
+
+        # Tries to consume the task
+        try:
+            logging.info('Sending task to worker in the pool ...')
+
+            # Checks if the dataset has been deleted before its job has started
+            if meta is None:
+                raise RuntimeError('Dataset has been deleted.')
+
+            # Marking the task as running
+            task['callback']['status'] = 'running'
+
+            # Sharing the task's status
+            store.save(task['job_id'], task['callback'])
+
+            # Actually consumes the task
+            self._invoke_consume(task, registry)
+
+            # Marking the dataset as ready
+            meta['status'] = 'ready'
+            meta['n_samples'] = task['callback']['n_samples']
+
+            logging.info('Worker has finished the task.')
+
+        # If an exception has happened, logs it
+        except Exception as e:
+            logging.error('An exception has happened.')
+
+            logging.exception(e)
+
+            # Adding an error status and message to the callback
+            task['callback']['status'] = 'error'
+            task['callback']['error'] = str(e)
+
+            # Marking the dataset as failed, if it still exists
+            if meta is not None:
+                meta['status'] = 'error'
+
+        # Adding the time when the task has ended, if it has not been added yet
+        task['callback'].setdefault('end_time', datetime.datetime.utcnow().isoformat())
+
+        # Checks if the dataset existed when its job has started
+        if meta is not None:
+            # Tries to share the dataset's final status
+            try:
+                registry.save(task['id'], meta)
+
+            # If the dataset has been deleted while its job was running, there is nothing to be shared
+            except FileNotFoundError:
+                logging.warning(f"Dataset {task['id']} has been deleted while being built.")
+
+        # Sharing the task's final status
+        store.save(task['job_id'], task['callback'])
+
+        # Sending the callback to its sinks
+        get_callback_dispatcher().dispatch(task)
+
+        # Records the job's duration
+        observe_job(task)
+
+    def _invoke_consume(self, task, registry):
+        """Runs the actual conversion job.
+
+        Args:
+            task (dict): The task to be consumed.
+            registry (DatasetRegistry): The dataset registry.
+
+        """
+
+        logging.info(f"Consuming a `{task['type']}` task ...")
+
+        # Creates the learner according to the task's type
+        l = create_learner(task['type'])
+
+        # Gathers the native dataset's path
+        native_path = registry.get_native_path(task['id'], task['type'])
+
+        # Lazily reads the raw samples
+        samples = f.read_samples(registry.get_samples_path(task['id']))
+
+        # Builds the native dataset into a temporary path
+        n_samples = l.build_dataset(task['language'], samples, native_path + '.tmp')
+
+        # Atomically marks the native dataset as ready
+        os.replace(native_path + '.tmp', native_path)
+
+        # Adding the amount of samples to the callback
+        task['callback']['n_samples'] = n_samples
+
+        # Adding the time when the task has ended
+        task['callback']['end_time'] = datetime.datetime.utcnow().isoformat()
+
+        # Adding a success status to the callback
+        task['callback']['status'] = 'success'
+
+        logging.debug(f"Task callback: {task['callback']}")
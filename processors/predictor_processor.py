@@ -0,0 +1,39 @@
+import time
+
+from utils.metrics import get_metrics
+from utils.model_cache import load_learner
+
+
+class PredictorProcessor:
+    """A PredictorProcessor class is in charge of consuming the prediction task.
+
+    """
+
+    def consume(self, task):
+        """This method should be invoked by the inference executor to actually predict
+        new samples outside of the main IOLoop.
+
+        Notice that this method runs on either threads or processes, so the models cache
+        is shared between threads but belongs to each process.
+
+        Args:
+            task (dict): The task to be consumed.
+
+        Returns:
+            An already-structured predictions object.
+
+        """
+
+        # Gathers the loaded learner, either from the cache or from the disk
+        l = load_learner(task['id'], task['type'])
+
+        # Gathers the starting time of the prediction
+        start = time.perf_counter()
+
+        # Actually performs the prediction, where the inference workers should not spawn their own processes
+        preds = l.predict(task['samples'], dict(task['params'] or {}, n_process=1))
+
+        get_metrics().observe('brainy_model_phase_seconds', time.perf_counter() - start,
+                              phase='predict', type=task['type'])
+
+        return preds
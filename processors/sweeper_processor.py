@@ -0,0 +1,301 @@
+import datetime
+import itertools
+import logging
+import os
+import random
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import utils.constants as c
+import utils.file as f
+from learners.registry import create_learner
+from utils.callback import get_callback_dispatcher
+from utils.dataset_registry import DatasetRegistry
+from utils.job_store import JobStore
+from utils.metrics import observe_job
+from utils.process_manager import limit_threads
+
+# Metrics that can be maximized by each learner's type, where the first one is the default
+SWEEP_METRICS = {
+    'fasttext': ['precision', 'recall'],
+    'spacy': ['ents_f', 'ents_p', 'ents_r', 'token_acc']
+}
+
+
+def run_trial(_type, language, train_path, validation_path, hyperparams):
+    """Runs a single trial, training on the training split and evaluating on the validation one.
+
+    Args:
+        _type (str): Learner's type.
+        language (str): The language of the model to be learned.
+        train_path (str): Path of the training split in the learner's native format.
+        validation_path (str): Path of the validation split in the learner's native format.
+        hyperparams (dict): A dictionary holding the trial's hyperparams.
+
+    Returns:
+        A dictionary holding the trial's results.
+
+    """
+
+    # Limits the trial's native thread pools, as they are inherited from the sweep's worker
+    limit_threads(hyperparams['threads'])
+
+    # Creates the learner
+    l = create_learner(_type)
+
+    # Tries to learn and evaluate a new model
+    try:
+        # Learns a new model
+        model_path = l.fit(language, train_path, hyperparams)
+
+        # Evaluates the model on the validation split, if it has been properly trained
+        metrics = l.evaluate(validation_path) if model_path else None
+
+    # If an exception has happened, the trial is discarded
+    except Exception as e:
+        logging.exception(e)
+
+        return {'model_id': l.id, 'path': None, 'hyperparams': hyperparams, 'metrics': None}
+
+    return {
+        'model_id': l.id,
+        'path': model_path,
+        'hyperparams': hyperparams,
+        'metrics': metrics
+    }
+
+
+class SweeperProcessor:
+    """A SweeperProcessor class is in charge of consuming the hyperparameter sweep task.
+
+    """
+
+    def consume(self, task):
+        """This method should be invoked by the workers on a pool to actually sweep
+        hyperparams parallelly.
+
+        Notice that this method just shelters the actual code that will be executed,
+        so any internal asynchronous exception will stay trapped here and logged explicitly.
+
+        Args:
+            task (dict): The task to be consumed.
+
+        """
+
+        # Creates the job store
+        store = JobStore()
+
+        # Tries to consume the task
+        try:
+            logging.info('Sending task to worker in the pool ...')
+
+            # Marking the task as running
+            task['callback']['status'] = 'running'
+
+            # Sharing the task's status
+            store.save(task['job_id'], task['callback'])
+
+            # Actually consumes the task
+            self._invoke_consume(task)
+
+            logging.info('Worker has finished the task.')
+
+        # If an exception has happened, logs it
+        except Exception as e:
+            logging.error('An exception has happened.')
+
+            logging.exception(e)
+
+            # Adding an error status and message to the callback
+            task['callback']['status'] = 'error'
+            task['callback']['error'] = str(e)
+
+        # Adding the time when the task has ended, if it has not been added yet
+        task['callback'].setdefault('end_time', datetime.datetime.utcnow().isoformat())
+
+        # Sharing the task's final status
+        store.save(task['job_id'], task['callback'])
+
+        # Sending the callback to its sinks
+        get_callback_dispatcher().dispatch(task)
+
+        # Records the job's duration
+        observe_job(task)
+
+    def _get_trials(self, task):
+        """Expands the search space into the hyperparams of every trial.
+
+        Args:
+            task (dict): The task to be consumed.
+
+        Returns:
+            A list of dictionaries holding the hyperparams of each trial.
+
+        """
+
+        # Gathers the search space
+        space = task['search']
+
+        # Checks if the search should be random
+        if task['strategy'] == 'random':
+            # Creates an empty list to hold the trials
+            trials = []
+
+            # For every possible trial
+            for _ in range(task['n_trials']):
+                # Creates the trial's hyperparams from the base ones
+                trial = dict(task['hyperparams'])
+
+                # For every hyperparam in the search space
+                for key, values in space.items():
+                    # Checks if the hyperparam is sampled from a range
+                    if isinstance(values, dict):
+                        # Integer ranges are sampled as integers
+                        if isinstance(values['min'], int) and isinstance(values['max'], int):
+                            trial[key] = random.randint(values['min'], values['max'])
+
+                        # Other ranges are sampled uniformly
+                        else:
+                            trial[key] = random.uniform(values['min'], values['max'])
+
+                    # If not, it is sampled from a list of values
+                    else:
+                        trial[key] = random.choice(values)
+
+                # Appends the trial
+                trials.append(trial)
+
+            return trials
+
+        # Gathers the hyperparams' names
+        keys = sorted(space.keys())
+
+        # Combines every possible value of the hyperparams
+        return [dict(task['hyperparams'], **dict(zip(keys, values)))
+                for values in itertools.product(*[space[k] for k in keys])]
+
+    def _get_samples(self, task):
+        """Gathers the task's samples, either inline or from a registered dataset.
+
+        Args:
+            task (dict): The task to be consumed.
+
+        Returns:
+            A list of samples.
+
+        """
+
+        # Checks if the samples reference a registered dataset
+        if task.get('dataset'):
+            # Reads the dataset's raw samples
+            return list(f.read_samples(DatasetRegistry().get_samples_path(task['dataset'])))
+
+        return list(task['samples'])
+
+    def _invoke_consume(self, task):
+        """Runs the actual sweep job.
+
+        The samples are parsed and split only once, being shared in the learner's native
+        format by every trial, which run in parallel processes within the job. The parallel
+        trials are bounded by the trainer slots that the job occupies and share its thread budget.
+
+        Args:
+            task (dict): The task to be consumed.
+
+        """
+
+        logging.info(f"Consuming a `{task['type']}` task ...")
+
+        # Creates a learner used for building the splits
+        l = create_learner(task['type'])
+
+        # Gathers the metric that should be maximized
+        metric = task.get('metric') or SWEEP_METRICS.get(task['type'], [None])[0]
+
+        # Checks if there is a metric to be maximized
+        if metric is None:
+            raise RuntimeError(f"A `metric` should be supplied for `{task['type']}` learners.")
+
+        # Gathers and shuffles the samples
+        samples = self._get_samples(task)
+        random.shuffle(samples)
+
+        # Checks if the samples can be split into both training and validation
+        if len(samples) < 2:
+            raise RuntimeError('At least 2 samples are needed for sweeping.')
+
+        # Gathers the amount of validation samples, keeping at least one for training
+        n_validation = min(max(1, int(len(samples) * task['validation_split'])), len(samples) - 1)
+
+        # Creates a temporary directory for the splits
+        with tempfile.TemporaryDirectory() as splits_dir:
+            # Creates the paths of both splits
+            train_path = os.path.join(splits_dir, 'train.data')
+            validation_path = os.path.join(splits_dir, 'validation.data')
+
+            # Builds both splits in the learner's native format
+            l.build_dataset(task['language'], samples[n_validation:], train_path)
+            l.build_dataset(task['language'], samples[:n_validation], validation_path)
+
+            # Gathers the job's thread budget
+            threads = task.get('threads', 1)
+
+            # Clamps the parallel trials, so they do not exceed the occupied trainer slots nor the thread budget
+            parallel = max(1, min(task['parallel'], int(c.TRAINER_WORKERS), threads))
+
+            # Splits the job's thread budget among the parallel trials, never exceeding it
+            task['hyperparams']['threads'] = max(1, min(task['hyperparams'].get('threads', threads),
+                                                        threads // parallel))
+
+            # Expands the search space
+            trials = self._get_trials(task)
+
+            logging.info(f"Running {len(trials)} trials with {parallel} parallel workers ...")
+
+            # Runs every trial in parallel
+            with ProcessPoolExecutor(max_workers=parallel) as executor:
+                # Submits every trial
+                futures = [executor.submit(run_trial, task['type'], task['language'],
+                                           train_path, validation_path, trial) for trial in trials]
+
+                # Gathers the results
+                results = [future.result() for future in futures]
+
+        # Initializes the best trial as none
+        best = None
+
+        # Tries to gather the best trial
+        try:
+            # Gathers the trials that have been properly trained and evaluated on the metric
+            trained = [r for r in results if r['metrics'] and metric in r['metrics']]
+
+            # Checks if no trial has been properly trained
+            if not trained:
+                raise RuntimeError(f'No trial could been properly trained and evaluated on `{metric}`.')
+
+            # Gathers the best trial
+            best = max(trained, key=lambda r: r['metrics'][metric])
+
+        # Only the best model is kept, even if no trial could be chosen
+        finally:
+            # For every trial's result
+            for r in results:
+                # Removes the trial's model
+                if r is not best and r['path']:
+                    os.remove(r['path'])
+
+        # Adding the trials and the best one to the callback
+        task['callback']['trials'] = [{'hyperparams': r['hyperparams'], 'metrics': r['metrics']}
+                                      for r in results]
+        task['callback']['model_id'] = best['model_id']
+        task['callback']['path'] = best['path']
+        task['callback']['hyperparams'] = best['hyperparams']
+        task['callback']['metrics'] = best['metrics']
+
+        # Adding the time when the task has ended
+        task['callback']['end_time'] = datetime.datetime.utcnow().isoformat()
+
+        # Adding a success status to the callback
+        task['callback']['status'] = 'success'
+
+        logging.debug(f"Task callback: {task['callback']}")
@@ -1,11 +1,11 @@
 import datetime
 import logging
-import os
 
-import utils.constants as c
-import utils.file as f
-from learners.fasttext_learner import FasttextLearner
-from learners.spacy_learner import SpacyLearner
+from utils.callback import get_callback_dispatcher
+from utils.dataset_registry import DatasetRegistry
+from utils.job_store import JobStore
+from utils.metrics import observe_job
+from utils.model_cache import load_learner
 
 
 class TesterProcessor:
@@ -25,10 +25,19 @@ class TesterProcessor:
 
         """
 
+        # Creates the job store
+        store = JobStore()
+
         # Tries to consume the task
         try:
             logging.info('Sending task to worker in the pool ...')
 
+            # Marking the task as running
+            task['callback']['status'] = 'running'
+
+            # Sharing the task's status
+            store.save(task['job_id'], task['callback'])
+
             # Actually consumes the task
             self._invoke_consume(task)
 
@@ -40,6 +49,22 @@ class TesterProcessor:
 
             logging.exception(e)
 
+            # Adding an error status and message to the callback
+            task['callback']['status'] = 'error'
+            task['callback']['error'] = str(e)
+
+        # Adding the time when the task has ended, if it has not been added yet
+        task['callback'].setdefault('end_time', datetime.datetime.utcnow().isoformat())
+
+        # Sharing the task's final status
+        store.save(task['job_id'], task['callback'])
+
+        # Sending the callback to its sinks
+        get_callback_dispatcher().dispatch(task)
+
+        # Records the job's duration
+        observe_job(task)
+
     def _invoke_consume(self, task):
         """Runs the actual learning job.
 
@@ -54,46 +79,28 @@ class TesterProcessor:
 
         logging.info(f"Consuming a `{task['type']}` task ...")
 
-        # Checks if the task's type is from Spacy
-        if task['type'] == 'spacy':
-            # Creates a SpacyLearner
-            l = SpacyLearner()
-
-        # Checks if the task's type is from Fasttext
-        elif task['type'] == 'fasttext':
-            # Creates a FasttextLearner
-            l = FasttextLearner()
-
-        # Creates a variable with the .zip model's file path
-        model_path = os.path.join(c.DEFAULT_PATH, task['id'])
-
-        # If there is no avaliable model
-        if not os.path.exists(model_path):
-            # Tries to unzip the model
-            try:
-                # Creates a zipped file path
-                model_path_zip = model_path + '.zip'
-
-                # Unzips the model
-                model_path = f.unzip_file(model_path_zip, c.DEFAULT_PATH, task['id'])
-
-                logging.info(f'Model unzipped to folder: {model_path}')
+        # Tries to gather a preloaded learner or to load it from the disk, without caching it
+        try:
+            l = load_learner(task['id'], task['type'], add=False)
 
-            # If file could not be found
-            except:
-                # Adding an error status to the callback
-                task['callback']['status'] = 'error'
+        # If file could not be found
+        except FileNotFoundError:
+            # Adding an error status to the callback
+            task['callback']['status'] = 'error'
 
-                # Notify someone that the model has not been trained (callback)
-                logging.info('Sending callback ...')
+            raise RuntimeError('Model was not found.')
 
-                raise RuntimeError('Model was not found.')
+        # Checks if the samples reference a registered dataset
+        if task.get('dataset'):
+            # Gathers the dataset in the learner's native format
+            samples = DatasetRegistry().resolve(task['dataset'], task['type'])
 
-        # Loads the model
-        l.load(model_path)
+        # If not, the samples came within the task
+        else:
+            samples = task['samples']
 
         # Evaluates the model
-        metrics = l.evaluate(task['samples'])
+        metrics = l.evaluate(samples, task['params'])
 
         # Adding metrics to the callback data
         task['callback']['metrics'] = metrics
@@ -109,6 +116,3 @@ class TesterProcessor:
         # Deleting model from disk
         # logging.info('Deleting model from local disk ...')
         # os.remove(model_path)
-
-        # Notify someone that the model has been tested (callback)
-        # logging.info('Sending callback ...')
@@ -1,9 +1,15 @@
 import datetime
 import logging
 import os
+import random
 
-from learners.fasttext_learner import FasttextLearner
-from learners.spacy_learner import SpacyLearner
+import utils.constants as c
+import utils.file as f
+from learners.registry import create_learner
+from utils.callback import get_callback_dispatcher
+from utils.dataset_registry import DatasetRegistry
+from utils.job_store import JobStore
+from utils.metrics import observe_job
 
 
 class TrainerProcessor:
@@ -23,10 +29,19 @@ class TrainerProcessor:
 
         """
 
+        # Creates the job store
+        store = JobStore()
+
         # Tries to consume the task
         try:
             logging.info('Sending task to worker in the pool ...')
 
+            # Marking the task as running
+            task['callback']['status'] = 'running'
+
+            # Sharing the task's status
+            store.save(task['job_id'], task['callback'])
+
             # Actually consumes the task
             self._invoke_consume(task)
 
@@ -38,6 +53,85 @@ class TrainerProcessor:
 
             logging.exception(e)
 
+            # Adding an error status and message to the callback
+            task['callback']['status'] = 'error'
+            task['callback']['error'] = str(e)
+
+        # Adding the time when the task has ended, if it has not been added yet
+        task['callback'].setdefault('end_time', datetime.datetime.utcnow().isoformat())
+
+        # Sharing the task's final status
+        store.save(task['job_id'], task['callback'])
+
+        # Sending the callback to its sinks
+        get_callback_dispatcher().dispatch(task)
+
+        # Records the job's duration
+        observe_job(task)
+
+        # Checks if the samples have been spooled to the disk
+        if task.get('samples_path'):
+            # Tries to remove the spool file
+            try:
+                os.remove(task['samples_path'])
+
+            # If it has already been removed, there is nothing else to do
+            except FileNotFoundError:
+                pass
+
+    def _get_replay_samples(self, task):
+        """Lazily samples a fraction of a registered dataset's raw samples to be replayed.
+
+        Each sample is kept with the replayed fraction as its probability, so the dataset
+        is never loaded into memory.
+
+        Args:
+            task (dict): The task to be consumed.
+
+        Yields:
+            Each replayed sample.
+
+        """
+
+        # Gathers the fraction of the replayed samples
+        fraction = task.get('replay_fraction', 0.2)
+
+        # For every raw sample of the dataset
+        for sample in f.read_samples(DatasetRegistry().get_samples_path(task['replay_dataset'])):
+            # Checks if the sample has been drawn
+            if random.random() < fraction:
+                yield sample
+
+    def _mix_samples(self, samples, replayed):
+        """Lazily mixes the replayed samples into the new ones.
+
+        Every sample is drawn at random from either of them, until both are exhausted.
+
+        Args:
+            samples (iterable): The new samples.
+            replayed (iterable): The replayed samples.
+
+        Yields:
+            Each mixed sample.
+
+        """
+
+        # Creates the iterators of both samples
+        iterators = [iter(samples), iter(replayed)]
+
+        # While there are samples to be drawn
+        while iterators:
+            # Chooses an iterator at random
+            iterator = random.choice(iterators)
+
+            # Tries to draw its next sample
+            try:
+                yield next(iterator)
+
+            # If it has been exhausted, stops drawing from it
+            except StopIteration:
+                iterators.remove(iterator)
+
     def _invoke_consume(self, task):
         """Runs the actual learning job.
 
@@ -52,21 +146,80 @@ class TrainerProcessor:
 
         logging.info(f"Consuming a `{task['type']}` task ...")
 
-        # Checks if the task's type is from Spacy
-        if task['type'] == 'spacy':
-            # Creates a SpacyLearner
-            l = SpacyLearner()
+        # Creates the learner according to the task's type
+        l = create_learner(task['type'])
+
+        # Checks if the samples have been spooled to the disk
+        if task.get('samples_path'):
+            # Lazily reads the samples from the spool file
+            samples = f.read_samples(task['samples_path'])
+
+        # Checks if the samples reference a registered dataset
+        elif task.get('dataset'):
+            # Gathers the dataset in the learner's native format
+            samples = DatasetRegistry().resolve(task['dataset'], task['type'])
+
+        # If not, the samples came within the task
+        else:
+            samples = task['samples']
+
+        # Checks if the training should warm start from an existing model
+        if task.get('base_model'):
+            # Tries to load the base model into the new learner
+            try:
+                # Unzips the base model, holding its folder while it is loaded
+                with f.use_model(c.DEFAULT_PATH, os.path.basename(task['base_model'])) as model_path:
+                    l.load(model_path)
 
-        # Checks if the task's type is from Fasttext
-        elif task['type'] == 'fasttext':
-            # Creates a FasttextLearner
-            l = FasttextLearner()
+            # If file could not be found
+            except FileNotFoundError:
+                raise RuntimeError('Base model was not found.')
+
+            # Adding the base model's identifier to the callback
+            task['callback']['base_model'] = task['base_model']
+
+        # Checks if old samples should be replayed, limiting what the updated model forgets
+        if task.get('replay_dataset'):
+            # Native datasets can not be mixed, so their raw samples are used instead
+            if isinstance(samples, str):
+                samples = f.read_samples(DatasetRegistry().get_samples_path(task['dataset']))
+
+            # Lazily mixes the replayed samples into the new ones
+            samples = self._mix_samples(samples, self._get_replay_samples(task))
+
+        # Uses the job's thread budget, unless the hyperparams have their own
+        task['hyperparams'].setdefault('threads', task.get('threads', 1))
+
+        # Checks if the validation samples reference a registered dataset
+        if task.get('validation_dataset'):
+            # Gathers the validation dataset in the learner's native format
+            validation = DatasetRegistry().resolve(task['validation_dataset'], task['type'])
+
+        # If not, they might have come within the task
+        else:
+            validation = task.get('validation')
+
+        # Checks if the training should resume an interrupted one
+        if task['hyperparams'].get('resume'):
+            # Adopts the interrupted model's identifier, so its checkpoint is found
+            l.id = os.path.basename(task['hyperparams']['resume'])
+
+            # Checks if there is a checkpoint to resume from
+            if not l.has_checkpoint():
+                raise RuntimeError(f"There is no `{task['type']}` checkpoint to resume `{l.id}` from.")
+
+        # Adding the model's identifier to the callback, so an interrupted job can be resumed
+        task['callback']['model_id'] = l.id
+
+        # Sharing the model's identifier
+        JobStore().save(task['job_id'], task['callback'])
 
         # Learns a new model
-        model_path = l.fit(task['language'], task['samples'], task['hyperparams'])
+        model_path = l.fit(task['language'], samples, task['hyperparams'], validation)
 
-        # Adding the model's path to the callback
+        # Adding the model's path and final hyperparams to the callback
         task['callback']['path'] = model_path
+        task['callback']['hyperparams'] = task['hyperparams']
 
         # Adding the time when the task has ended
         task['callback']['end_time'] = datetime.datetime.utcnow().isoformat()
@@ -76,9 +229,6 @@ class TrainerProcessor:
             # Adding an error status to the callback
             task['callback']['status'] = 'error'
 
-            # Notify someone that the model has not been trained (callback)
-            logging.info('Sending callback ...')
-
             # Raises a RuntimeError warning that model could not been properly trained
             raise RuntimeError('Model could not been properly trained.')
 
@@ -93,6 +243,3 @@ class TrainerProcessor:
         # Deleting model from disk
         # logging.info('Deleting model from local disk ...')
         # os.remove(model_path)
-
-        # Notify someone that the model has been trained (callback)
-        # logging.info('Sending callback ...')
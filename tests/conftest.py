@@ -0,0 +1,19 @@
+import os
+import shutil
+import sys
+import tempfile
+
+# Gathers the repository's root folder
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Makes the repository's packages importable
+sys.path.insert(0, ROOT)
+
+# Creates a temporary folder, so the tests do not write within the repository
+WORK_DIR = tempfile.mkdtemp(prefix='brainy_tests-')
+
+# Copies the example configuration, as the constants are read from the current folder
+shutil.copy(os.path.join(ROOT, 'config.ini.example'), os.path.join(WORK_DIR, 'config.ini'))
+
+# Runs the tests from the temporary folder
+os.chdir(WORK_DIR)
@@ -0,0 +1,78 @@
+import http.server
+import threading
+
+import pytest
+
+import utils.callback as cb
+
+
+@pytest.fixture
+def webhook_server():
+    requests = []
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_POST(self):
+            requests.append(self.rfile.read(int(self.headers['Content-Length'])))
+            self.send_response(200)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.HTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    yield server.server_address[1], requests
+
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize('url', ['file:///etc/passwd', 'ftp://example.com/', 'example.com/hook', 'http:///hook'])
+def test_check_callback_url_scheme(url):
+    with pytest.raises(ValueError):
+        cb.check_callback_url(url)
+
+
+def test_check_callback_url_allowed_hosts(monkeypatch):
+    cb.check_callback_url('https://example.com/hook')
+
+    monkeypatch.setattr(cb.c, 'CALLBACK_ALLOWED_HOSTS', 'hooks.example.com, localhost')
+
+    cb.check_callback_url('https://HOOKS.example.com/hook')
+    cb.check_callback_url('http://localhost:8000/hook')
+
+    with pytest.raises(ValueError):
+        cb.check_callback_url('https://example.com/hook')
+
+
+@pytest.mark.parametrize('url', ['http://127.0.0.1/hook', 'http://localhost/hook', 'http://169.254.169.254/latest',
+                                 'http://10.0.0.1/hook', 'http://[::1]/hook'])
+def test_restricted_webhook_private_addresses(url):
+    with pytest.raises(ValueError):
+        cb.WebhookSink(url, restricted=True).check()
+
+    cb.WebhookSink(url).check()
+
+
+def test_restricted_webhook_allowed_host(monkeypatch):
+    monkeypatch.setattr(cb.c, 'CALLBACK_ALLOWED_HOSTS', 'localhost')
+
+    cb.WebhookSink('http://localhost/hook', restricted=True).check()
+
+
+def test_restricted_webhook_checks_connected_address(webhook_server, monkeypatch):
+    port, requests = webhook_server
+
+    # Sending skips the resolution check, as if the host had been rebound after it
+    with pytest.raises(ValueError):
+        cb.WebhookSink(f'http://localhost:{port}/hook', restricted=True).send({'id': 'job'})
+
+    assert requests == []
+
+    monkeypatch.setattr(cb.c, 'CALLBACK_ALLOWED_HOSTS', 'localhost')
+
+    cb.WebhookSink(f'http://localhost:{port}/hook', restricted=True).send({'id': 'job'})
+    cb.WebhookSink(f'http://127.0.0.1:{port}/hook').send({'id': 'job'})
+
+    assert len(requests) == 2
@@ -0,0 +1,62 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from tornado import gen
+from tornado.ioloop import IOLoop
+
+from utils.coalescer import Coalescer
+
+
+class EchoProcessor():
+    def __init__(self):
+        self.batches = []
+
+    def consume(self, data):
+        self.batches.append(data)
+
+        return [s['text'].upper() for s in data['samples']]
+
+
+class FailingProcessor():
+    def consume(self, data):
+        raise RuntimeError('Prediction has failed.')
+
+
+def _request(texts, params=None):
+    return {'id': 'model', 'type': 'spacy', 'samples': [{'text': t} for t in texts], 'params': params or {}}
+
+
+def test_split_back():
+    processor = EchoProcessor()
+
+    async def run():
+        coalescer = Coalescer(ThreadPoolExecutor(1), processor, 0.05, 100)
+
+        return await gen.multi([coalescer.submit(_request(['a', 'b'])), coalescer.submit(_request(['c'])),
+                                coalescer.submit(_request(['d', 'e', 'f']))])
+
+    assert IOLoop.current().run_sync(run) == [['A', 'B'], ['C'], ['D', 'E', 'F']]
+    assert len(processor.batches) == 1
+
+
+def test_batches_by_params_and_size():
+    processor = EchoProcessor()
+
+    async def run():
+        coalescer = Coalescer(ThreadPoolExecutor(1), processor, 0.05, 3)
+
+        return await gen.multi([coalescer.submit(_request(['a', 'b'])), coalescer.submit(_request(['c'], {'k': 1})),
+                                coalescer.submit(_request(['d', 'e']))])
+
+    assert IOLoop.current().run_sync(run) == [['A', 'B'], ['C'], ['D', 'E']]
+    assert sorted(len(b['samples']) for b in processor.batches) == [1, 4]
+
+
+def test_failure_is_forwarded():
+    async def run():
+        coalescer = Coalescer(ThreadPoolExecutor(1), FailingProcessor(), 0.05, 100)
+
+        return await gen.multi([coalescer.submit(_request(['a'])), coalescer.submit(_request(['b']))])
+
+    with pytest.raises(RuntimeError):
+        IOLoop.current().run_sync(run)
@@ -0,0 +1,153 @@
+import io
+import os
+import tarfile
+
+import pytest
+
+import utils.file as f
+
+
+def create_folder(tmp_path):
+    """Creates a folder holding a model's files.
+
+    Args:
+        tmp_path (Path): A temporary path.
+
+    Returns:
+        The path to the folder.
+
+    """
+
+    folder = tmp_path / 'model'
+    (folder / 'sub').mkdir(parents=True)
+    (folder / 'model.bin').write_bytes(b'weights' * 100)
+    (folder / 'sub' / 'meta.json').write_text('{}')
+
+    return str(folder)
+
+
+def create_tar(path, members, codec):
+    """Creates a compressed tar artifact with raw members.
+
+    Args:
+        path (str): The artifact's path.
+        members (list): A list of TarInfo objects.
+        codec (str): The artifact's codec, either `zstd` or `lz4`.
+
+    """
+
+    buffer = io.BytesIO()
+
+    with tarfile.open(fileobj=buffer, mode='w') as tar_object:
+        for member in members:
+            tar_object.addfile(member, io.BytesIO(b'x' * member.size) if member.isfile() else None)
+
+    if codec == 'zstd':
+        data = f.zstandard.ZstdCompressor().compress(buffer.getvalue())
+    else:
+        data = f.lz4.frame.compress(buffer.getvalue())
+
+    with open(path, 'wb') as artifact:
+        artifact.write(data)
+
+
+@pytest.mark.parametrize('codec', ['stored', 'deflate', 'zstd', 'lz4'])
+def test_round_trip(tmp_path, codec):
+    if codec not in f.get_codecs():
+        pytest.skip(f'{codec} is not installed.')
+
+    artifact = f.zip_file(create_folder(tmp_path), str(tmp_path / 'abc'), 'abc', codec, 1)
+
+    assert artifact == str(tmp_path / 'abc') + f.ARTIFACT_EXTENSIONS[codec]
+    assert f.get_artifact_path(str(tmp_path), 'abc') == artifact
+
+    output = tmp_path / 'output'
+    output.mkdir()
+
+    model_path = f.unzip_file(artifact, str(output), 'abc')
+
+    assert open(os.path.join(model_path, 'model.bin'), 'rb').read() == b'weights' * 100
+    assert open(os.path.join(model_path, 'sub', 'meta.json')).read() == '{}'
+    assert os.path.exists(os.path.join(model_path, 'manifest.json'))
+
+
+def test_replace_codec(tmp_path):
+    if 'zstd' not in f.get_codecs():
+        pytest.skip('zstd is not installed.')
+
+    folder = create_folder(tmp_path)
+
+    f.zip_file(folder, str(tmp_path / 'abc'), 'abc', 'deflate', 1)
+    artifact = f.zip_file(folder, str(tmp_path / 'abc'), 'abc', 'zstd', 1)
+
+    assert not os.path.exists(tmp_path / 'abc.zip')
+    assert f.get_artifact_path(str(tmp_path), 'abc') == artifact
+    assert f.get_artifact_path(str(tmp_path), 'missing') is None
+
+
+def test_unzip_model_versions(tmp_path):
+    folder = create_folder(tmp_path)
+    models = tmp_path / 'models'
+    models.mkdir()
+
+    artifact = f.zip_file(folder, str(models / 'abc'), 'abc', 'deflate', 1)
+    (models / 'abc').mkdir()
+
+    first_path = f.unzip_model(str(models), 'abc')
+
+    assert os.path.basename(first_path) == f'abc@{f.get_artifact_version(str(models), "abc")}'
+    assert f.unzip_model(str(models), 'abc') == first_path
+    assert not os.path.exists(models / 'abc')
+
+    (tmp_path / 'model' / 'model.bin').write_bytes(b'updated')
+    f.zip_file(folder, str(models / 'abc'), 'abc', 'deflate', 1)
+    os.utime(artifact, ns=(0, os.stat(artifact).st_mtime_ns + 1))
+
+    with f.use_model(str(models), 'abc') as second_path:
+        assert second_path != first_path
+        assert open(os.path.join(second_path, 'model.bin'), 'rb').read() == b'updated'
+        assert not os.path.exists(first_path)
+
+    with pytest.raises(FileNotFoundError):
+        f.unzip_model(str(models), 'missing')
+
+
+@pytest.mark.parametrize('codec', ['zstd', 'lz4'])
+@pytest.mark.parametrize('name', ['../evil', '/tmp/brainy_evil', 'abc/../../evil'])
+def test_unsafe_paths(tmp_path, codec, name):
+    if codec not in f.get_codecs():
+        pytest.skip(f'{codec} is not installed.')
+
+    member = tarfile.TarInfo(name)
+    member.size = 4
+
+    create_tar(str(tmp_path / 'artifact'), [member], codec)
+
+    output = tmp_path / 'output'
+    output.mkdir()
+
+    with pytest.raises(RuntimeError):
+        f.unzip_file(str(tmp_path / 'artifact'), str(output), 'abc')
+
+    assert not os.path.exists(tmp_path / 'evil')
+    assert not os.path.exists('/tmp/brainy_evil')
+
+
+@pytest.mark.parametrize('codec', ['zstd', 'lz4'])
+def test_unsafe_links(tmp_path, codec):
+    if codec not in f.get_codecs():
+        pytest.skip(f'{codec} is not installed.')
+
+    member = tarfile.TarInfo('abc/link')
+    member.type = tarfile.SYMTYPE
+    member.linkname = '/etc'
+
+    create_tar(str(tmp_path / 'artifact'), [member], codec)
+
+    output = tmp_path / 'output'
+    output.mkdir()
+
+    with pytest.raises(RuntimeError):
+        f.unzip_file(str(tmp_path / 'artifact'), str(output), 'abc')
+
+    assert not os.path.lexists(output / 'abc' / 'link')
@@ -0,0 +1,75 @@
+import multiprocessing
+import os
+
+import utils.metrics as m
+
+
+def _record(path):
+    metrics = m.Metrics(path, 3600)
+    metrics.inc('brainy_cache_hits_total', 2)
+    metrics.set('brainy_cache_models', 5)
+    metrics.observe('brainy_model_phase_seconds', 0.2, phase='predict', type='spacy')
+    metrics.flush()
+
+
+def _run_process(path):
+    process = multiprocessing.get_context('fork').Process(target=_record, args=(path,))
+    process.start()
+    process.join()
+
+
+def _values(text):
+    return dict(line.rsplit(' ', 1) for line in text.splitlines() if not line.startswith('#'))
+
+
+def test_collect_across_processes(tmp_path):
+    path = str(tmp_path)
+    metrics = m.Metrics(path, 3600)
+    metrics.inc('brainy_cache_hits_total')
+    metrics.set('brainy_cache_models', 1)
+
+    _run_process(path)
+    _run_process(path)
+
+    values = _values(metrics.collect())
+
+    assert values['brainy_cache_hits_total'] == '5'
+    assert values['brainy_cache_models'] == '1'
+    assert values['brainy_model_phase_seconds_count{phase="predict",type="spacy"}'] == '2'
+    assert set(os.listdir(path)) == {'.aggregate.lock', m.AGGREGATE_FILE, metrics.filename}
+
+
+def test_counters_never_go_backwards(tmp_path):
+    path = str(tmp_path)
+    metrics = m.Metrics(path, 3600)
+
+    totals = []
+    for _ in range(3):
+        _run_process(path)
+        totals.append(int(_values(metrics.collect())['brainy_cache_hits_total']))
+
+    assert totals == [2, 4, 6]
+
+
+def test_reused_pid_is_folded(tmp_path):
+    path = str(tmp_path)
+    metrics = m.Metrics(path, 3600)
+
+    m._write_snapshot(path, os.path.join(path, f'{os.getpid()}-0.json'),
+                      [['brainy_cache_misses_total', [], 3], ['brainy_cache_models', [], 7]])
+
+    values = _values(metrics.collect())
+
+    assert values['brainy_cache_misses_total'] == '3'
+    assert 'brainy_cache_models' not in values
+    assert not os.path.exists(os.path.join(path, f'{os.getpid()}-0.json'))
+
+
+def test_reset_metrics(tmp_path):
+    path = str(tmp_path)
+
+    _run_process(path)
+    m.Metrics(path, 3600).collect()
+    m.reset_metrics(path)
+
+    assert os.listdir(path) == []
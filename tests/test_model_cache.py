@@ -0,0 +1,76 @@
+import contextlib
+import threading
+import time
+
+import utils.model_cache as mc
+
+
+def test_eviction_order():
+    cache = mc.ModelCache(10)
+    cache.add(('a', 'spacy'), 'A', 4)
+    cache.add(('b', 'spacy'), 'B', 4)
+
+    assert cache.get(('a', 'spacy')) == 'A'
+
+    cache.add(('c', 'spacy'), 'C', 4)
+
+    assert cache.get(('b', 'spacy')) is None
+    assert cache.get(('a', 'spacy')) == 'A'
+    assert cache.get(('c', 'spacy')) == 'C'
+    assert cache.stats()['evictions'] == 1
+    assert cache.stats()['size'] == 8
+
+
+def test_oversized_learner_is_skipped():
+    cache = mc.ModelCache(10)
+    cache.add(('a', 'spacy'), 'A', 11)
+
+    assert cache.get(('a', 'spacy')) is None
+    assert cache.stats()['size'] == 0
+
+
+def test_stale_version_is_discarded():
+    cache = mc.ModelCache(10)
+    cache.add(('a', 'spacy'), 'A', 4, version=1)
+
+    assert cache.get(('a', 'spacy'), 1) == 'A'
+    assert cache.get(('a', 'spacy'), 2) is None
+    assert cache.stats()['models'] == 0
+    assert cache.stats()['size'] == 0
+
+
+def test_concurrent_misses_load_once(monkeypatch):
+    loads = []
+
+    class SlowLearner():
+        def load(self, model_path):
+            loads.append(model_path)
+            time.sleep(0.1)
+
+    monkeypatch.setattr(mc, '_cache', mc.ModelCache(1024))
+    monkeypatch.setattr(mc, 'get_learner_class', lambda _type: SlowLearner)
+    monkeypatch.setattr(mc.f, 'get_artifact_version', lambda path, _id: 1)
+    monkeypatch.setattr(mc.f, 'use_model', contextlib.contextmanager(lambda path, _id: iter([f'models/{_id}'])))
+    monkeypatch.setattr(mc.f, 'get_folder_size', lambda path: 1)
+
+    learners = []
+    threads = [threading.Thread(target=lambda: learners.append(mc.load_learner('a', 'slow'))) for _ in range(4)]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    assert loads == ['models/a']
+    assert len(set(map(id, learners))) == 1
+    assert mc._cache.key_locks == {}
+
+
+def test_key_locks_are_removed():
+    cache = mc.ModelCache(10)
+
+    with cache.key_lock(('a', 'spacy')):
+        assert ('a', 'spacy') in cache.key_locks
+
+    assert cache.key_locks == {}
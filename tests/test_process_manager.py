@@ -0,0 +1,144 @@
+from multiprocessing import Process, Queue
+
+from processors.sweeper_processor import SweeperProcessor
+from processors.tester_processor import TesterProcessor
+from processors.trainer_processor import TrainerProcessor
+from utils.job_store import JobStore
+from utils.process_manager import ProcessManager
+
+
+def create_manager(trainer_limit=1):
+    """Creates a process manager without starting its manager process.
+
+    Args:
+        trainer_limit (int): Maximum amount of concurrent trainer jobs.
+
+    Returns:
+        The process manager.
+
+    """
+
+    # Creates the object without running its initialization method
+    manager = ProcessManager.__new__(ProcessManager)
+
+    # Defines its limits
+    manager.limits = {'TrainerProcessor': trainer_limit}
+
+    return manager
+
+
+class FakeWorker():
+    def __init__(self, pid, alive=True):
+        self.pid = pid
+        self.alive = alive
+        self.job_queue = Queue()
+
+    def is_alive(self):
+        return self.alive
+
+
+def test_has_slot():
+    manager = create_manager()
+
+    job = {'target': TrainerProcessor, 'data': {}}
+
+    assert manager.has_slot(job, 'cpu', {})
+    assert not manager.has_slot(job, 'cpu', {'TrainerProcessor': 1})
+    assert not manager.has_slot(job, 'cpu', {'cpu': manager.get_pool_size()})
+    assert manager.has_slot({'target': TesterProcessor, 'data': {}}, 'cpu', {'cpu': 1, 'TrainerProcessor': 1})
+
+
+def test_has_slot_shared_limit():
+    manager = create_manager()
+
+    manager = create_manager(trainer_limit=3)
+
+    job = {'target': SweeperProcessor, 'data': {'parallel': 2}}
+
+    assert manager.get_limit_name(job) == 'TrainerProcessor'
+    assert manager.get_slots(job) == 2
+    assert manager.get_slots({'target': SweeperProcessor, 'data': {'parallel': 10}}) == 3
+    assert manager.has_slot(job, 'cpu', {'cpu': 1, 'TrainerProcessor': 1})
+    assert not manager.has_slot(job, 'cpu', {'cpu': 1, 'TrainerProcessor': 2})
+
+    running = {}
+    assigned = {}
+
+    manager.dispatch(job, FakeWorker(10), 'cpu', running, assigned)
+
+    assert running == {'cpu': 1, 'TrainerProcessor': 2}
+
+    manager.release_worker(10, running, assigned, set())
+
+    assert running == {'cpu': 0, 'TrainerProcessor': 0}
+
+
+def test_dispatch_and_release_slots():
+    manager = create_manager()
+
+    done_queue = Queue()
+    running = {}
+    assigned = {}
+    retiring = set()
+
+    worker = FakeWorker(10)
+    job = {'target': TrainerProcessor, 'data': {'job_id': 'job'}}
+
+    assert manager.get_idle_worker([worker], assigned, retiring) is worker
+
+    manager.dispatch(job, worker, 'cpu', running, assigned)
+
+    assert worker.job_queue.get(timeout=1) == job
+    assert assigned == {10: ((('cpu', 1), ('TrainerProcessor', 1)), 'job')}
+    assert running == {'cpu': 1, 'TrainerProcessor': 1}
+    assert manager.get_idle_worker([worker], assigned, retiring) is None
+
+    done_queue.put((10, True))
+    manager.release_slots(done_queue, running, assigned, retiring, block=True)
+
+    assert assigned == {}
+    assert running == {'cpu': 0, 'TrainerProcessor': 0}
+    assert retiring == {10}
+    assert manager.get_idle_worker([worker, FakeWorker(11, alive=False)], assigned, retiring) is None
+
+
+def test_release_worker():
+    manager = create_manager()
+
+    JobStore().save('job', {'id': 'job', 'status': 'running'})
+
+    running = {}
+    assigned = {}
+    retiring = set()
+
+    # The worker dies before taking the job from its queue, so it never reports anything
+    manager.dispatch({'target': TrainerProcessor, 'data': {'job_id': 'job'}}, FakeWorker(10), 'cpu', running, assigned)
+    manager.release_worker(10, running, assigned, retiring)
+
+    assert assigned == {}
+    assert running == {'cpu': 0, 'TrainerProcessor': 0}
+    assert manager.has_slot({'target': TrainerProcessor, 'data': {}}, 'cpu', running)
+
+    status = JobStore().get('job')
+
+    assert status['status'] == 'error'
+    assert 'end_time' in status
+
+    retiring.add(11)
+    manager.release_worker(11, running, assigned, retiring)
+
+    assert running == {'cpu': 0, 'TrainerProcessor': 0}
+    assert retiring == set()
+
+
+def test_drain_pool():
+    manager = create_manager()
+
+    p = Process(target=int)
+    p.start()
+    p.join()
+
+    dead = []
+
+    assert manager.drain_pool([p], dead) == []
+    assert dead == [p.pid]
@@ -0,0 +1,28 @@
+from handlers.sweeper_handler import validate_search
+
+
+def test_validate_grid():
+    assert validate_search({'lr': [0.1, 0.5], 'dim': [50, 100]}, 'grid', 10, 'fasttext') is None
+    assert validate_search({'lr': {'min': 0.1, 'max': 1.0}}, 'grid', 10, 'fasttext')
+    assert validate_search({'lr': []}, 'grid', 10, 'fasttext')
+    assert validate_search({'lr': 0.1}, 'grid', 10, 'fasttext')
+    assert validate_search({}, 'grid', 10, 'fasttext')
+    assert validate_search({'a': list(range(11)), 'b': list(range(10))}, 'grid', 10, 'fasttext')
+
+
+def test_validate_random():
+    assert validate_search({'lr': {'min': 0.1, 'max': 1.0}, 'loss': ['softmax']}, 'random', 10, 'fasttext') is None
+    assert validate_search({'lr': {'min': 1.0, 'max': 0.1}}, 'random', 10, 'fasttext')
+    assert validate_search({'lr': {'min': 'a', 'max': 1}}, 'random', 10, 'fasttext')
+    assert validate_search({'lr': {'min': 0.1, 'max': 1.0}}, 'random', 0, 'fasttext')
+    assert validate_search({'lr': {'min': 0.1, 'max': 1.0}}, 'random', 101, 'fasttext')
+
+
+def test_validate_metric():
+    search = {'lr': [0.1, 0.5]}
+
+    assert validate_search(search, 'grid', 10, 'fasttext', 'recall') is None
+    assert validate_search(search, 'grid', 10, 'spacy') is None
+    assert validate_search(search, 'grid', 10, 'spacy', 'precision')
+    assert validate_search(search, 'grid', 10, 'custom')
+    assert validate_search(search, 'grid', 10, 'custom', 'accuracy') is None
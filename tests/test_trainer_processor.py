@@ -0,0 +1,20 @@
+import itertools
+
+from processors.trainer_processor import TrainerProcessor
+
+
+def test_mix_samples_is_lazy():
+    processor = TrainerProcessor()
+
+    mixed = processor._mix_samples(itertools.count(), iter(['a', 'b']))
+
+    assert len(list(itertools.islice(mixed, 10))) == 10
+
+
+def test_mix_samples_keeps_every_sample():
+    processor = TrainerProcessor()
+
+    mixed = list(processor._mix_samples(range(5), ['a', 'b']))
+
+    assert sorted(mixed, key=str) == [0, 1, 2, 3, 4, 'a', 'b']
+    assert [s for s in mixed if isinstance(s, int)] == list(range(5))
@@ -0,0 +1,439 @@
+import fcntl
+import http.client
+import ipaddress
+import json
+import logging
+import socket
+import threading
+import time
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import utils.constants as c
+
+# Process-wide instance of the callbacks dispatcher
+_dispatcher = None
+
+# Lock used to guard the creation of the process-wide instance
+_dispatcher_lock = threading.Lock()
+
+
+class NoRedirectHandler(urllib.request.HTTPRedirectHandler):
+    """A NoRedirectHandler refuses redirects, so a webhook can not be bounced to another host.
+
+    """
+
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        """Refuses the redirect, making the request fail with its redirect status.
+
+        """
+
+        return None
+
+
+def check_address(host, address):
+    """Checks whether a restricted webhook's host may be reached at an address.
+
+    Args:
+        host (str): The webhook's host.
+        address (str): An address that the host resolves to or is connected at.
+
+    Raises:
+        ValueError: If the address is not a public one, such as loopback, private or link-local ones,
+            and the host has not been explicitly allowed.
+
+    """
+
+    # Explicitly allowed hosts might be internal ones
+    if host.lower() in get_allowed_hosts():
+        return
+
+    # Checks if the address is not a public one
+    if not ipaddress.ip_address(address.split('%')[0]).is_global:
+        raise ValueError(f'The `{host}` host resolves to a non-public address.')
+
+
+class RestrictedHTTPConnection(http.client.HTTPConnection):
+    """A RestrictedHTTPConnection checks the address that it has actually connected to,
+    so a host can not be rebound to a private address after it has been checked.
+
+    """
+
+    def connect(self):
+        """Connects to the host, closing the connection if its peer is not a public address.
+
+        """
+
+        super(RestrictedHTTPConnection, self).connect()
+
+        # Tries to check the connected address
+        try:
+            check_address(self.host, self.sock.getpeername()[0])
+
+        # If it may not be used, closes the connection before sending anything
+        except ValueError:
+            self.close()
+
+            raise
+
+
+class RestrictedHTTPSConnection(http.client.HTTPSConnection):
+    """A RestrictedHTTPSConnection checks the address that it has actually connected to,
+    so a host can not be rebound to a private address after it has been checked.
+
+    """
+
+    def connect(self):
+        """Connects to the host, closing the connection if its peer is not a public address.
+
+        """
+
+        super(RestrictedHTTPSConnection, self).connect()
+
+        # Tries to check the connected address
+        try:
+            check_address(self.host, self.sock.getpeername()[0])
+
+        # If it may not be used, closes the connection before sending anything
+        except ValueError:
+            self.close()
+
+            raise
+
+
+class RestrictedHTTPHandler(urllib.request.HTTPHandler):
+    """A RestrictedHTTPHandler opens http URLs through restricted connections.
+
+    """
+
+    def http_open(self, req):
+        """Opens the request through a restricted connection.
+
+        """
+
+        return self.do_open(RestrictedHTTPConnection, req)
+
+
+class RestrictedHTTPSHandler(urllib.request.HTTPSHandler):
+    """A RestrictedHTTPSHandler opens https URLs through restricted connections.
+
+    """
+
+    def https_open(self, req):
+        """Opens the request through a restricted connection.
+
+        """
+
+        return self.do_open(RestrictedHTTPSConnection, req, context=self._context)
+
+
+def get_allowed_hosts():
+    """Gathers the hosts that requests' callback URLs may target.
+
+    Returns:
+        A list of hosts, where an empty list allows any public host.
+
+    """
+
+    return [h.strip().lower() for h in c.CALLBACK_ALLOWED_HOSTS.split(',') if h.strip()]
+
+
+def check_callback_url(url):
+    """Checks whether a request's callback URL may be used, before any job is queued.
+
+    Args:
+        url (str): The callback's URL.
+
+    Raises:
+        ValueError: If the URL is not an http(s) URL or its host is not allowed.
+
+    """
+
+    # Parses the URL
+    parsed = urllib.parse.urlsplit(str(url))
+
+    # Checks if the URL is an http(s) one
+    if parsed.scheme not in ('http', 'https') or not parsed.hostname:
+        raise ValueError('The `callback_url` should be an http or https URL.')
+
+    # Gathers the allowed hosts
+    allowed_hosts = get_allowed_hosts()
+
+    # Checks if the host is allowed
+    if allowed_hosts and parsed.hostname.lower() not in allowed_hosts:
+        raise ValueError(f'The `callback_url` host `{parsed.hostname}` is not allowed.')
+
+
+class WebhookSink():
+    """A WebhookSink delivers callbacks by POSTing them as JSON to an URL.
+
+    """
+
+    def __init__(self, url, restricted=False):
+        """Initialization method.
+
+        Args:
+            url (str): The webhook's URL.
+            restricted (bool): Whether the URL has been supplied by a request, which prevents it
+                from targeting private addresses (unless its host is allowed) and from being redirected.
+
+        """
+
+        # Webhook's URL
+        self.url = url
+
+        # Whether the webhook is restricted
+        self.restricted = restricted
+
+    def check(self):
+        """Checks whether the webhook may be requested.
+
+        Raises:
+            ValueError: If a restricted webhook targets a forbidden URL or a private address.
+
+        """
+
+        # Checks if the webhook is not restricted
+        if not self.restricted:
+            return
+
+        # Checks the URL itself
+        check_callback_url(self.url)
+
+        # Parses the URL
+        parsed = urllib.parse.urlsplit(self.url)
+
+        # Explicitly allowed hosts might be internal ones
+        if parsed.hostname.lower() in get_allowed_hosts():
+            return
+
+        # Tries to resolve the host's addresses
+        try:
+            addresses = socket.getaddrinfo(parsed.hostname, parsed.port or (443 if parsed.scheme == 'https' else 80))
+
+        # If it could not be resolved, the webhook is refused
+        except socket.gaierror:
+            raise ValueError(f'Could not resolve `{parsed.hostname}`.')
+
+        # For every resolved address
+        for address in addresses:
+            # Checks if the address is a public one, although the connected one is checked again
+            check_address(parsed.hostname, address[4][0])
+
+    def send(self, payload):
+        """Sends a callback payload.
+
+        Args:
+            payload (dict): The callback's payload.
+
+        """
+
+        # Creates the request object
+        req = urllib.request.Request(self.url, data=json.dumps(payload).encode('utf-8'),
+                                     headers={'Content-Type': 'application/json'}, method='POST')
+
+        # Checks if the webhook is restricted
+        if self.restricted:
+            # Restricted webhooks are not allowed to be redirected nor to connect to private addresses
+            opener = urllib.request.build_opener(NoRedirectHandler, RestrictedHTTPHandler, RestrictedHTTPSHandler)
+
+        # If not, any URL is allowed
+        else:
+            opener = urllib.request.build_opener()
+
+        # Performs the request, raising an exception on unsuccessful responses
+        with opener.open(req, timeout=float(c.CALLBACK_TIMEOUT)):
+            pass
+
+    def __repr__(self):
+        """Represents the sink by its URL.
+
+        """
+
+        return f'WebhookSink({self.url})'
+
+
+class FileSink():
+    """A FileSink delivers callbacks by appending them to a JSONL file.
+
+    """
+
+    def __init__(self, path):
+        """Initialization method.
+
+        Args:
+            path (str): The file's path.
+
+        """
+
+        # File's path
+        self.path = path
+
+    def check(self):
+        """Checks whether the file may be written, which is always the case as it has been configured.
+
+        """
+
+        pass
+
+    def send(self, payload):
+        """Sends a callback payload.
+
+        Args:
+            payload (dict): The callback's payload.
+
+        """
+
+        # Opens the file in append mode
+        with open(self.path, 'a', encoding='utf-8') as sink_file:
+            # Locks the file, as several workers might append to it
+            fcntl.flock(sink_file, fcntl.LOCK_EX)
+
+            # Appends the payload as a single line
+            sink_file.write(json.dumps(payload) + '\n')
+
+    def __repr__(self):
+        """Represents the sink by its path.
+
+        """
+
+        return f'FileSink({self.path})'
+
+
+class CallbackDispatcher():
+    """A CallbackDispatcher sends callbacks to their sinks in background threads,
+    retrying with an exponential backoff whenever a delivery fails.
+
+    """
+
+    def __init__(self, max_retries, backoff):
+        """Initialization method.
+
+        Args:
+            max_retries (int): Maximum amount of retries per delivery.
+            backoff (float): Initial amount of time (in seconds) to wait between retries.
+
+        """
+
+        # Maximum amount of retries
+        self.max_retries = max_retries
+
+        # Initial backoff
+        self.backoff = backoff
+
+        # Pool of threads that deliver the callbacks
+        self.pool = ThreadPoolExecutor(max_workers=2)
+
+    def get_sinks(self, task):
+        """Gathers the sinks that should receive a task's callback.
+
+        Args:
+            task (dict): The task itself.
+
+        Returns:
+            A list of sinks.
+
+        """
+
+        # Creates an empty list of sinks
+        sinks = []
+
+        # Checks if there is a configured webhook
+        if c.CALLBACK_WEBHOOK_URL:
+            sinks.append(WebhookSink(c.CALLBACK_WEBHOOK_URL))
+
+        # Checks if there is a configured file
+        if c.CALLBACK_FILE:
+            sinks.append(FileSink(c.CALLBACK_FILE))
+
+        # Checks if the task has its own webhook, which is restricted as it came from a request
+        if task.get('callback_url'):
+            sinks.append(WebhookSink(task['callback_url'], restricted=True))
+
+        return sinks
+
+    def dispatch(self, task):
+        """Dispatches a task's callback to all of its sinks without blocking.
+
+        Args:
+            task (dict): The task itself.
+
+        """
+
+        # For every possible sink
+        for sink in self.get_sinks(task):
+            logging.info(f'Sending callback to {sink} ...')
+
+            # Delivers the callback in background
+            self.pool.submit(self._deliver, sink, dict(task['callback']))
+
+    def _deliver(self, sink, payload):
+        """Delivers a callback to a sink, retrying if needed.
+
+        Args:
+            sink (WebhookSink | FileSink): The sink itself.
+            payload (dict): The callback's payload.
+
+        """
+
+        # Tries to check the sink
+        try:
+            sink.check()
+
+        # If it may not be used, gives up without retrying
+        except ValueError as e:
+            logging.error(f'Refusing to send callback to {sink}: {e}')
+
+            return
+
+        # For every possible attempt
+        for attempt in range(self.max_retries + 1):
+            # Tries to send the payload
+            try:
+                sink.send(payload)
+
+                return
+
+            # If the sink has connected to a forbidden address, gives up without retrying
+            except ValueError as e:
+                logging.error(f'Refusing to send callback to {sink}: {e}')
+
+                return
+
+            # If it could not be sent, waits before retrying
+            except Exception as e:
+                logging.warning(f'Failed to send callback to {sink}: {e}')
+
+                # Checks if there are remaining attempts
+                if attempt < self.max_retries:
+                    time.sleep(self.backoff * 2 ** attempt)
+
+        logging.error(f'Giving up sending callback to {sink}.')
+
+    def shutdown(self):
+        """Waits for all pending callbacks to be delivered.
+
+        """
+
+        # Shutdowns the pool, waiting for its threads
+        self.pool.shutdown(wait=True)
+
+
+def get_callback_dispatcher():
+    """Gathers the process-wide callbacks dispatcher, creating it on its first usage.
+
+    Returns:
+        The process-wide CallbackDispatcher instance.
+
+    """
+
+    global _dispatcher
+
+    with _dispatcher_lock:
+        # Checks if the dispatcher has not been created yet
+        if _dispatcher is None:
+            # Creates the dispatcher with the configured retries and backoff
+            _dispatcher = CallbackDispatcher(int(c.CALLBACK_MAX_RETRIES), float(c.CALLBACK_BACKOFF))
+
+    return _dispatcher
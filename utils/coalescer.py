@@ -0,0 +1,152 @@
+import json
+import logging
+
+from tornado.concurrent import Future
+from tornado.ioloop import IOLoop
+
+
+class Coalescer():
+    """A Coalescer class gathers concurrent prediction requests for the same model
+    and performs a single batched prediction on their behalf.
+
+    """
+
+    def __init__(self, executor, processor, window, max_batch):
+        """Initialization method.
+
+        Args:
+            executor (Executor): The inference executor.
+            processor (PredictorProcessor): The processor that performs the predictions.
+            window (float): Maximum amount of time (in seconds) to wait for new requests.
+            max_batch (int): Maximum amount of samples in a single batch.
+
+        """
+
+        # Inference executor
+        self.executor = executor
+
+        # Predictions' processor
+        self.processor = processor
+
+        # Gathering window
+        self.window = window
+
+        # Maximum batch size
+        self.max_batch = max_batch
+
+        # Dictionary holding the pending requests of every batch
+        self.pending = {}
+
+        # Dictionary holding the amount of pending samples of every batch
+        self.sizes = {}
+
+        # Dictionary holding the scheduled flushes of every batch
+        self.timeouts = {}
+
+    async def submit(self, data):
+        """Submits a prediction request, waiting for its share of the batched predictions.
+
+        Args:
+            data (dict): The prediction's data object.
+
+        Returns:
+            An already-structured predictions object.
+
+        """
+
+        # Requests can only be batched if they share model and parameters
+        key = (data['id'], data['type'], json.dumps(data['params'], sort_keys=True))
+
+        # Creates the future that will hold the request's predictions
+        future = Future()
+
+        # Appends the request to its batch
+        self.pending.setdefault(key, []).append((data, future))
+
+        # Increases the amount of pending samples
+        self.sizes[key] = self.sizes.get(key, 0) + len(data['samples'])
+
+        # If the batch has been filled up
+        if self.sizes[key] >= self.max_batch:
+            # Flushes it right away
+            self._flush(key)
+
+        # If the batch has just been created
+        elif key not in self.timeouts:
+            # Schedules its flush to the end of the window
+            self.timeouts[key] = IOLoop.current().call_later(
+                self.window, self._flush, key)
+
+        return await future
+
+    def _flush(self, key):
+        """Flushes a batch, sending it to the inference executor.
+
+        Args:
+            key (tuple): The batch's key.
+
+        """
+
+        # Gathers the batch's requests
+        batch = self.pending.pop(key, [])
+
+        # Removes the batch's size
+        self.sizes.pop(key, None)
+
+        # Gathers the batch's scheduled flush
+        timeout = self.timeouts.pop(key, None)
+
+        # If there is a scheduled flush
+        if timeout is not None:
+            # Cancels it
+            IOLoop.current().remove_timeout(timeout)
+
+        # If there are requests to be predicted
+        if batch:
+            # Spawns the batched prediction
+            IOLoop.current().spawn_callback(self._predict, batch)
+
+    async def _predict(self, batch):
+        """Performs a batched prediction, splitting its results back to each request.
+
+        Args:
+            batch (list): A list of requests' data and futures.
+
+        """
+
+        # Gathers the first request's data
+        first, _ = batch[0]
+
+        # Creating the batched data object
+        data = {
+            'id': first['id'],
+            'type': first['type'],
+            'samples': [s for d, _ in batch for s in d['samples']],
+            'params': dict(first['params'])
+        }
+
+        logging.debug(f"Coalesced {len(batch)} requests into {len(data['samples'])} samples.")
+
+        # Tries to perform the batched prediction
+        try:
+            # Actually performs the prediction on the inference executor
+            preds = await IOLoop.current().run_in_executor(
+                self.executor, self.processor.consume, data)
+
+        # If prediction could not be realized, forwards the exception to every request
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+
+            return
+
+        # Initializes the offset of the predictions
+        offset = 0
+
+        # For every request in the batch
+        for d, future in batch:
+            # Sets its share of the predictions
+            future.set_result(preds[offset:offset + len(d['samples'])])
+
+            # Increases the offset
+            offset += len(d['samples'])
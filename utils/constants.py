@@ -10,20 +10,155 @@ config.read('config.ini')
 # API's port
 PORT = config.get('API', 'PORT')
 
+# Maximum size (in MB) of a streamed request's body
+API_MAX_STREAM_SIZE = config.get('API', 'MAX_STREAM_SIZE', fallback='1024')
+
+# Amount of forked API processes sharing the port (0 stands for one per core)
+API_PROCESSES = config.get('API', 'PROCESSES', fallback='1')
+
+# Whether the API should run in debug mode, reloading itself on changes
+API_DEBUG = config.getboolean('API', 'DEBUG', fallback=False)
+
 # Amount of trainer workers
 TRAINER_WORKERS = config.get('WORKERS', 'TRAINER')
 
 # Amount of tester workers
 TESTER_WORKERS = config.get('WORKERS', 'TESTER')
 
+# Maximum amount of jobs waiting in the backlog
+WORKERS_MAX_BACKLOG = config.get('WORKERS', 'MAX_BACKLOG', fallback='100')
+
+# Amount of seconds that a rejected client should wait before retrying
+WORKERS_RETRY_AFTER = config.get('WORKERS', 'RETRY_AFTER', fallback='5')
+
+# Maximum amount of jobs consumed by a worker before it is recycled
+WORKERS_MAX_JOBS = config.get('WORKERS', 'MAX_JOBS', fallback='0')
+
+# Maximum memory (in MB) used by a worker before it is recycled
+WORKERS_MAX_MEMORY = config.get('WORKERS', 'MAX_MEMORY', fallback='0')
+
+# Amount of threads per job, where zero splits the avaliable cores among the concurrent jobs
+WORKERS_THREADS = config.get('WORKERS', 'THREADS', fallback='0')
+
+# URL of the webhook that receives the jobs' callbacks
+CALLBACK_WEBHOOK_URL = config.get('CALLBACK', 'WEBHOOK_URL', fallback='')
+
+# Path of the JSONL file that receives the jobs' callbacks
+CALLBACK_FILE = config.get('CALLBACK', 'FILE', fallback='')
+
+# Comma-separated hosts that requests' callback URLs may target (empty allows any public host)
+CALLBACK_ALLOWED_HOSTS = config.get('CALLBACK', 'ALLOWED_HOSTS', fallback='')
+
+# Maximum amount of retries when sending a callback
+CALLBACK_MAX_RETRIES = config.get('CALLBACK', 'MAX_RETRIES', fallback='5')
+
+# Initial amount of time (in seconds) to wait between callback retries
+CALLBACK_BACKOFF = config.get('CALLBACK', 'BACKOFF', fallback='1')
+
+# Amount of time (in seconds) to wait for a webhook's response
+CALLBACK_TIMEOUT = config.get('CALLBACK', 'TIMEOUT', fallback='10')
+
+# Root folder of the local files that can be registered as datasets
+DATASETS_LOCAL_ROOT = config.get('DATASETS', 'LOCAL_ROOT', fallback='data/')
+
 # Maximum load of GPU per process
 GPU_MAX_LOAD = config.get('GPU', 'MAX_LOAD')
 
 # Maximum memory of GPU per process
 GPU_MAX_MEMORY = config.get('GPU', 'MAX_MEMORY')
 
+# Type of the inference executor (`thread` or `process`)
+PREDICTOR_EXECUTOR = config.get('PREDICTOR', 'EXECUTOR', fallback='thread')
+
+# Amount of inference workers
+PREDICTOR_WORKERS = config.get('PREDICTOR', 'WORKERS', fallback='4')
+
+# Whether prediction requests for the same model should be coalesced
+PREDICTOR_COALESCE = config.getboolean('PREDICTOR', 'COALESCE', fallback=False)
+
+# Maximum amount of time (in ms) to wait for requests to be coalesced
+PREDICTOR_COALESCE_WINDOW = config.get('PREDICTOR', 'COALESCE_WINDOW', fallback='5')
+
+# Maximum amount of samples in a coalesced prediction
+PREDICTOR_COALESCE_MAX_BATCH = config.get('PREDICTOR', 'COALESCE_MAX_BATCH', fallback='256')
+
+# Batch size used when streaming texts through Spacy's models
+SPACY_BATCH_SIZE = config.get('SPACY', 'BATCH_SIZE', fallback='256')
+
+# Amount of processes used when streaming texts through Spacy's models
+SPACY_N_PROCESS = config.get('SPACY', 'N_PROCESS', fallback='1')
+
+# Maximum batch size that a request may ask for
+SPACY_MAX_BATCH_SIZE = config.get('SPACY', 'MAX_BATCH_SIZE', fallback='4096')
+
+# Maximum amount of processes that a request may ask for
+SPACY_MAX_N_PROCESS = config.get('SPACY', 'MAX_N_PROCESS', fallback='4')
+
+# Amount of training iterations between Spacy's checkpoints, where zero disables them
+SPACY_CHECKPOINT_EVERY = config.get('SPACY', 'CHECKPOINT_EVERY', fallback='10')
+
+# Codec used to pack the models' artifacts (`stored`, `deflate`, `bzip2`, `zstd` or `lz4`)
+ARTIFACT_CODEC = config.get('ARTIFACT', 'CODEC', fallback='deflate')
+
+# Compression level used to pack the models' artifacts
+ARTIFACT_LEVEL = config.get('ARTIFACT', 'LEVEL', fallback='1')
+
+# Maximum size (in MB) of the in-memory models cache
+CACHE_MAX_SIZE = config.get('CACHE', 'MAX_SIZE', fallback='1024')
+
+# Comma-separated `type:identifier` models preloaded before forking the workers
+CACHE_PRELOAD = config.get('CACHE', 'PRELOAD', fallback='')
+
+# Comma-separated learners' types imported by each worker before its first job
+LEARNERS_PREWARM = config.get('LEARNERS', 'PREWARM', fallback='fasttext,spacy')
+
+# Whether Fasttext's quantized models should be preferred when avaliable
+FASTTEXT_QUANTIZED = config.getboolean('FASTTEXT', 'QUANTIZED', fallback=True)
+
+# Amount of time (in seconds) between flushes of each process' metrics
+METRICS_FLUSH_INTERVAL = config.get('METRICS', 'FLUSH_INTERVAL', fallback='1')
+
+# Default amount of parallel trials within a sweep job
+SWEEPER_PARALLEL = config.get('SWEEPER', 'PARALLEL', fallback='2')
+
+# Default fraction of samples held out to evaluate the sweep's trials
+SWEEPER_VALIDATION_SPLIT = config.get('SWEEPER', 'VALIDATION_SPLIT', fallback='0.2')
+
+# Default amount of trials within a random sweep job
+SWEEPER_N_TRIALS = config.get('SWEEPER', 'N_TRIALS', fallback='10')
+
+# Maximum amount of trials within a sweep job
+SWEEPER_MAX_TRIALS = config.get('SWEEPER', 'MAX_TRIALS', fallback='100')
+
 # Default path to save the models
 DEFAULT_PATH = 'models/'
 
+# Default path to spool the streamed samples
+DEFAULT_SPOOL_PATH = 'spool/'
+
+# Default path to save the datasets
+DEFAULT_DATASETS_PATH = 'datasets/'
+
+# Default datasets' raw samples name
+DEFAULT_DATASET_SAMPLES = 'samples.jsonl'
+
+# Default datasets' metadata name
+DEFAULT_DATASET_META = 'meta.json'
+
+# Default path to save the jobs' status
+DEFAULT_JOBS_PATH = 'jobs/'
+
+# Default path to save the training checkpoints
+DEFAULT_CHECKPOINTS_PATH = 'checkpoints/'
+
+# Default path to save each process' metrics
+DEFAULT_METRICS_PATH = 'metrics/'
+
+# Default artifacts' manifest name
+DEFAULT_MANIFEST = 'manifest.json'
+
 # Default Fasttext model's name
-DEFAULT_FASTTEXT_MODEL = 'model.bin'
\ No newline at end of file
+DEFAULT_FASTTEXT_MODEL = 'model.bin'
+
+# Default Fasttext quantized model's name
+DEFAULT_FASTTEXT_QUANTIZED_MODEL = 'model.ftz'
\ No newline at end of file
@@ -0,0 +1,244 @@
+import datetime
+import json
+import os
+import shutil
+import tempfile
+import uuid
+
+import utils.constants as c
+
+
+class DatasetRegistry():
+    """A DatasetRegistry class stores datasets once, along with their versions in each
+    learner's native format, so they can be referenced by training and testing jobs.
+
+    """
+
+    def __init__(self, path=c.DEFAULT_DATASETS_PATH):
+        """Initialization method.
+
+        Args:
+            path (str): The folder where the datasets are stored.
+
+        """
+
+        # Folder where the datasets are stored
+        self.path = path
+
+        # Makes sure that the folder exists
+        os.makedirs(self.path, exist_ok=True)
+
+    def _get_folder(self, _id):
+        """Gathers the folder of a dataset.
+
+        Args:
+            _id (str): Dataset's identifier.
+
+        Returns:
+            The path to the dataset's folder.
+
+        """
+
+        return os.path.join(self.path, os.path.basename(_id))
+
+    def get_samples_path(self, _id):
+        """Gathers the path of a dataset's raw samples, stored as JSONL.
+
+        Args:
+            _id (str): Dataset's identifier.
+
+        Returns:
+            The path to the dataset's raw samples.
+
+        """
+
+        return os.path.join(self._get_folder(_id), c.DEFAULT_DATASET_SAMPLES)
+
+    def get_native_path(self, _id, _type):
+        """Gathers the path of a dataset in a learner's native format.
+
+        Args:
+            _id (str): Dataset's identifier.
+            _type (str): Learner's type.
+
+        Returns:
+            The path to the dataset in the learner's native format.
+
+        """
+
+        return os.path.join(self._get_folder(_id), f'{_type}.data')
+
+    def resolve(self, _id, _type):
+        """Resolves a dataset's reference to its path in a learner's native format.
+
+        Args:
+            _id (str): Dataset's identifier.
+            _type (str): Learner's type.
+
+        Returns:
+            The path to the dataset in the learner's native format.
+
+        Raises:
+            RuntimeError: If the dataset is not ready to be used by the learner.
+
+        """
+
+        # Gathers the dataset's metadata
+        meta = self.get(_id)
+
+        # Checks if the dataset exists and has been built for the learner
+        if meta is None or meta['status'] != 'ready' or meta['type'] != _type:
+            raise RuntimeError(f'Dataset {_id} is not ready to be used by `{_type}`.')
+
+        return self.get_native_path(_id, _type)
+
+    def create(self, _type, language, samples=None, local_path=None):
+        """Creates a new dataset from inline samples or from a local JSONL file or directory.
+
+        Args:
+            _type (str): Learner's type.
+            language (str): The language of the dataset.
+            samples (list): A list of samples.
+            local_path (str): Path to a local JSONL file or to a directory of JSONL files.
+
+        Returns:
+            The dataset's metadata.
+
+        """
+
+        # If the samples did not come inline, gathers the local files
+        local_files = self._get_local_files(local_path) if samples is None else []
+
+        # Creating the dataset's unique identifier
+        _id = str(uuid.uuid4())
+
+        # Creates the dataset's folder
+        os.makedirs(self._get_folder(_id))
+
+        # Tries to store the raw samples
+        try:
+            # Opens the dataset's raw samples file
+            with open(self.get_samples_path(_id), 'w', encoding='utf-8') as samples_file:
+                # Checks if the samples came inline
+                if samples is not None:
+                    # Writes a sample per line
+                    samples_file.writelines(json.dumps(s) + '\n' for s in samples)
+
+                # If not, they should be copied from a local path
+                else:
+                    # For every possible local file
+                    for file_path in local_files:
+                        # Copies the file's contents
+                        with open(file_path, encoding='utf-8') as local_file:
+                            shutil.copyfileobj(local_file, samples_file)
+
+                        # Makes sure that the next file starts in a new line
+                        samples_file.write('\n')
+
+        # If they could not be stored, removes the incomplete dataset
+        except Exception:
+            self.delete(_id)
+
+            raise
+
+        # Creating the metadata object
+        meta = {
+            'id': _id,
+            'type': _type,
+            'language': language,
+            'status': 'building',
+            'created_at': datetime.datetime.utcnow().isoformat()
+        }
+
+        # Saves the metadata
+        self.save(_id, meta)
+
+        return meta
+
+    def _get_local_files(self, local_path):
+        """Gathers the JSONL files of a local path, which should be within the allowed root.
+
+        Args:
+            local_path (str): Path to a local JSONL file or to a directory of JSONL files.
+
+        Returns:
+            A sorted list of files' paths.
+
+        Raises:
+            PermissionError: If the path is outside of the allowed root.
+            FileNotFoundError: If the path does not exist.
+
+        """
+
+        # Checks if there is a local path
+        if local_path is None:
+            raise FileNotFoundError('There are no samples nor a local path.')
+
+        # Gathers the absolute paths of both the allowed root and the local path
+        root = os.path.realpath(c.DATASETS_LOCAL_ROOT)
+        local_path = os.path.realpath(os.path.join(root, local_path))
+
+        # Checks if the local path is within the allowed root
+        if os.path.commonpath([root, local_path]) != root:
+            raise PermissionError(f'{local_path} is outside of the allowed root.')
+
+        # Checks if the local path is a directory
+        if os.path.isdir(local_path):
+            return sorted(os.path.join(local_path, p) for p in os.listdir(local_path)
+                          if p.endswith('.jsonl'))
+
+        # Checks if the local path is a file
+        if os.path.isfile(local_path):
+            return [local_path]
+
+        raise FileNotFoundError(f'Could not find {local_path}')
+
+    def save(self, _id, meta):
+        """Saves a dataset's metadata, atomically replacing any previous one.
+
+        Args:
+            _id (str): Dataset's identifier.
+            meta (dict): The dataset's metadata.
+
+        """
+
+        # Creates a temporary file within the dataset's folder
+        fd, temp_path = tempfile.mkstemp(dir=self._get_folder(_id), suffix='.tmp')
+
+        # Dumps the metadata to the temporary file
+        with os.fdopen(fd, 'w', encoding='utf-8') as temp_file:
+            json.dump(meta, temp_file)
+
+        # Atomically replaces the metadata file
+        os.replace(temp_path, os.path.join(self._get_folder(_id), c.DEFAULT_DATASET_META))
+
+    def get(self, _id):
+        """Gathers a dataset's metadata.
+
+        Args:
+            _id (str): Dataset's identifier.
+
+        Returns:
+            The dataset's metadata or None if there is no dataset with such identifier.
+
+        """
+
+        # Tries to read the metadata file
+        try:
+            with open(os.path.join(self._get_folder(_id), c.DEFAULT_DATASET_META), encoding='utf-8') as meta_file:
+                return json.load(meta_file)
+
+        # If there is no such file
+        except FileNotFoundError:
+            return None
+
+    def delete(self, _id):
+        """Deletes a dataset, along with its raw samples and native versions.
+
+        Args:
+            _id (str): Dataset's identifier.
+
+        """
+
+        # Removes the dataset's folder
+        shutil.rmtree(self._get_folder(_id), ignore_errors=True)
@@ -1,31 +1,113 @@
+import datetime
+import fcntl
+import json
+import logging
 import os
+import shutil
+import sys
+import tarfile
+import tempfile
 import zipfile
+from contextlib import contextmanager
 from zipfile import ZipFile
 
+import utils.constants as c
 
-def zip_file(temp_folder, dest_path, _id):
-    """Creates a .zip from a specific folder.
+# Zstandard is an optional dependency
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
-    Args:
-        temp_folder (str): A temporary folder to have its contents zipped.
-        dest_path (str): The destination path of the .zip.
-        _id (str): Model's identifier.
+# LZ4 is an optional dependency
+try:
+    import lz4.frame
+except ImportError:
+    lz4 = None
+
+# Codecs that are stored within a .zip container
+ZIP_CODECS = {
+    'stored': zipfile.ZIP_STORED,
+    'deflate': zipfile.ZIP_DEFLATED,
+    'bzip2': zipfile.ZIP_BZIP2
+}
+
+# Extension of the artifacts packed by each codec
+ARTIFACT_EXTENSIONS = {
+    'stored': '.zip',
+    'deflate': '.zip',
+    'bzip2': '.zip',
+    'zstd': '.tar.zst',
+    'lz4': '.tar.lz4'
+}
+
+# Extraction filters are only supported by recent Python versions
+TAR_FILTER = {'filter': 'data'} if hasattr(tarfile, 'data_filter') else {}
+
+# Magic bytes that identify each container
+ZIP_MAGIC = b'PK\x03\x04'
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+LZ4_MAGIC = b'\x04\x22\x4d\x18'
+
+
+def get_codecs():
+    """Gathers every codec that is avaliable in the current environment.
 
     Returns:
-        The path to the zipped file.
+        A list of the avaliable codecs' names.
 
     """
 
-    # Creates a temproary ZipFile
-    temp_zipfile = ZipFile(file=dest_path, mode='w',
-                           compression=zipfile.ZIP_BZIP2)
+    # Codecs based on .zip are always avaliable
+    codecs = list(ZIP_CODECS.keys())
+
+    # Checks if Zstandard is avaliable
+    if zstandard:
+        codecs.append('zstd')
+
+    # Checks if LZ4 is avaliable
+    if lz4:
+        codecs.append('lz4')
+
+    return codecs
+
+
+def _write_manifest(temp_folder, codec, level):
+    """Writes a manifest describing how the artifact has been packed.
+
+    Args:
+        temp_folder (str): A temporary folder to have its contents packed.
+        codec (str): The artifact's codec.
+        level (int): The codec's compression level.
+
+    """
+
+    # Creating the manifest object
+    manifest = {
+        'codec': codec,
+        'level': level,
+        'created_at': datetime.datetime.utcnow().isoformat()
+    }
+
+    # Dumps the manifest to the folder
+    with open(os.path.join(temp_folder, c.DEFAULT_MANIFEST), 'w', encoding='utf-8') as manifest_file:
+        json.dump(manifest, manifest_file)
+
+
+def _walk_files(temp_folder, _id):
+    """Walks through a folder, gathering its files and their names within the artifact.
 
-    # Gathering the initial root path
-    main_root = list(os.walk(temp_folder))[0][0]
+    Args:
+        temp_folder (str): A temporary folder to have its contents packed.
+        _id (str): Model's identifier.
+
+    Returns:
+        A list of tuples holding the original paths and their names within the artifact.
+
+    """
 
-    # Defines a function to format the path's name
-    def format_name(path): return os.path.join(
-        _id, root, filename).replace(main_root, _id)
+    # Creates an empty list to hold the files
+    files_paths = []
 
     # For every possible directory in the temporary folder
     for root, _, files in os.walk(temp_folder):
@@ -34,22 +116,160 @@ def zip_file(temp_folder, dest_path, _id):
             # Gathers the original path
             original_path = os.path.join(root, filename)
 
-            # Writes the file to the ZipFile
-            temp_zipfile.write(original_path, arcname=format_name(filename))
+            # Formats the path's name, placing it under the identifier's folder
+            arcname = os.path.join(_id, os.path.relpath(original_path, temp_folder))
 
-    # Closes the temporary ZipFile
-    temp_zipfile.close()
+            # Appends the file to the list
+            files_paths.append((original_path, arcname))
 
-    return temp_zipfile.filename
+    return files_paths
+
+
+def _tar_files(files_paths, dest_path, codec, level):
+    """Packs files into a compressed tar stream.
+
+    Args:
+        files_paths (list): A list of tuples holding the original paths and their names within the artifact.
+        dest_path (str): The destination path of the artifact.
+        codec (str): The artifact's codec, either `zstd` or `lz4`.
+        level (int): The codec's compression level.
+
+    """
+
+    # Opens the destination file
+    with open(dest_path, 'wb') as dest_file:
+        # Checks if the codec is Zstandard
+        if codec == 'zstd':
+            # Creates a compressed stream
+            stream = zstandard.ZstdCompressor(level=level).stream_writer(dest_file)
+
+        # If not, the codec is LZ4
+        else:
+            # Creates a compressed stream
+            stream = lz4.frame.open(dest_file, mode='wb', compression_level=level)
+
+        # Creates a tar stream over the compressed one
+        with stream, tarfile.open(fileobj=stream, mode='w|') as temp_tarfile:
+            # For every possible file
+            for original_path, arcname in files_paths:
+                # Writes the file to the TarFile
+                temp_tarfile.add(original_path, arcname=arcname)
+
+
+def zip_file(temp_folder, dest_path, _id, codec=None, level=None):
+    """Creates an artifact from a specific folder.
+
+    The artifact is either a .zip (`stored`, `deflate` or `bzip2`) or a
+    compressed tar stream (.tar.zst or .tar.lz4), always holding a manifest
+    that records how it has been packed. Its extension is appended according to the
+    codec and any artifact previously packed with another extension is removed.
+
+    Args:
+        temp_folder (str): A temporary folder to have its contents zipped.
+        dest_path (str): The destination path of the artifact, without its extension.
+        _id (str): Model's identifier.
+        codec (str): The artifact's codec, defaults to the configured one.
+        level (int): The codec's compression level, defaults to the configured one.
+
+    Returns:
+        The path to the zipped file.
+
+    """
+
+    # Checks if a codec has been supplied
+    if codec is None:
+        codec = c.ARTIFACT_CODEC
+
+    # Checks if a level has been supplied
+    if level is None:
+        level = int(c.ARTIFACT_LEVEL)
+
+    # Checks if the codec is avaliable
+    if codec not in get_codecs():
+        logging.warning(f'Codec `{codec}` is not avaliable, using `deflate` instead ...')
+
+        # Falls back to the standard library's codec
+        codec = 'deflate'
+
+    # Writes the manifest
+    _write_manifest(temp_folder, codec, level)
+
+    # Gathers the artifact's path, according to its codec
+    artifact_path = dest_path + ARTIFACT_EXTENSIONS[codec]
+
+    # Gathers the files to be packed
+    files_paths = _walk_files(temp_folder, _id)
+
+    # Packs into a temporary path, so readers never see a partial artifact
+    temp_path = artifact_path + '.tmp'
+
+    # Checks if the codec is based on .zip
+    if codec in ZIP_CODECS:
+        # Compression levels are only supported by ZipFile from Python 3.7 onwards
+        kwargs = {'compresslevel': level} if codec != 'stored' and sys.version_info >= (3, 7) else {}
+
+        # Creates a temporary ZipFile
+        with ZipFile(file=temp_path, mode='w', compression=ZIP_CODECS[codec], **kwargs) as temp_zipfile:
+            # For every possible file
+            for original_path, arcname in files_paths:
+                # Writes the file to the ZipFile
+                temp_zipfile.write(original_path, arcname=arcname)
+
+    # If the codec is based on a tar stream
+    else:
+        # Packs the files into the temporary path
+        _tar_files(files_paths, temp_path, codec, level)
+
+    # Atomically moves the artifact to its destination
+    os.replace(temp_path, artifact_path)
+
+    # For every extension other than the artifact's one
+    for extension in set(ARTIFACT_EXTENSIONS.values()) - {ARTIFACT_EXTENSIONS[codec]}:
+        # Tries to remove a previous artifact packed with such extension
+        try:
+            os.remove(dest_path + extension)
+
+        # If there is no such artifact, keeps going
+        except FileNotFoundError:
+            pass
+
+    return artifact_path
+
+
+def _check_member(member, dest_path):
+    """Checks whether a tar member can be safely extracted within the destination path.
+
+    Args:
+        member (TarInfo): The tar member.
+        dest_path (str): The destination path of the unzipped files.
+
+    Raises:
+        RuntimeError: If the member is not a regular file or folder, or if it would be extracted
+            outside of the destination path.
+
+    """
+
+    # Artifacts only hold regular files and folders, so links and devices are refused
+    if not (member.isfile() or member.isdir()):
+        raise RuntimeError(f'Artifact member {member.name} is not a regular file nor a folder.')
+
+    # Gathers the absolute paths of both the destination and the member
+    root = os.path.realpath(dest_path)
+    member_path = os.path.realpath(os.path.join(root, member.name))
+
+    # Checks if the member is within the destination path
+    if os.path.commonpath([root, member_path]) != root:
+        raise RuntimeError(f'Artifact member {member.name} is outside of the destination path.')
 
 
 def unzip_file(zip_path, dest_path, _id):
-    """ Inflates the zipfile in a folder created within the destination path.
+    """ Inflates the artifact in a folder created within the destination path.
 
-    The folder will have as name the model's identifier.
+    The folder will have as name the model's identifier. The artifact's codec is
+    identified by its magic bytes, so legacy BZIP2 .zip files are still supported.
 
     Args:
-        zip_path (str): The path to the .zip file.
+        zip_path (str): The path to the artifact.
         dest_path (str): The destination path of the unzipped files.
         _id (str): Model's identifier.
 
@@ -58,9 +278,6 @@ def unzip_file(zip_path, dest_path, _id):
 
     """
 
-    # Creates a zip object
-    zip_object = ZipFile(zip_path)
-
     # If there is an identifier
     if _id:
         # Joins the path
@@ -71,7 +288,256 @@ def unzip_file(zip_path, dest_path, _id):
         # Marks the destionation path as the initial variable
         final_dest = dest_path
 
-    # Extracts the zip object
-    zip_object.extractall(dest_path)
+    # Opens the artifact
+    with open(zip_path, 'rb') as zip_object:
+        # Extracts the artifact
+        _unzip_object(zip_object, zip_path, dest_path)
 
     return final_dest
+
+
+def _unzip_object(zip_object, zip_path, dest_path):
+    """Inflates an already opened artifact within the destination path.
+
+    Args:
+        zip_object (file): The opened artifact.
+        zip_path (str): The path to the artifact.
+        dest_path (str): The destination path of the unzipped files.
+
+    """
+
+    # Gathers its magic bytes
+    magic = zip_object.read(4)
+
+    # Rewinds the artifact
+    zip_object.seek(0)
+
+    # Checks if the artifact is a .zip
+    if magic == ZIP_MAGIC:
+        # Extracts the zip object
+        with ZipFile(zip_object) as zip_file_object:
+            zip_file_object.extractall(dest_path)
+
+        return
+
+    # Checks if the artifact is compressed with Zstandard
+    if magic == ZSTD_MAGIC and zstandard:
+        # Creates a decompressed stream
+        stream = zstandard.ZstdDecompressor().stream_reader(zip_object)
+
+    # Checks if the artifact is compressed with LZ4
+    elif magic == LZ4_MAGIC and lz4:
+        # Creates a decompressed stream
+        stream = lz4.frame.open(zip_object, mode='rb')
+
+    # If the artifact could not be identified
+    else:
+        raise RuntimeError(f'Could not identify the codec of {zip_path}.')
+
+    # Opens the tar stream
+    with stream, tarfile.open(fileobj=stream, mode='r|') as tar_object:
+        # For every member of the stream
+        for member in tar_object:
+            # Checks if the member can be safely extracted
+            _check_member(member, dest_path)
+
+            # Extracts the member
+            tar_object.extract(member, dest_path, **TAR_FILTER)
+
+
+def unzip_model(dest_path, _id):
+    """Inflates a model's artifact only once, even under concurrent callers.
+
+    The extracted folder is named after the artifact's version (`<id>@<version>`),
+    so a replaced artifact is always extracted into a new folder. The first caller extracts
+    the artifact into a temporary folder and atomically renames it, while the others (threads or
+    processes) wait for it on a file lock. Thus, the model's folder only exists once it has been
+    completely extracted. Folders of other versions are removed, unless they are being used.
+
+    Args:
+        dest_path (str): The destination path of the unzipped files.
+        _id (str): Model's identifier.
+
+    Returns:
+        The path to the unzipped files.
+
+    Raises:
+        FileNotFoundError: If there is no avaliable artifact with such identifier.
+
+    """
+
+    # Gathers the artifact's path
+    artifact_path = get_artifact_path(dest_path, _id)
+
+    # Checks if the artifact exists before waiting for any lock
+    if artifact_path is None:
+        raise FileNotFoundError(f'Could not find an artifact for {os.path.join(dest_path, _id)}')
+
+    # Opens the artifact, so its version and contents belong to the same file, even if it is replaced meanwhile
+    with open(artifact_path, 'rb') as zip_object:
+        # Gathers the final folder's path, according to the artifact's version
+        final_dest = os.path.join(dest_path, f'{_id}@{os.fstat(zip_object.fileno()).st_mtime_ns}')
+
+        # If the model has already been extracted, it is ready to be used
+        if os.path.exists(final_dest):
+            return final_dest
+
+        # Opens the model's lock file
+        with open(os.path.join(dest_path, f'.{_id}.lock'), 'w') as lock_file:
+            # Waits for any other extraction of the same model and for its users
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+            # If another caller has extracted the model meanwhile, it is ready to be used
+            if os.path.exists(final_dest):
+                return final_dest
+
+            # Creates a temporary folder within the destination path
+            temp_dir = tempfile.mkdtemp(prefix=f'.{_id}-', dir=dest_path)
+
+            # Tries to extract the artifact
+            try:
+                # Unzips the artifact into the temporary folder
+                _unzip_object(zip_object, artifact_path, temp_dir)
+
+                # Atomically marks the model as ready
+                os.rename(os.path.join(temp_dir, _id), final_dest)
+
+            # Cleans up the temporary folder
+            finally:
+                shutil.rmtree(temp_dir, ignore_errors=True)
+
+            # For every possible folder of the model
+            for folder in os.listdir(dest_path):
+                # Checks if the folder belongs to another version, which is not being used as the lock is held
+                if folder == _id or (folder.startswith(f'{_id}@') and folder != os.path.basename(final_dest)):
+                    # Removes the stale folder
+                    shutil.rmtree(os.path.join(dest_path, folder), ignore_errors=True)
+
+    return final_dest
+
+
+@contextmanager
+def use_model(dest_path, _id):
+    """Inflates a model's artifact and holds its folder while it is being used,
+    so that a newer version does not remove it meanwhile.
+
+    Args:
+        dest_path (str): The destination path of the unzipped files.
+        _id (str): Model's identifier.
+
+    Yields:
+        The path to the unzipped files.
+
+    Raises:
+        FileNotFoundError: If there is no avaliable artifact with such identifier.
+
+    """
+
+    # While the model's folder could not be held
+    while True:
+        # Inflates the model's artifact
+        model_path = unzip_model(dest_path, _id)
+
+        # Opens the model's lock file
+        with open(os.path.join(dest_path, f'.{_id}.lock'), 'w') as lock_file:
+            # Shares the lock with other users, blocking any extraction of a newer version
+            fcntl.flock(lock_file, fcntl.LOCK_SH)
+
+            # Checks if the folder has not been removed before being held
+            if os.path.exists(model_path):
+                yield model_path
+
+                return
+
+
+def get_artifact_path(dest_path, _id):
+    """Gathers the path of a model's artifact, whatever its codec.
+
+    Args:
+        dest_path (str): The path where the artifact is stored.
+        _id (str): Model's identifier.
+
+    Returns:
+        The path to the artifact or None if there is no such artifact.
+
+    """
+
+    # For every possible extension
+    for extension in sorted(set(ARTIFACT_EXTENSIONS.values())):
+        # Gathers the artifact's path
+        artifact_path = os.path.join(dest_path, _id + extension)
+
+        # Checks if the artifact exists
+        if os.path.exists(artifact_path):
+            return artifact_path
+
+    return None
+
+
+def get_artifact_version(dest_path, _id):
+    """Gathers the version of a model's artifact, which changes whenever it is replaced.
+
+    Args:
+        dest_path (str): The path where the artifact is stored.
+        _id (str): Model's identifier.
+
+    Returns:
+        The artifact's modification time or None if there is no such artifact.
+
+    """
+
+    # Gathers the artifact's path
+    artifact_path = get_artifact_path(dest_path, _id)
+
+    # Tries to gather the artifact's modification time
+    try:
+        return os.stat(artifact_path).st_mtime_ns if artifact_path else None
+
+    # If the artifact has been removed meanwhile, it has no version
+    except OSError:
+        return None
+
+
+def get_folder_size(folder_path):
+    """Calculates the size of a folder, summing up the sizes of all its files.
+
+    Args:
+        folder_path (str): The folder's path.
+
+    Returns:
+        The size of the folder in bytes.
+
+    """
+
+    # Initializes the size as zero
+    size = 0
+
+    # For every possible directory in the folder
+    for root, _, files in os.walk(folder_path):
+        # For every possible file in the files
+        for filename in files:
+            # Sums up the file's size
+            size += os.path.getsize(os.path.join(root, filename))
+
+    return size
+
+
+def read_samples(samples_path):
+    """Lazily reads samples from a JSONL file, one sample per line.
+
+    Args:
+        samples_path (str): The path to the JSONL file.
+
+    Yields:
+        Each sample of the file.
+
+    """
+
+    # Opens the file
+    with open(samples_path, encoding='utf-8') as samples_file:
+        # For every possible line
+        for line in samples_file:
+            # Skips empty lines
+            if line.strip():
+                # Yields the decoded sample
+                yield json.loads(line)
@@ -0,0 +1,94 @@
+import json
+import os
+import tempfile
+
+import utils.constants as c
+
+
+class JobStore():
+    """A JobStore class persists the status of every submitted job, so it can be shared
+    between the API and the workers that consume the jobs.
+
+    """
+
+    def __init__(self, path=c.DEFAULT_JOBS_PATH):
+        """Initialization method.
+
+        Args:
+            path (str): The folder where the jobs' status are stored.
+
+        """
+
+        # Folder where the jobs' status are stored
+        self.path = path
+
+        # Makes sure that the folder exists
+        os.makedirs(self.path, exist_ok=True)
+
+    def _get_path(self, _id):
+        """Gathers the path of a job's status file.
+
+        Args:
+            _id (str): Job's identifier.
+
+        Returns:
+            The path to the job's status file.
+
+        """
+
+        return os.path.join(self.path, os.path.basename(_id) + '.json')
+
+    def save(self, _id, status):
+        """Saves a job's status, atomically replacing any previous one.
+
+        Args:
+            _id (str): Job's identifier.
+            status (dict): The job's status.
+
+        """
+
+        # Creates a temporary file within the same folder
+        fd, temp_path = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+
+        # Dumps the status to the temporary file
+        with os.fdopen(fd, 'w', encoding='utf-8') as temp_file:
+            json.dump(status, temp_file)
+
+        # Atomically replaces the job's status file
+        os.replace(temp_path, self._get_path(_id))
+
+    def get(self, _id):
+        """Gathers a job's status.
+
+        Args:
+            _id (str): Job's identifier.
+
+        Returns:
+            The job's status or None if there is no job with such identifier.
+
+        """
+
+        # Tries to read the job's status file
+        try:
+            with open(self._get_path(_id), encoding='utf-8') as status_file:
+                return json.load(status_file)
+
+        # If there is no such file
+        except FileNotFoundError:
+            return None
+
+    def delete(self, _id):
+        """Deletes a job's status.
+
+        Args:
+            _id (str): Job's identifier.
+
+        """
+
+        # Tries to remove the job's status file
+        try:
+            os.remove(self._get_path(_id))
+
+        # If there is no such file, there is nothing to be deleted
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,529 @@
+import datetime
+import fcntl
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+
+import utils.constants as c
+
+# Buckets (in seconds) of the latency histograms
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, float('inf'))
+
+# Buckets (in seconds) of the jobs' duration histograms
+JOB_BUCKETS = (1, 5, 15, 60, 300, 900, 1800, 3600, 10800, float('inf'))
+
+# Type, help message and buckets of every metric
+METRICS = {
+    'brainy_request_duration_seconds': ('histogram', 'Requests latency per handler and model type.', LATENCY_BUCKETS),
+    'brainy_model_phase_seconds': ('histogram', 'Time spent per model phase and model type.', LATENCY_BUCKETS),
+    'brainy_job_duration_seconds': ('histogram', 'Jobs duration per task, model type and status.', JOB_BUCKETS),
+    'brainy_queue_depth': ('gauge', 'Amount of jobs waiting in the backlog.', None),
+    'brainy_pool_workers': ('gauge', 'Amount of alive workers per pool.', None),
+    'brainy_pool_running_jobs': ('gauge', 'Amount of running jobs per pool.', None),
+    'brainy_cache_hits_total': ('counter', 'Amount of models cache hits.', None),
+    'brainy_cache_misses_total': ('counter', 'Amount of models cache misses.', None),
+    'brainy_cache_evictions_total': ('counter', 'Amount of models cache evictions.', None),
+    'brainy_cache_size_bytes': ('gauge', 'Size of the cached models.', None),
+    'brainy_cache_models': ('gauge', 'Amount of cached models.', None)
+}
+
+# File holding the merged counters and histograms of finished processes
+AGGREGATE_FILE = 'aggregate.json'
+
+# Process-wide instance of the metrics
+_metrics = None
+
+# Lock used to guard the creation of the process-wide instance
+_metrics_lock = threading.Lock()
+
+
+def _get_start_time(pid):
+    """Gathers the time when a process has started, which tells apart processes that reuse a pid.
+
+    Args:
+        pid (int): The process' identifier.
+
+    Returns:
+        The process' start time (in clock ticks since boot) or None if it is not avaliable.
+
+    """
+
+    # Tries to read the process' status, which is only avaliable on Linux
+    try:
+        with open(f'/proc/{pid}/stat', encoding='utf-8') as stat_file:
+            stat = stat_file.read()
+
+    # If it could not be read, there is no start time
+    except OSError:
+        return None
+
+    # The start time is the 22nd field, where the fields after the command's name are counted from the 3rd
+    return stat[stat.rindex(')') + 2:].split()[19]
+
+
+def _get_token():
+    """Gathers a token that identifies the current process, even if its pid is later reused.
+
+    Returns:
+        The process' start time or a unique identifier if it is not avaliable.
+
+    """
+
+    return _get_start_time(os.getpid()) or uuid.uuid4().hex
+
+
+def _is_alive(pid, token):
+    """Checks whether a process is still alive.
+
+    Args:
+        pid (int): The process' identifier.
+        token (str): The process' token.
+
+    Returns:
+        Whether the process is alive.
+
+    """
+
+    # Tries to signal the process
+    try:
+        os.kill(pid, 0)
+
+    # If there is no such process
+    except ProcessLookupError:
+        return False
+
+    # If the process exists but belongs to another user
+    except PermissionError:
+        pass
+
+    # Gathers the start time of the process that currently holds the pid
+    start_time = _get_start_time(pid)
+
+    # If the start time is avaliable, the pid should not have been reused by another process
+    return start_time is None or start_time == token
+
+
+def _merge(merged, snapshot, gauges=True):
+    """Merges a process' snapshot into the merged values.
+
+    Args:
+        merged (dict): A dictionary holding the merged values of every metric and its labels.
+        snapshot (list): A list of metrics' names, labels and values.
+        gauges (bool): Whether the gauges should be merged.
+
+    """
+
+    # For every metric, its labels and value
+    for name, labels, value in snapshot:
+        # Skips the gauges, if they should not be merged
+        if METRICS[name][0] == 'gauge' and not gauges:
+            continue
+
+        # Gathers the metric's key
+        key = (name, tuple(tuple(label) for label in labels))
+
+        # Checks if the metric is a histogram
+        if isinstance(value, list):
+            merged[key] = [a + b for a, b in zip(merged.get(key, [0] * len(value)), value)]
+
+        # If not, it is summed up
+        else:
+            merged[key] = merged.get(key, 0) + value
+
+
+def _read_snapshot(path):
+    """Reads a snapshot of metrics.
+
+    Args:
+        path (str): The snapshot's path.
+
+    Returns:
+        A list of metrics' names, labels and values, which is empty if there is no such file.
+
+    """
+
+    # Tries to read the snapshot
+    try:
+        with open(path, encoding='utf-8') as metrics_file:
+            return json.load(metrics_file)
+
+    # If the file has been removed meanwhile
+    except FileNotFoundError:
+        return []
+
+
+def _write_snapshot(folder, path, snapshot):
+    """Writes a snapshot of metrics, atomically replacing any previous one.
+
+    Args:
+        folder (str): The folder where the processes' metrics are stored.
+        path (str): The snapshot's path.
+        snapshot (list): A list of metrics' names, labels and values.
+
+    """
+
+    # Creates a temporary file within the same folder
+    fd, temp_path = tempfile.mkstemp(dir=folder, suffix='.tmp')
+
+    # Dumps the snapshot to the temporary file
+    with os.fdopen(fd, 'w', encoding='utf-8') as temp_file:
+        json.dump(snapshot, temp_file)
+
+    # Atomically replaces the snapshot's file
+    os.replace(temp_path, path)
+
+
+def _format_labels(labels):
+    """Formats labels in Prometheus' text format.
+
+    Args:
+        labels (tuple): A tuple of labels' names and values.
+
+    Returns:
+        The formatted labels.
+
+    """
+
+    # Checks if there are no labels
+    if not labels:
+        return ''
+
+    return '{' + ','.join(f'{k}="{v}"' for k, v in labels) + '}'
+
+
+class Metrics():
+    """A Metrics class records counters, gauges and histograms of a single process,
+    periodically flushing them to a file, so that every process' metrics can be merged.
+
+    Counters and histograms of finished processes are folded into an aggregate file,
+    while gauges are only merged from alive processes.
+
+    """
+
+    def __init__(self, path, interval):
+        """Initialization method.
+
+        Args:
+            path (str): The folder where the processes' metrics are stored.
+            interval (float): Amount of time (in seconds) between flushes.
+
+        """
+
+        # Folder where the processes' metrics are stored
+        self.path = path
+
+        # Makes sure that the folder exists
+        os.makedirs(self.path, exist_ok=True)
+
+        # Identifier of the process that owns the metrics
+        self.pid = os.getpid()
+
+        # File of the process, named after its pid and token, so a reused pid does not overwrite it
+        self.filename = f'{self.pid}-{_get_token()}.json'
+
+        # Dictionary holding the values of every metric and its labels
+        self.values = {}
+
+        # Lock used to guard the values against concurrent accesses
+        self.lock = threading.Lock()
+
+        # Thread that periodically flushes the values
+        self.flusher = threading.Thread(target=self._flush_forever, args=(interval,), daemon=True)
+        self.flusher.start()
+
+    def inc(self, name, value=1, **labels):
+        """Increases a counter.
+
+        Args:
+            name (str): The metric's name.
+            value (float): The amount to be increased.
+
+        """
+
+        # Gathers the metric's key
+        key = (name, tuple(sorted(labels.items())))
+
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        """Sets a gauge.
+
+        Args:
+            name (str): The metric's name.
+            value (float): The gauge's value.
+
+        """
+
+        # Gathers the metric's key
+        key = (name, tuple(sorted(labels.items())))
+
+        with self.lock:
+            self.values[key] = value
+
+    def observe(self, name, value, **labels):
+        """Observes a value in a histogram.
+
+        Args:
+            name (str): The metric's name.
+            value (float): The observed value.
+
+        """
+
+        # Gathers the metric's key and buckets
+        key = (name, tuple(sorted(labels.items())))
+        buckets = METRICS[name][2]
+
+        with self.lock:
+            # Gathers the histogram, holding the counts of every bucket and the sum of the values
+            histogram = self.values.setdefault(key, [0] * (len(buckets) + 1))
+
+            # For every possible bucket
+            for i, bucket in enumerate(buckets):
+                # Counts the value on the first bucket that holds it
+                if value <= bucket:
+                    histogram[i] += 1
+
+                    break
+
+            # Sums up the value
+            histogram[-1] += value
+
+    def flush(self):
+        """Flushes the process' values to its file.
+
+        """
+
+        with self.lock:
+            # Gathers a snapshot of the values
+            snapshot = [[name, list(labels), value] for (name, labels), value in self.values.items()]
+
+        # Writes the snapshot to the process' file
+        _write_snapshot(self.path, os.path.join(self.path, self.filename), snapshot)
+
+    def _flush_forever(self, interval):
+        """Periodically flushes the process' values.
+
+        Args:
+            interval (float): Amount of time (in seconds) between flushes.
+
+        """
+
+        # While the process is alive
+        while True:
+            # Waits for the next flush
+            time.sleep(interval)
+
+            self.flush()
+
+    def collect(self):
+        """Merges the metrics of every process into Prometheus' text format.
+
+        Returns:
+            The merged metrics in Prometheus' text format.
+
+        """
+
+        # Makes sure that the current values are merged
+        self.flush()
+
+        # Folds the files of finished processes into the aggregate, gathering the alive ones
+        alive_files = self._fold()
+
+        # Creates an empty dictionary to hold the merged values
+        merged = {}
+
+        # Merges the counters and histograms of finished processes
+        _merge(merged, _read_snapshot(os.path.join(self.path, AGGREGATE_FILE)))
+
+        # For every alive process' file
+        for filename in alive_files:
+            # Merges the process' values
+            _merge(merged, _read_snapshot(os.path.join(self.path, filename)))
+
+        return self._render(merged)
+
+    def _fold(self):
+        """Folds the counters and histograms of finished processes into a single aggregate file,
+        removing their own files, so the folder does not grow with every recycled worker.
+
+        Returns:
+            A list holding the files of the alive processes.
+
+        """
+
+        # Opens the aggregate's lock file
+        with open(os.path.join(self.path, '.aggregate.lock'), 'w') as lock_file:
+            # Waits for any other process that is folding the files
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+            # Creates empty lists to hold the alive and finished processes' files
+            alive_files, dead_files = [], []
+
+            # For every possible process' file
+            for filename in os.listdir(self.path):
+                # Skips the aggregate and temporary files
+                if filename == AGGREGATE_FILE or not filename.endswith('.json'):
+                    continue
+
+                # Gathers the process' pid and token
+                pid, token = filename[:-5].split('-', 1)
+
+                # Checks if the process is alive
+                if _is_alive(int(pid), token):
+                    alive_files.append(filename)
+
+                # If not, its file should be folded
+                else:
+                    dead_files.append(filename)
+
+            # Checks if there are files to be folded
+            if dead_files:
+                # Gathers the aggregate's path
+                aggregate_path = os.path.join(self.path, AGGREGATE_FILE)
+
+                # Gathers the aggregate's values
+                merged = {}
+                _merge(merged, _read_snapshot(aggregate_path))
+
+                # For every finished process' file
+                for filename in dead_files:
+                    # Merges its counters and histograms, as gauges of finished processes are dropped
+                    _merge(merged, _read_snapshot(os.path.join(self.path, filename)), gauges=False)
+
+                # Writes the aggregate before removing the folded files
+                _write_snapshot(self.path, aggregate_path,
+                                [[name, list(labels), value] for (name, labels), value in merged.items()])
+
+                # For every finished process' file
+                for filename in dead_files:
+                    # Removes the folded file
+                    os.remove(os.path.join(self.path, filename))
+
+        return alive_files
+
+    def _render(self, merged):
+        """Renders merged values in Prometheus' text format.
+
+        Args:
+            merged (dict): A dictionary holding the values of every metric and its labels.
+
+        Returns:
+            The metrics in Prometheus' text format.
+
+        """
+
+        # Creates an empty list to hold the lines
+        lines = []
+
+        # For every possible metric
+        for name, (_type, _help, buckets) in METRICS.items():
+            # Writes the metric's help message and type
+            lines.append(f'# HELP {name} {_help}')
+            lines.append(f'# TYPE {name} {_type}')
+
+            # For every labels of the metric
+            for (key_name, labels), value in sorted(merged.items()):
+                # Skips other metrics
+                if key_name != name:
+                    continue
+
+                # Checks if the metric is a histogram
+                if _type == 'histogram':
+                    # Initializes the cumulative count
+                    count = 0
+
+                    # For every possible bucket and its count
+                    for bucket, bucket_count in zip(buckets, value):
+                        # Accumulates the count
+                        count += bucket_count
+
+                        # Formats the bucket's upper bound
+                        le = '+Inf' if bucket == float('inf') else str(bucket)
+
+                        lines.append(f'{name}_bucket{_format_labels(labels + (("le", le),))} {count}')
+
+                    lines.append(f'{name}_sum{_format_labels(labels)} {value[-1]}')
+                    lines.append(f'{name}_count{_format_labels(labels)} {count}')
+
+                # If not, it is a single value
+                else:
+                    lines.append(f'{name}{_format_labels(labels)} {value}')
+
+        return '\n'.join(lines) + '\n'
+
+
+def get_metrics():
+    """Gathers the process-wide metrics, creating them on their first usage.
+
+    As every process should record its own metrics, forked processes create new ones.
+
+    Returns:
+        The process-wide Metrics instance.
+
+    """
+
+    global _metrics
+
+    with _metrics_lock:
+        # Checks if the metrics have not been created yet by the current process
+        if _metrics is None or _metrics.pid != os.getpid():
+            # Creates the metrics with the configured flush interval
+            _metrics = Metrics(c.DEFAULT_METRICS_PATH, float(c.METRICS_FLUSH_INTERVAL))
+
+    return _metrics
+
+
+def reset_metrics(path=c.DEFAULT_METRICS_PATH):
+    """Removes the metrics of previous executions.
+
+    Args:
+        path (str): The folder where the processes' metrics are stored.
+
+    """
+
+    # Makes sure that the folder exists
+    os.makedirs(path, exist_ok=True)
+
+    # For every possible process' file
+    for filename in os.listdir(path):
+        # Removes the file
+        os.remove(os.path.join(path, filename))
+
+
+def _parse_time(value):
+    """Parses a time in ISO format, as dumped by the callbacks.
+
+    Args:
+        value (str): The time in ISO format.
+
+    Returns:
+        The parsed time.
+
+    """
+
+    # Times without microseconds are dumped without their fraction
+    time_format = '%Y-%m-%dT%H:%M:%S.%f' if '.' in value else '%Y-%m-%dT%H:%M:%S'
+
+    return datetime.datetime.strptime(value, time_format)
+
+
+def observe_job(task):
+    """Observes a finished job's duration, gathered from its callback.
+
+    Args:
+        task (dict): The finished task.
+
+    """
+
+    # Gathers the job's callback
+    callback = task['callback']
+
+    # Gathers the job's duration
+    duration = (_parse_time(callback['end_time']) - _parse_time(callback['start_time'])).total_seconds()
+
+    get_metrics().observe('brainy_job_duration_seconds', duration,
+                          task=callback['task'], type=task.get('type', ''), status=callback['status'])
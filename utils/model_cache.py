@@ -0,0 +1,307 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import utils.constants as c
+import utils.file as f
+from learners.registry import get_learner_class
+from utils.metrics import get_metrics
+
+# Process-wide instance of the models cache
+_cache = None
+
+# Lock used to guard the creation of the process-wide instance
+_cache_lock = threading.Lock()
+
+
+class ModelCache():
+    """A ModelCache class keeps loaded learners in memory, evicting them
+    in a least-recently-used order whenever its size budget is exceeded.
+
+    """
+
+    def __init__(self, max_size):
+        """Initialization method.
+
+        Args:
+            max_size (int): Maximum size (in bytes) of the cached models.
+
+        """
+
+        # Maximum size of the cache
+        self.max_size = max_size
+
+        # Current size of the cache
+        self.size = 0
+
+        # Ordered dictionary holding the cached learners, their sizes and versions
+        self.learners = OrderedDict()
+
+        # Amount of hits, misses and evictions
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # Lock used to guard the cache against concurrent accesses
+        self.lock = threading.Lock()
+
+        # Dictionary holding a lock and its amount of users per key, so concurrent misses load a learner only once
+        self.key_locks = {}
+
+    @contextmanager
+    def key_lock(self, key):
+        """Holds the lock that guards the loading of a learner.
+
+        The lock is removed once it has no more users, so only the keys
+        that are being accessed are kept.
+
+        Args:
+            key (tuple): The learner's key, composed by its identifier and type.
+
+        """
+
+        with self.lock:
+            # Gathers the key's lock, creating it if needed
+            lock, users = self.key_locks.get(key, (threading.Lock(), 0))
+
+            # Increases the amount of users
+            self.key_locks[key] = (lock, users + 1)
+
+        # Tries to hold the key's lock
+        try:
+            with lock:
+                yield
+
+        # Releases the key's lock, even if the loading has failed
+        finally:
+            with self.lock:
+                # Gathers the key's lock and its amount of users
+                lock, users = self.key_locks[key]
+
+                # Checks if the current one is its last user
+                if users == 1:
+                    # Removes the lock
+                    del self.key_locks[key]
+
+                # If not, decreases the amount of users
+                else:
+                    self.key_locks[key] = (lock, users - 1)
+
+    def get(self, key, version=None):
+        """Gathers a learner from the cache.
+
+        Args:
+            key (tuple): The learner's key, composed by its identifier and type.
+            version (int): The version of the learner's artifact, where older versions are discarded.
+
+        Returns:
+            The cached learner or None if it is not avaliable.
+
+        """
+
+        with self.lock:
+            # Checks if the cached learner has been loaded from a replaced artifact
+            if key in self.learners and self.learners[key][2] != version:
+                logging.info(f'Model {key} has been replaced, discarding it ...')
+
+                # Removes the stale learner
+                self.size -= self.learners.pop(key)[1]
+
+            # Checks if the key is not in the cache
+            if key not in self.learners:
+                # Increases the amount of misses
+                self.misses += 1
+                get_metrics().inc('brainy_cache_misses_total')
+
+                return None
+
+            # Increases the amount of hits
+            self.hits += 1
+            get_metrics().inc('brainy_cache_hits_total')
+
+            # Marks the learner as the most recently used
+            self.learners.move_to_end(key)
+
+            return self.learners[key][0]
+
+    def add(self, key, learner, size, version=None):
+        """Adds a learner to the cache, evicting the least recently used ones if needed.
+
+        Args:
+            key (tuple): The learner's key, composed by its identifier and type.
+            learner (BaseLearner): The loaded learner.
+            size (int): The learner's size (in bytes).
+            version (int): The version of the learner's artifact.
+
+        """
+
+        # Checks if the learner does not fit in the cache
+        if size > self.max_size:
+            logging.warning(f'Model {key} is larger than the cache, skipping it ...')
+
+            return
+
+        with self.lock:
+            # If the key is already cached, removes its previous entry
+            if key in self.learners:
+                self.size -= self.learners.pop(key)[1]
+
+            # While there is no room for the new learner
+            while self.size + size > self.max_size:
+                # Evicts the least recently used learner
+                evicted_key, (_, evicted_size, _) = self.learners.popitem(last=False)
+
+                # Decreases the cache's size
+                self.size -= evicted_size
+
+                # Increases the amount of evictions
+                self.evictions += 1
+                get_metrics().inc('brainy_cache_evictions_total')
+
+                logging.info(f'Evicting model {evicted_key} from cache ...')
+
+            # Adds the learner to the cache
+            self.learners[key] = (learner, size, version)
+
+            # Increases the cache's size
+            self.size += size
+
+            # Exposes the cache's size
+            get_metrics().set('brainy_cache_size_bytes', self.size)
+            get_metrics().set('brainy_cache_models', len(self.learners))
+
+    def stats(self):
+        """Gathers the cache's statistics.
+
+        Returns:
+            A dictionary holding the cache's statistics.
+
+        """
+
+        with self.lock:
+            return {
+                'models': len(self.learners),
+                'size': self.size,
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+
+def get_model_cache():
+    """Gathers the process-wide models cache, creating it on its first usage.
+
+    Returns:
+        The process-wide ModelCache instance.
+
+    """
+
+    global _cache
+
+    with _cache_lock:
+        # Checks if the cache has not been created yet
+        if _cache is None:
+            # Creates the cache with the configured budget (MB to bytes)
+            _cache = ModelCache(int(float(c.CACHE_MAX_SIZE) * 1024 * 1024))
+
+    return _cache
+
+
+def load_learner(_id, _type, add=True):
+    """Gathers a loaded learner from the process-wide cache, loading it on a cache miss.
+
+    Long-lived job workers should not add their learners to the cache, as it would hold
+    up to its whole budget per worker, while they still share the preloaded learners.
+
+    Args:
+        _id (str): Model's identifier.
+        _type (str): Model's type.
+        add (bool): Whether a learner loaded on a cache miss should be added to the cache.
+
+    Returns:
+        The loaded learner.
+
+    Raises:
+        FileNotFoundError: If there is no avaliable model with such identifier.
+        RuntimeError: If there is no learner of such type.
+
+    """
+
+    # Gathers the learner's class first, so unknown types fail before unzipping anything
+    learner_class = get_learner_class(_type)
+
+    # Gathers the process-wide models cache
+    cache = get_model_cache()
+
+    # Gathers the artifact's version, so a replaced artifact is loaded again
+    version = f.get_artifact_version(c.DEFAULT_PATH, _id)
+
+    # Waits for any concurrent miss of the same learner, so it is loaded only once
+    with cache.key_lock((_id, _type)):
+        # Tries to gather an already loaded learner from the cache
+        l = cache.get((_id, _type), version)
+
+        # If the learner has already been cached
+        if l is not None:
+            return l
+
+        # Gathers the starting time of the unzipping
+        start = time.perf_counter()
+
+        # Unzips the model, if it has not been unzipped yet, holding its folder while it is loaded
+        with f.use_model(c.DEFAULT_PATH, _id) as model_path:
+            get_metrics().observe('brainy_model_phase_seconds', time.perf_counter() - start,
+                                  phase='unzip', type=_type)
+
+            # Creates the learner
+            l = learner_class()
+
+            # Gathers the starting time of the loading
+            start = time.perf_counter()
+
+            # Loads the model
+            l.load(model_path)
+
+            get_metrics().observe('brainy_model_phase_seconds', time.perf_counter() - start,
+                                  phase='load', type=_type)
+
+            # Gathers the model's size
+            size = f.get_folder_size(model_path)
+
+        # Checks if the loaded learner should be cached
+        if add:
+            # Adds the loaded learner to the cache
+            cache.add((_id, _type), l, size, version)
+
+    return l
+
+
+def preload_learners(models):
+    """Preloads learners into the process-wide cache.
+
+    When called before forking workers, the loaded weights are shared between
+    the workers through copy-on-write pages instead of being loaded by each one.
+
+    Args:
+        models (str): A comma-separated list of `type:identifier` models.
+
+    """
+
+    # For every possible model
+    for model in filter(None, [m.strip() for m in models.split(',')]):
+        # Gathers its type and identifier
+        _type, _id = model.split(':', 1)
+
+        # Tries to preload the learner
+        try:
+            logging.info(f'Preloading model {_id} ...')
+
+            # Loads the learner into the cache
+            load_learner(_id, _type)
+
+        # If the learner could not be loaded, keeps going
+        except Exception as e:
+            logging.exception(e)
@@ -1,13 +1,50 @@
+import datetime
 import logging
+import os
 import queue as queue_lib
+import resource
 import signal
 import sys
 from multiprocessing import Process, Queue
 
-import GPUtil
 from tornado.ioloop import IOLoop
 
 import utils.constants as c
+from learners.registry import prewarm_learners
+from utils.callback import get_callback_dispatcher
+from utils.job_store import JobStore
+from utils.metrics import get_metrics
+
+# Threadpoolctl is an optional dependency
+try:
+    import threadpoolctl
+except ImportError:
+    threadpoolctl = None
+
+# Environment variables that limit the native thread pools
+THREADS_ENV_VARS = ['OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS']
+
+# Processors whose jobs are counted against another processor's limit
+SHARED_LIMITS = {'SweeperProcessor': 'TrainerProcessor'}
+
+
+def limit_threads(threads):
+    """Limits the native thread pools of the current process.
+
+    Args:
+        threads (int): Maximum amount of threads per thread pool.
+
+    """
+
+    # For every native thread pool's variable
+    for var in THREADS_ENV_VARS:
+        # Limits the thread pool of any library loaded from now on
+        os.environ[var] = str(threads)
+
+    # Checks if Threadpoolctl is avaliable
+    if threadpoolctl:
+        # Limits the thread pools of libraries that have already been loaded
+        threadpoolctl.threadpool_limits(limits=threads)
 
 
 class ProcessManager():
@@ -20,8 +57,14 @@ class ProcessManager():
 
         """
 
-        # Creates a queue object
-        self.queue = Queue()
+        # Creates a bounded queue object, which holds the backlog of jobs
+        self.queue = Queue(maxsize=int(c.WORKERS_MAX_BACKLOG))
+
+        # Maximum amount of concurrent jobs per processor
+        self.limits = {
+            'TrainerProcessor': int(c.TRAINER_WORKERS),
+            'TesterProcessor': int(c.TESTER_WORKERS)
+        }
 
         # Creates an process object with a specific target
         self.current_process = Process(
@@ -53,10 +96,13 @@ class ProcessManager():
         Args:
             process (Process): A new process to be added to the queue.
 
+        Raises:
+            queue.Full: If the backlog is full and the process could not be added.
+
         """
 
-        # Puts a new process in the queue
-        self.queue.put(process)
+        # Puts a new process in the queue, failing fast if the backlog is full
+        self.queue.put_nowait(process)
 
     def get_gpu_config(self):
         """Gathers the amount of load and memory that a process should use on the GPU.
@@ -84,6 +130,9 @@ class ProcessManager():
 
         # Tries to check if there is an avaliable GPU
         try:
+            # Imports GPUtil only when a device is needed, as it loads setuptools
+            import GPUtil
+
             # Gathers a list of GPUs
             gpus = GPUtil.getGPUs()
 
@@ -129,11 +178,12 @@ class ProcessManager():
 
             return config
 
-    def drain_pool(self, pool):
+    def drain_pool(self, pool, dead=None):
         """Drains all lingering processes in the pool.
 
         Args:
             pool (list): The pool itself.
+            dead (list): A list where the pids of the drained processes are appended.
 
         Returns:
             The drained pool.
@@ -150,6 +200,10 @@ class ProcessManager():
                 # If not, terminates it
                 p.terminate()
 
+                # Checks if the drained processes are being gathered
+                if dead is not None:
+                    dead.append(p.pid)
+
             # If it is alive
             else:
                 # Appends the process to the new pool
@@ -157,10 +211,389 @@ class ProcessManager():
 
         return new_pool
 
+    def get_pool_size(self):
+        """Gathers the amount of long-lived workers that a pool should hold.
+
+        Returns:
+            The amount of workers per pool.
+
+        """
+
+        # Every pool should be able to hold both trainer and tester workers
+        pool_size = int(c.TRAINER_WORKERS) + int(c.TESTER_WORKERS)
+
+        return pool_size
+
+    def get_thread_budget(self):
+        """Gathers the amount of threads that each job is allowed to use.
+
+        Unless it has been configured, the avaliable cores are split among the
+        maximum amount of concurrent jobs, so that overlapping jobs do not oversubscribe them.
+
+        Returns:
+            The amount of threads per job.
+
+        """
+
+        # Checks if the amount of threads has been configured
+        if int(c.WORKERS_THREADS):
+            return int(c.WORKERS_THREADS)
+
+        # Gathers the amount of cores avaliable to this process
+        n_cores = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count()
+
+        return max(1, n_cores // self.get_pool_size())
+
+    def fill_pool(self, pool, done_queue, name):
+        """Fills a pool with long-lived workers until it reaches its size.
+
+        Args:
+            pool (list): The pool itself.
+            done_queue (Queue): The queue where the pool's workers report finished jobs.
+            name (str): The pool's name.
+
+        Returns:
+            The filled pool.
+
+        """
+
+        # While the pool has not reached its size
+        while len(pool) < self.get_pool_size():
+            # Creates the queue that only the worker consumes from, so every job is dispatched to a known worker
+            job_queue = Queue()
+
+            # Creates the worker's process
+            p = Process(target=self.pool_worker, name=f'brainy_{name}-' +
+                        str(len(pool) + 1), args=(job_queue, done_queue, name), daemon=False)
+
+            # Starts the process
+            p.start()
+
+            # Attaches the worker's queue to its process
+            p.job_queue = job_queue
+
+            # Appends the process to the pool
+            pool.append(p)
+
+            logging.info(f'Adding worker to {name.upper()} pool ...')
+
+        return pool
+
+    def pool_worker(self, job_queue, done_queue, name):
+        """A long-lived worker that consumes the jobs dispatched to it.
+
+        It limits its native thread pools to its thread budget, pre-imports the chosen
+        learners once, so that its jobs do not pay for their import cost, and exits whenever it
+        needs to be recycled.
+
+        Args:
+            job_queue (Queue): The queue that the worker consumes from.
+            done_queue (Queue): The queue where the worker reports finished jobs.
+            name (str): The worker's pool name.
+
+        """
+
+        # Interruptions are handled by the process manager
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+        # Limits the worker's native thread pools to its thread budget
+        limit_threads(self.get_thread_budget())
+
+        # Pre-imports the chosen learners
+        prewarm_learners(c.LEARNERS_PREWARM)
+
+        # Gathers the maximum amount of jobs per worker
+        max_jobs = int(c.WORKERS_MAX_JOBS)
+
+        # Gathers the maximum memory per worker (MB to KB)
+        max_memory = int(float(c.WORKERS_MAX_MEMORY) * 1024)
+
+        # Initializes the amount of consumed jobs
+        n_jobs = 0
+
+        # While the worker does not need to be recycled
+        while True:
+            # Gathers the current job
+            job = job_queue.get()
+
+            # If there is no job, the worker should stop
+            if job is None:
+                break
+
+            # Gathers the processor
+            processor = job["target"]()
+
+            # Consumes the job
+            processor.consume(job["data"])
+
+            # Increases the amount of consumed jobs
+            n_jobs += 1
+
+            # Initializes the recycling flag as false
+            recycle = False
+
+            # Checks if the worker has reached its maximum amount of jobs
+            if max_jobs and n_jobs >= max_jobs:
+                logging.info(f'Recycling worker after {n_jobs} jobs ...')
+
+                recycle = True
+
+            # Checks if the worker has reached its memory high-water mark
+            elif max_memory and resource.getrusage(resource.RUSAGE_SELF).ru_maxrss >= max_memory:
+                logging.info('Recycling worker after reaching its memory limit ...')
+
+                recycle = True
+
+            # Reports that the job has finished, releasing its slot, and whether the worker is exiting
+            done_queue.put((os.getpid(), recycle))
+
+            # If the worker should be recycled, stops consuming jobs
+            if recycle:
+                break
+
+        # Waits for the pending callbacks before exiting
+        get_callback_dispatcher().shutdown()
+
+        # Flushes the worker's metrics before exiting
+        get_metrics().flush()
+
+    def release_slots(self, done_queue, running, assigned, retiring, block):
+        """Releases the slots of the jobs reported as finished.
+
+        Args:
+            done_queue (Queue): The queue where workers report finished jobs.
+            running (dict): The amount of running jobs per pool and per processor.
+            assigned (dict): The job dispatched to each worker, keyed by its pid.
+            retiring (set): The pids of the workers that are exiting to be recycled.
+            block (bool): Whether it should wait for at least one report.
+
+        Raises:
+            queue.Empty: If it should block and no job has been reported in time.
+
+        """
+
+        # If it should block, waits for the first report
+        report = done_queue.get(timeout=1) if block else None
+
+        # While there are reports
+        while True:
+            # If there is a report
+            if report:
+                # Gathers the report's worker and whether it is exiting
+                pid, recycle = report
+
+                # Checks if the worker is exiting
+                if recycle:
+                    # Stops dispatching jobs to it
+                    retiring.add(pid)
+
+                # Checks if the worker had a job dispatched to it
+                if pid in assigned:
+                    # Gathers the job's slots
+                    keys, _ = assigned.pop(pid)
+
+                    # For both its pool and its processor
+                    for key, n_slots in keys:
+                        # Releases its slots
+                        running[key] = max(running.get(key, 0) - n_slots, 0)
+
+            # Tries to gather the next report without blocking
+            try:
+                report = done_queue.get_nowait()
+
+            # If there are no more reports, stops releasing
+            except queue_lib.Empty:
+                break
+
+    def release_worker(self, pid, running, assigned, retiring):
+        """Releases the slots of a dead worker's unfinished job, marking the job as failed.
+
+        As slots are assigned when a job is dispatched, a job is released even if
+        the worker has died before taking it from its queue.
+
+        Args:
+            pid (int): The dead worker's pid.
+            running (dict): The amount of running jobs per pool and per processor.
+            assigned (dict): The job dispatched to each worker, keyed by its pid.
+            retiring (set): The pids of the workers that are exiting to be recycled.
+
+        """
+
+        # The worker is no longer exiting
+        retiring.discard(pid)
+
+        # Checks if the worker has left a job unfinished
+        if pid not in assigned:
+            return
+
+        # Gathers the job's slots and identifier
+        keys, job_id = assigned.pop(pid)
+
+        logging.warning(f'Worker {pid} has died while consuming a job, releasing its slots ...')
+
+        # For both its pool and its processor
+        for key, n_slots in keys:
+            # Releases its slots
+            running[key] = max(running.get(key, 0) - n_slots, 0)
+
+        # Checks if the job can be identified
+        if job_id:
+            # Creates the job store
+            store = JobStore()
+
+            # Gathers the job's last status
+            status = store.get(job_id) or {'id': job_id}
+
+            # Adding an error status and message to the job
+            status['status'] = 'error'
+            status['error'] = 'Worker has exited unexpectedly.'
+            status['end_time'] = datetime.datetime.utcnow().isoformat()
+
+            # Sharing the job's final status
+            store.save(job_id, status)
+
+    def set_metrics(self, queue, cpu_pool, gpu_pool, running):
+        """Exposes the backlog's depth, the pools' sizes and their running jobs.
+
+        Args:
+            queue (Queue): The backlog's queue.
+            cpu_pool (list): The CPU pool.
+            gpu_pool (list): The GPU pool.
+            running (dict): The amount of running jobs per pool and per processor.
+
+        """
+
+        # Gathers the process-wide metrics
+        metrics = get_metrics()
+
+        # Tries to gather the backlog's depth
+        try:
+            metrics.set('brainy_queue_depth', queue.qsize())
+
+        # Some platforms do not support the queue's size
+        except NotImplementedError:
+            pass
+
+        # For every pool
+        for name, pool in (('cpu', cpu_pool), ('gpu', gpu_pool)):
+            metrics.set('brainy_pool_workers', len(pool), pool=name)
+            metrics.set('brainy_pool_running_jobs', running.get(name, 0), pool=name)
+
+    def get_limit_name(self, job):
+        """Gathers the name of the limit that a job is counted against.
+
+        Args:
+            job (dict): The job itself.
+
+        Returns:
+            The name of the job's processor or of the processor whose limit it shares.
+
+        """
+
+        # Gathers the job's processor name
+        target_name = job["target"].__name__
+
+        return SHARED_LIMITS.get(target_name, target_name)
+
+    def get_slots(self, job):
+        """Gathers the amount of slots that a job occupies in its processor's limit.
+
+        Jobs that run parallel processes, such as sweeps, occupy a slot per process,
+        bounded by the limit itself, so they can always be admitted.
+
+        Args:
+            job (dict): The job itself.
+
+        Returns:
+            The amount of slots.
+
+        """
+
+        # Gathers the name of the limit that the job is counted against
+        target_name = self.get_limit_name(job)
+
+        return max(1, min(int(job["data"].get("parallel", 1)), self.limits.get(target_name, self.get_pool_size())))
+
+    def has_slot(self, job, pool_name, running):
+        """Checks whether a job can be admitted to a pool without exceeding its limits.
+
+        Args:
+            job (dict): The job to be admitted.
+            pool_name (str): The pool's name.
+            running (dict): The amount of running jobs per pool and per processor.
+
+        Returns:
+            Whether the job can be admitted.
+
+        """
+
+        # Gathers the name of the limit that the job is counted against
+        target_name = self.get_limit_name(job)
+
+        # Checks if the pool has reached its maximum concurrency
+        if running.get(pool_name, 0) >= self.get_pool_size():
+            return False
+
+        # Checks if the job's slots would exceed the processor's maximum concurrency
+        if running.get(target_name, 0) + self.get_slots(job) > self.limits.get(target_name, self.get_pool_size()):
+            return False
+
+        return True
+
+    def get_idle_worker(self, pool, assigned, retiring):
+        """Gathers a worker that can receive a job.
+
+        Args:
+            pool (list): The pool itself.
+            assigned (dict): The job dispatched to each worker, keyed by its pid.
+            retiring (set): The pids of the workers that are exiting to be recycled.
+
+        Returns:
+            An alive worker without a dispatched job or None if there is no such worker.
+
+        """
+
+        # For every process in the pool
+        for p in pool:
+            # Checks if the worker is alive, idle and not exiting
+            if p.is_alive() and p.pid not in assigned and p.pid not in retiring:
+                return p
+
+        return None
+
+    def dispatch(self, job, worker, pool_name, running, assigned):
+        """Dispatches a job to a worker, occupying its slots.
+
+        Args:
+            job (dict): The job to be dispatched.
+            worker (Process): The worker that receives the job.
+            pool_name (str): The pool's name.
+            running (dict): The amount of running jobs per pool and per processor.
+            assigned (dict): The job dispatched to each worker, keyed by its pid.
+
+        """
+
+        # Gathers the job's slots, which are counted against its pool and its processor
+        keys = ((pool_name, 1), (self.get_limit_name(job), self.get_slots(job)))
+
+        # Sends the job to the worker
+        worker.job_queue.put(job)
+
+        # For both its pool and its processor
+        for key, n_slots in keys:
+            # Occupies its slots
+            running[key] = running.get(key, 0) + n_slots
+
+        # Keeps track of the worker's job, so its slots are released even if the worker dies
+        assigned[worker.pid] = (keys, job["data"].get("job_id"))
+
+        logging.info(f'Dispatching job to {pool_name.upper()} pool ...')
+
     async def worker(self, queue):
         """The worker method itself.
 
-        Essentially, it is responsible for draining and adding new processes to the pool.
+        Essentially, it is responsible for keeping the pools filled and dispatching jobs to them,
+        only taking new jobs from the backlog when there are free slots.
 
         Args:
             queue (Queue): A queue object.
@@ -199,32 +632,60 @@ class ProcessManager():
         # Initialize the job flag as false
         job = False
 
+        # Initializes the amount of running jobs per pool and per processor
+        running = {}
+
+        # Initializes the job dispatched to each worker, keyed by its pid
+        assigned = {}
+
+        # Initializes the pids of the workers that are exiting to be recycled
+        retiring = set()
+
         # Creates an empty list for the CPU pool
         cpu_pool = []
 
         # Creates an empty list for the GPU pool
         gpu_pool = []
 
+        # Creates the queue where workers report their finished jobs
+        done_queue = Queue()
+
         # Setting the responsibility of who will receive the interruption signal
         signal.signal(signal.SIGINT, signal_handler)
 
         # While the loop is true
         while True:
-            # Tries to the drain the pools and add a process
+            # Tries to keep the pools filled and dispatch a job
             try:
-                # Drains the CPU pool
-                cpu_pool = self.drain_pool(cpu_pool)
+                # Creates an empty list to hold the workers that have exited
+                dead = []
 
-                # Drains the GPU pool
-                gpu_pool = self.drain_pool(gpu_pool)
+                # Drains and refills the CPU pool, replacing recycled and dead workers
+                cpu_pool = self.fill_pool(self.drain_pool(cpu_pool, dead), done_queue, 'cpu')
 
-                # Gathers the current job
-                job = queue.get()
+                # The GPU pool is only filled after its first job
+                if gpu_pool:
+                    # Drains and refills the GPU pool, replacing recycled and dead workers
+                    gpu_pool = self.fill_pool(self.drain_pool(gpu_pool, dead), done_queue, 'gpu')
 
-                # If the job exists
-                if job:
-                    # Gathers the processor
-                    processor = job["target"]()
+                # Tracks every report, including the last ones of the workers that have exited
+                self.release_slots(done_queue, running, assigned, retiring, block=False)
+
+                # For every worker that has exited
+                for pid in dead:
+                    # Releases the slots of any job that the worker has left unfinished
+                    self.release_worker(pid, running, assigned, retiring)
+
+                # Releases finished jobs, waiting for them if a job is still pending
+                self.release_slots(done_queue, running, assigned, retiring, block=bool(job))
+
+                # Exposes the current state of the backlog and the pools
+                self.set_metrics(queue, cpu_pool, gpu_pool, running)
+
+                # If there is no pending job
+                if not job:
+                    # Gathers the current job from the backlog
+                    job = queue.get(timeout=1)
 
                     # Gathers the device configuration
                     device = self.get_device()
@@ -232,34 +693,43 @@ class ProcessManager():
                     # Adds to the job object the device configuration
                     job["data"]["device_config"] = device
 
-                    # If the device configuration is set to the GPU
-                    if device.get("gpu"):
-                        # Creates the process
-                        p = Process(target=processor.consume, name="brainy_gpu-" +
-                                    str(len(gpu_pool) + 1), args=(job["data"],), daemon=False)
+                    # Adds to the job object its thread budget, which grows with the slots that it occupies
+                    job["data"]["threads"] = self.get_thread_budget() * self.get_slots(job)
+
+                    # Exposes the thread budget in the job's status
+                    job["data"]["callback"]["threads"] = job["data"]["threads"]
 
-                        # Starts the process
-                        p.start()
+                # If the device configuration is set to the GPU
+                if job["data"]["device_config"].get("gpu"):
+                    # Checks if the GPU pool has a free slot for the job
+                    if self.has_slot(job, 'gpu', running):
+                        # Fills the GPU pool if it has not been filled yet
+                        gpu_pool = self.fill_pool(gpu_pool, done_queue, 'gpu')
 
-                        # Appends the process to the GPU pool
-                        gpu_pool.append(p)
+                        # Gathers an idle worker of the GPU pool
+                        gpu_worker = self.get_idle_worker(gpu_pool, assigned, retiring)
 
-                        logging.info('Adding process to GPU pool ...')
+                        # If there is an idle worker
+                        if gpu_worker:
+                            # Dispatches the job to the GPU pool
+                            self.dispatch(job, gpu_worker, 'gpu', running, assigned)
 
-                    # If the device configuration is set to the CPU
-                    else:
-                        # Creates the process
-                        p = Process(target=processor.consume, name="brainy_cpu-" +
-                                    str(len(cpu_pool) + 1), args=(job["data"],), daemon=False)
+                            # Resets the pending job
+                            job = False
 
-                        # Starts the process
-                        p.start()
+                # If the device configuration is set to the CPU
+                elif self.has_slot(job, 'cpu', running):
+                    # Gathers an idle worker of the CPU pool
+                    cpu_worker = self.get_idle_worker(cpu_pool, assigned, retiring)
 
-                        # Appends the process to the CPU pool
-                        cpu_pool.append(p)
+                    # If there is an idle worker
+                    if cpu_worker:
+                        # Dispatches the job to the CPU pool
+                        self.dispatch(job, cpu_worker, 'cpu', running, assigned)
 
-                        logging.info('Adding process to CPU pool ...')
+                        # Resets the pending job
+                        job = False
 
-            # Whenever the queue is empty, logs the exception
-            except queue_lib.Empty as e:
-                logging.warning(e)
+            # Whenever a queue is empty, keeps waiting
+            except queue_lib.Empty:
+                pass
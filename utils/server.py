@@ -1,12 +1,23 @@
 import logging
-from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 from tornado.web import Application
 
 import utils.constants as c
+from handlers.datasets_handler import DatasetsHandler
+from handlers.jobs_handler import JobsHandler
+from handlers.metrics_handler import MetricsHandler
 from handlers.predictor_handler import PredictorHandler
+from handlers.sweeper_handler import SweeperHandler
 from handlers.tester_handler import TesterHandler
 from handlers.trainer_handler import TrainerHandler
+from handlers.trainer_stream_handler import TrainerStreamHandler
+from processors.predictor_processor import PredictorProcessor
+from utils.coalescer import Coalescer
+from utils.dataset_registry import DatasetRegistry
+from utils.job_store import JobStore
+from utils.metrics import reset_metrics
+from utils.model_cache import preload_learners
 from utils.process_manager import ProcessManager
 
 
@@ -15,35 +26,87 @@ class Server(Application):
 
     """
 
-    def __init__(self):
+    def __init__(self, process_manager=None, debug=False):
         """It serves as the application initialization method.
 
         Note that you will need to set your own arguments, handlers and
         default settings from Tornado.
 
+        Args:
+            process_manager (ProcessManager): A process manager shared by every forked server, if any.
+            debug (bool): Whether the application should run in debug mode.
+
         """
 
+        # Checks if the process manager has not been created before forking
+        if process_manager is None:
+            # Removing the metrics of previous executions
+            reset_metrics()
+
+            # Preloading models before forking, so their weights are shared by every worker
+            preload_learners(c.CACHE_PRELOAD)
+
+            # Defining the process manager
+            process_manager = ProcessManager()
+
         # Defining the process manager
-        self.process_manager = ProcessManager()
+        self.process_manager = process_manager
+
+        # Defining the store of jobs' status
+        self.job_store = JobStore()
+
+        # Defining the registry of datasets
+        self.dataset_registry = DatasetRegistry()
 
         # Creating a pool of training workers
         self.trainer_pool = ProcessPoolExecutor(max_workers=int(c.TRAINER_WORKERS))
 
+        # Checks if the inference executor should be based on processes
+        if c.PREDICTOR_EXECUTOR == 'process':
+            # Creating a pool of inference processes
+            self.predictor_pool = ProcessPoolExecutor(max_workers=int(c.PREDICTOR_WORKERS))
+
+        # If not, it should be based on threads
+        else:
+            # Creating a pool of inference threads
+            self.predictor_pool = ThreadPoolExecutor(max_workers=int(c.PREDICTOR_WORKERS))
+
+        # Checks if prediction requests should be coalesced
+        if c.PREDICTOR_COALESCE:
+            # Creating the requests coalescer (window from ms to seconds)
+            self.coalescer = Coalescer(self.predictor_pool, PredictorProcessor(),
+                                       float(c.PREDICTOR_COALESCE_WINDOW) / 1000,
+                                       int(c.PREDICTOR_COALESCE_MAX_BATCH))
+
+        # If not, requests are directly sent to the inference executor
+        else:
+            self.coalescer = None
+
         # Defining own arguments to be avaliable for the class
         args = {
             'config': c.config,
-            'process_manager': self.process_manager
+            'process_manager': self.process_manager,
+            'predictor_pool': self.predictor_pool,
+            'coalescer': self.coalescer,
+            'job_store': self.job_store,
+            'dataset_registry': self.dataset_registry
         }
 
         # Defining the handlers that will handle the requests
         handlers = [
             (r'/api/trainer', TrainerHandler, args),
+            (r'/api/trainer/stream', TrainerStreamHandler, args),
+            (r'/api/sweeper', SweeperHandler, args),
             (r'/api/tester', TesterHandler, args),
-            (r'/api/predictor', PredictorHandler, args)
+            (r'/api/predictor', PredictorHandler, args),
+            (r'/api/jobs/([^/]+)', JobsHandler, args),
+            (r'/api/datasets', DatasetsHandler, args),
+            (r'/api/datasets/([^/]+)', DatasetsHandler, args),
+            (r'/metrics', MetricsHandler, args)
         ]
 
         # Overriding the Application class
-        super(Server, self).__init__(handlers, debug=True, autoreload=True)
+        super(Server, self).__init__(handlers, debug=debug, autoreload=debug)
 
     def shutdown(self, blocking_call=True):
         """Closes the worker pools.
@@ -57,3 +120,6 @@ class Server(Application):
 
         # Actually shutdowns the trainer pool
         self.trainer_pool.shutdown(blocking_call)
+
+        # Actually shutdowns the inference pool
+        self.predictor_pool.shutdown(blocking_call)